@@ -9,12 +9,13 @@ def index(request):
     :return: response object.
     """
     user_query = request.GET.get("query", "hello, world!")
-    name_results = ProductDocument.objects.search(name=user_query)
-    description_results = ProductDocument.objects.search(description=user_query)
+    # Both indexes are searched in a single request, and the results are fused into a single ranking
+    results = ProductDocument.objects.search(
+        name=user_query, description=user_query, fusion="rrf"
+    )
     return JsonResponse(
         {
             "message": "Hello, world!",
-            "name_results": list(name_results.values()),
-            "description_results": list(description_results.values()),
+            "results": list(results.values()),
         }
     )
@@ -1,8 +1,10 @@
 from .decorators import register_document
 from .documents import Document, VectorIndex
+from .registry import warm_up
 
 __all__ = [
     "Document",
     "VectorIndex",
     "register_document",
+    "warm_up",
 ]
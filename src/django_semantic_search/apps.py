@@ -9,8 +9,7 @@ class DjangoSemanticSearchConfig(AppConfig):
     verbose_name = "Django Semantic Search"
 
     def ready(self):
-        # Load the default settings
-        # TODO: verify whether the settings are already loaded, and not overwrite them
+        # Load the default settings, unless they are already defined in the project
         for setting in dir(default_settings):
-            if setting.isupper():
+            if setting.isupper() and not hasattr(settings, setting):
                 setattr(settings, setting, getattr(default_settings, setting))
@@ -1,9 +1,18 @@
 import abc
-from typing import List
+from typing import Dict, List, Optional
 
-from django_semantic_search.backends.types import IndexConfiguration
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
+
+from django_semantic_search.backends.fusion import fuse
+from django_semantic_search.backends.types import (
+    FilterCondition,
+    Fusion,
+    IndexConfiguration,
+    SearchResult,
+)
 from django_semantic_search.documents import Document
-from django_semantic_search.types import DocumentID
+from django_semantic_search.types import DocumentID, Vector
 
 
 class BaseVectorSearchBackend(abc.ABC):
@@ -11,6 +20,10 @@ class BaseVectorSearchBackend(abc.ABC):
     Base class for all the vector search backends, such as Qdrant.
     """
 
+    # Backends storing the vectors with the database connections of Django have to run the synchronous methods in
+    # the thread of the caller, so they use its connection and take part in its transaction
+    thread_sensitive: bool = False
+
     def __init__(self, index_configuration: IndexConfiguration):
         self.index_configuration = index_configuration
         self.configure()
@@ -24,17 +37,97 @@ class BaseVectorSearchBackend(abc.ABC):
 
     @abc.abstractmethod
     def search(
-        self, vector_name: str, query: List[float], limit: int = 10
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
     ) -> List[DocumentID]:
         """
         Search for the documents similar to the query vector in the backend.
         :param vector_name:
         :param query:
         :param limit:
+        :param filters: conditions on the metadata the documents have to match.
         :return:
         """
         raise NotImplementedError
 
+    def search_with_scores(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+    ) -> List[SearchResult]:
+        """
+        Search for the documents similar to the query vector in the backend, returning their scores as well.
+        :param vector_name: name of the vector to search in.
+        :param query: query vector.
+        :param limit: number of results to return.
+        :param filters: conditions on the metadata the documents have to match.
+        :param with_metadata: if set, the stored metadata of the documents is returned as well.
+        :return: list of the search results, ordered from the most similar.
+        """
+        raise NotImplementedError(
+            f"Backend {self.__class__.__name__} does not support returning the scores."
+        )
+
+    def hybrid_search(
+        self,
+        queries: Dict[str, Vector],
+        limit: int = 10,
+        fusion: Fusion = Fusion.RRF,
+        weights: Optional[Dict[str, float]] = None,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+    ) -> List[SearchResult]:
+        """
+        Search for the documents similar to the queries in multiple vectors at once, and combine the results into
+        a single ranking. Backends should override this method if they support the fusion natively, as the default
+        implementation searches in each vector separately and fuses the results on the client side.
+        :param queries: query vectors, keyed by the vector name.
+        :param limit: number of results to return.
+        :param fusion: method of combining the results.
+        :param weights: weights of the vectors, keyed by the vector name. Equal by default.
+        :param filters: conditions on the metadata the documents have to match.
+        :param with_metadata: if set, the stored metadata of the documents is returned as well.
+        :return: list of the fused search results, ordered from the most relevant.
+        """
+        results = {
+            vector_name: self.search_with_scores(
+                vector_name,
+                query,
+                limit=limit,
+                filters=filters,
+                with_metadata=with_metadata,
+            )
+            for vector_name, query in queries.items()
+        }
+        return fuse(results, fusion=fusion, weights=weights, limit=limit)
+
+    def search_queryset(
+        self,
+        queryset: QuerySet,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+    ) -> Optional[QuerySet]:
+        """
+        Restrict the queryset to the documents similar to the query vector, ordered from the most similar one. It lets
+        the backends storing the vectors in the same database as the models search and fetch the model instances in
+        a single query. The default implementation returns None, so the `search` method is used instead.
+        :param queryset: queryset of the model instances to search in.
+        :param vector_name: name of the vector to search in.
+        :param query: query vector.
+        :param limit: number of results to return.
+        :param filters: conditions on the metadata the documents have to match.
+        :return: ordered queryset, or None if the backend does not support it.
+        """
+        return None
+
     @abc.abstractmethod
     def save(self, document: Document):
         """
@@ -45,6 +138,36 @@ class BaseVectorSearchBackend(abc.ABC):
         """
         raise NotImplementedError
 
+    def bulk_save(self, documents: List[Document]):
+        """
+        Save multiple documents in the backend. Backends should override this method if they support bulk writes, as
+        the default implementation saves the documents one by one. The documents created with the precomputed vectors,
+        i.e. `Document(instance, vectors=...)`, are stored without running the embedding model.
+        :param documents: documents to save.
+        """
+        for document in documents:
+            self.save(document)
+
+    def get_content_hashes(self, document_id: DocumentID) -> Optional[Dict[str, str]]:
+        """
+        Return the hashes of the embedded texts of the stored document. They are used to detect which vectors
+        of the document have to be recalculated. Backends should override this method if they store the hashes,
+        as the default implementation forces all the vectors to be recalculated.
+        :param document_id: id of the document.
+        :return: dictionary of the hashes, keyed by the vector name, or None if the document is not stored.
+        """
+        return None
+
+    def partial_update(self, document: Document, vectors: Dict[str, Vector]):
+        """
+        Update the metadata of an already stored document, along with the selected vectors only. The remaining
+        vectors are kept as they are. Backends should override this method if they support partial updates, as the
+        default implementation saves the whole document.
+        :param document: document to update.
+        :param vectors: vectors to replace, keyed by the vector name. May be empty.
+        """
+        self.save(document)
+
     @abc.abstractmethod
     def delete(self, document_id: DocumentID):
         """
@@ -53,3 +176,122 @@ class BaseVectorSearchBackend(abc.ABC):
         :param document_id: id of the document to delete.
         """
         raise NotImplementedError
+
+    def bulk_delete(self, document_ids: List[DocumentID]):
+        """
+        Delete multiple documents from the backend. Backends should override this method if they support bulk deletes,
+        as the default implementation deletes the documents one by one.
+        :param document_ids: ids of the documents to delete.
+        """
+        for document_id in document_ids:
+            self.delete(document_id)
+
+    # Asynchronous counterparts of the methods above. Backends with a native asynchronous client should override
+    # them, as the default implementations run the synchronous methods in a worker thread, or in the thread shared
+    # with the other thread sensitive code, if `thread_sensitive` is set.
+
+    async def asearch(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+    ) -> List[DocumentID]:
+        """
+        Asynchronous version of the `search` method.
+        """
+        return await sync_to_async(self.search, thread_sensitive=self.thread_sensitive)(
+            vector_name, query, limit=limit, filters=filters
+        )
+
+    async def asearch_with_scores(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+    ) -> List[SearchResult]:
+        """
+        Asynchronous version of the `search_with_scores` method.
+        """
+        return await sync_to_async(
+            self.search_with_scores, thread_sensitive=self.thread_sensitive
+        )(
+            vector_name,
+            query,
+            limit=limit,
+            filters=filters,
+            with_metadata=with_metadata,
+        )
+
+    async def ahybrid_search(
+        self,
+        queries: Dict[str, Vector],
+        limit: int = 10,
+        fusion: Fusion = Fusion.RRF,
+        weights: Optional[Dict[str, float]] = None,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+    ) -> List[SearchResult]:
+        """
+        Asynchronous version of the `hybrid_search` method.
+        """
+        return await sync_to_async(
+            self.hybrid_search, thread_sensitive=self.thread_sensitive
+        )(
+            queries,
+            limit=limit,
+            fusion=fusion,
+            weights=weights,
+            filters=filters,
+            with_metadata=with_metadata,
+        )
+
+    async def asave(self, document: Document):
+        """
+        Asynchronous version of the `save` method.
+        """
+        await sync_to_async(self.save, thread_sensitive=self.thread_sensitive)(document)
+
+    async def abulk_save(self, documents: List[Document]):
+        """
+        Asynchronous version of the `bulk_save` method.
+        """
+        await sync_to_async(self.bulk_save, thread_sensitive=self.thread_sensitive)(
+            documents
+        )
+
+    async def aget_content_hashes(
+        self, document_id: DocumentID
+    ) -> Optional[Dict[str, str]]:
+        """
+        Asynchronous version of the `get_content_hashes` method.
+        """
+        return await sync_to_async(
+            self.get_content_hashes, thread_sensitive=self.thread_sensitive
+        )(document_id)
+
+    async def apartial_update(self, document: Document, vectors: Dict[str, Vector]):
+        """
+        Asynchronous version of the `partial_update` method.
+        """
+        await sync_to_async(
+            self.partial_update, thread_sensitive=self.thread_sensitive
+        )(document, vectors)
+
+    async def adelete(self, document_id: DocumentID):
+        """
+        Asynchronous version of the `delete` method.
+        """
+        await sync_to_async(self.delete, thread_sensitive=self.thread_sensitive)(
+            document_id
+        )
+
+    async def abulk_delete(self, document_ids: List[DocumentID]):
+        """
+        Asynchronous version of the `bulk_delete` method.
+        """
+        await sync_to_async(self.bulk_delete, thread_sensitive=self.thread_sensitive)(
+            document_ids
+        )
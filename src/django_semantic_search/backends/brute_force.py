@@ -0,0 +1,504 @@
+import contextlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from django_semantic_search import Document
+from django_semantic_search.backends.base import BaseVectorSearchBackend
+from django_semantic_search.backends.types import (
+    Distance,
+    FilterCondition,
+    IndexConfiguration,
+    SearchResult,
+)
+from django_semantic_search.types import (
+    DocumentID,
+    MetadataValue,
+    Vector,
+    to_metadata_value,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BruteForceBackend(BaseVectorSearchBackend):
+    """
+    Backend that keeps all the vectors in memory, in a contiguous float32 NumPy matrix per vector, and performs
+    an exact search by comparing the query with every stored vector. It does not require any external service, so
+    it is a good fit for small and medium catalogs, up to around a million vectors, and for the test environments.
+
+    **Requirements**:
+
+    ```bash
+    pip install django-semantic-search[numpy]
+    ```
+
+    **Usage**:
+
+    ```python title="settings.py"
+    SEMANTIC_SEARCH = {
+        "vector_store": {
+            "backend": "django_semantic_search.backends.brute_force.BruteForceBackend",
+            "configuration": {
+                "path": "/var/lib/semantic-search",
+            },
+        },
+        ...
+    }
+    ```
+
+    The `path` is optional. If set, the `persist` method writes a snapshot of the index into that directory, and
+    the backends created later, also in the other worker processes, load it as memory-mapped files, so the operating
+    system shares the pages between the processes. The snapshot is copied into the process memory on the first write.
+
+    Scores of the cosine and dot product distances are the similarities, while the Euclidean distance is returned
+    negated, so the higher score always means the more similar document.
+    """
+
+    # Fraction of the deleted rows, above which the matrices are compacted
+    COMPACTION_THRESHOLD = 0.25
+
+    # Number of rows allocated for the matrices, when the first document is added
+    INITIAL_CAPACITY = 1024
+
+    def __init__(
+        self, index_configuration: IndexConfiguration, path: Optional[str] = None
+    ):
+        """
+        :param index_configuration: configuration of the indexes.
+        :param path: directory to persist the snapshots of the index in.
+        """
+        self._path = path
+        self._lock = threading.RLock()
+        super().__init__(index_configuration)
+
+    def configure(self):
+        import numpy as np
+
+        with self._lock:
+            self._ids: List[Optional[DocumentID]] = []
+            self._positions: Dict[DocumentID, int] = {}
+            self._metadata: List[Optional[Dict[str, MetadataValue]]] = []
+            self._content_hashes: List[Optional[Dict[str, str]]] = []
+            self._alive = np.zeros(0, dtype=bool)
+            self._matrices = {
+                vector_name: np.zeros((0, vector_config.size), dtype=np.float32)
+                for vector_name, vector_config in self.index_configuration.vectors.items()
+            }
+            self._squared_norms = {
+                vector_name: np.zeros(0, dtype=np.float32)
+                for vector_name in self.index_configuration.vectors
+            }
+            self._count = 0
+            self._deleted = 0
+
+            if self._snapshot_path is not None and os.path.exists(
+                os.path.join(self._snapshot_path, "documents.json")
+            ):
+                self._load()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def search(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+    ) -> List[DocumentID]:
+        return [
+            result.id
+            for result in self.search_with_scores(
+                vector_name, query, limit, filters=filters
+            )
+        ]
+
+    def search_with_scores(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+    ) -> List[SearchResult]:
+        import numpy as np
+
+        with self._lock:
+            candidates = self._candidates(filters)
+            if candidates.size == 0 or limit <= 0:
+                return []
+
+            scores = self._scores(vector_name, query, candidates)
+            k = min(limit, candidates.size)
+            if k < candidates.size:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(candidates.size)
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            return [
+                self._to_search_result(candidates[i], scores[i], with_metadata)
+                for i in top
+            ]
+
+    def save(self, document: Document):
+        self.bulk_save([document])
+
+    def bulk_save(self, documents: List[Document]):
+        if not documents:
+            return
+
+        # Documents are converted before acquiring the lock, as calculating the vectors might take a while.
+        # If the same document occurs multiple times, the last version wins.
+        rows = {}
+        for document in documents:
+            rows[to_metadata_value(document.id)] = (
+                document.vectors(),
+                document.metadata(),
+                document.content_hashes(),
+            )
+        self._upsert(rows)
+
+    def get_content_hashes(self, document_id: DocumentID) -> Optional[Dict[str, str]]:
+        with self._lock:
+            position = self._positions.get(to_metadata_value(document_id))
+            if position is None:
+                return None
+            return dict(self._content_hashes[position] or {})
+
+    def partial_update(self, document: Document, vectors: Dict[str, Vector]):
+        import numpy as np
+
+        metadata = document.metadata()
+        content_hashes = document.content_hashes()
+        with self._lock:
+            position = self._positions.get(to_metadata_value(document.id))
+            if position is None:
+                self.bulk_save([document])
+                return
+
+            self._make_writable()
+            positions = np.asarray([position], dtype=np.intp)
+            for vector_name, vector in vectors.items():
+                self._set_vectors(vector_name, positions, [vector])
+            self._metadata[position] = metadata
+            self._content_hashes[position] = content_hashes
+
+    def delete(self, document_id: DocumentID):
+        with self._lock:
+            position = self._positions.pop(to_metadata_value(document_id), None)
+            if position is None:
+                return
+
+            self._make_writable()
+            self._alive[position] = False
+            self._ids[position] = None
+            self._metadata[position] = None
+            self._content_hashes[position] = None
+            self._deleted += 1
+            if self._deleted > self._count * self.COMPACTION_THRESHOLD:
+                self.compact()
+
+    def compact(self):
+        """
+        Remove the rows of the deleted documents from the matrices, so they no longer take memory and search time.
+        It is called automatically, once the deleted rows exceed the compaction threshold.
+        """
+        import numpy as np
+
+        with self._lock:
+            keep = np.flatnonzero(self._alive[: self._count])
+            self._matrices = {
+                vector_name: np.ascontiguousarray(matrix[keep])
+                for vector_name, matrix in self._matrices.items()
+            }
+            self._squared_norms = {
+                vector_name: np.ascontiguousarray(squared_norms[keep])
+                for vector_name, squared_norms in self._squared_norms.items()
+            }
+            self._ids = [self._ids[position] for position in keep]
+            self._metadata = [self._metadata[position] for position in keep]
+            self._content_hashes = [self._content_hashes[position] for position in keep]
+            self._positions = {
+                document_id: position for position, document_id in enumerate(self._ids)
+            }
+            self._alive = np.ones(len(keep), dtype=bool)
+            self._count = len(keep)
+            self._deleted = 0
+
+    def persist(self):
+        """
+        Write a snapshot of the index into the configured directory. The files are replaced atomically, so the
+        processes loading the snapshot at the same time never see a partially written one.
+        """
+        import numpy as np
+
+        if self._snapshot_path is None:
+            raise ValueError("The path to persist the index in is not configured.")
+
+        with self._lock:
+            if self._deleted:
+                self.compact()
+            os.makedirs(self._snapshot_path, exist_ok=True)
+            for vector_name, matrix in self._matrices.items():
+                with self._atomic_write(f"{vector_name}.npy", "wb") as f:
+                    np.save(f, matrix[: self._count])
+            with self._atomic_write("documents.json", "w") as f:
+                json.dump(
+                    {
+                        "ids": self._ids[: self._count],
+                        "metadata": self._metadata[: self._count],
+                        "content_hashes": self._content_hashes[: self._count],
+                    },
+                    f,
+                )
+        logger.info(
+            f"Persisted {self._count} documents of {self.index_configuration.namespace} in {self._snapshot_path}"
+        )
+
+    @property
+    def _snapshot_path(self) -> Optional[str]:
+        if self._path is None:
+            return None
+        return os.path.join(self._path, self.index_configuration.namespace)
+
+    @contextlib.contextmanager
+    def _atomic_write(self, file_name: str, mode: str):
+        path = os.path.join(self._snapshot_path, file_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, mode) as f:
+                yield f
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _load(self):
+        """
+        Load the persisted snapshot of the index. The matrices are memory-mapped in the read-only mode.
+        """
+        import numpy as np
+
+        with open(os.path.join(self._snapshot_path, "documents.json")) as f:
+            documents = json.load(f)
+
+        count = len(documents["ids"])
+        matrices = {}
+        for vector_name, vector_config in self.index_configuration.vectors.items():
+            matrix = np.load(
+                os.path.join(self._snapshot_path, f"{vector_name}.npy"), mmap_mode="r"
+            )
+            if matrix.shape != (count, vector_config.size):
+                raise ValueError(
+                    f"Snapshot of the vector {vector_name} in {self._snapshot_path} has shape {matrix.shape}, "
+                    f"but ({count}, {vector_config.size}) was expected."
+                )
+            matrices[vector_name] = matrix
+
+        self._replace(
+            documents["ids"],
+            documents["metadata"],
+            documents["content_hashes"],
+            matrices,
+        )
+
+    def _upsert(
+        self,
+        rows: Dict[
+            DocumentID,
+            Tuple[Dict[str, Vector], Dict[str, MetadataValue], Dict[str, str]],
+        ],
+    ):
+        """
+        Insert or update the rows of the documents.
+        :param rows: vectors, metadata and content hashes of the documents, keyed by the document ID.
+        """
+        import numpy as np
+
+        with self._lock:
+            new_ids = [
+                document_id
+                for document_id in rows
+                if document_id not in self._positions
+            ]
+            self._reserve(len(new_ids))
+            for document_id in new_ids:
+                self._positions[document_id] = self._count
+                self._ids.append(document_id)
+                self._metadata.append(None)
+                self._content_hashes.append(None)
+                self._count += 1
+
+            positions = np.asarray(
+                [self._positions[document_id] for document_id in rows], dtype=np.intp
+            )
+            for vector_name in self._matrices:
+                self._set_vectors(
+                    vector_name,
+                    positions,
+                    [vectors[vector_name] for vectors, _, _ in rows.values()],
+                )
+            for position, (_, metadata, content_hashes) in zip(
+                positions, rows.values()
+            ):
+                self._metadata[position] = metadata
+                self._content_hashes[position] = content_hashes
+            self._alive[positions] = True
+
+    def _replace(
+        self,
+        ids: List[DocumentID],
+        metadata: List[Dict[str, MetadataValue]],
+        content_hashes: List[Dict[str, str]],
+        matrices: Dict[str, Any],
+    ):
+        """
+        Replace the whole content of the index. The vectors have to be already normalized for the cosine distance.
+        The matrices are used as they are, and copied only before they get modified.
+        :param ids: IDs of the documents.
+        :param metadata: metadata of the documents, aligned with the IDs.
+        :param content_hashes: hashes of the embedded texts, aligned with the IDs.
+        :param matrices: matrices of the vectors, keyed by the vector name, with a row per document.
+        """
+        import numpy as np
+
+        with self._lock:
+            self._matrices = dict(matrices)
+            self._squared_norms = {
+                vector_name: np.einsum("ij,ij->i", matrix, matrix)
+                for vector_name, matrix in matrices.items()
+            }
+            self._ids = list(ids)
+            self._metadata = list(metadata)
+            self._content_hashes = list(content_hashes)
+            self._positions = {
+                document_id: position for position, document_id in enumerate(self._ids)
+            }
+            self._alive = np.ones(len(self._ids), dtype=bool)
+            self._count = len(self._ids)
+            self._deleted = 0
+
+    def _candidates(self, filters: Optional[List[FilterCondition]]):
+        """
+        Select the rows of the stored documents matching all the filters.
+        :param filters: conditions on the metadata the documents have to match.
+        :return: array of the positions of the matching rows.
+        """
+        import numpy as np
+
+        candidates = np.flatnonzero(self._alive[: self._count])
+        if not filters:
+            return candidates
+        return np.asarray(
+            [
+                position
+                for position in candidates
+                if all(
+                    condition.matches(self._metadata[position]) for condition in filters
+                )
+            ],
+            dtype=np.intp,
+        )
+
+    def _to_search_result(
+        self, position: int, score: float, with_metadata: bool
+    ) -> SearchResult:
+        return SearchResult(
+            id=self._ids[position],
+            score=float(score),
+            metadata=dict(self._metadata[position]) if with_metadata else {},
+        )
+
+    def _reserve(self, additional: int):
+        """
+        Make sure the matrices have the room for the additional rows. The capacity is doubled, so appending
+        the documents one by one takes an amortized constant time.
+        :param additional: number of the rows to add.
+        """
+        import numpy as np
+
+        self._make_writable()
+        capacity = len(self._alive)
+        required = self._count + additional
+        if required <= capacity:
+            return
+
+        capacity = max(required, capacity * 2, self.INITIAL_CAPACITY)
+        for vector_name, matrix in self._matrices.items():
+            resized = np.zeros((capacity, matrix.shape[1]), dtype=np.float32)
+            resized[: self._count] = matrix[: self._count]
+            self._matrices[vector_name] = resized
+            squared_norms = np.zeros(capacity, dtype=np.float32)
+            squared_norms[: self._count] = self._squared_norms[vector_name][
+                : self._count
+            ]
+            self._squared_norms[vector_name] = squared_norms
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._count] = self._alive[: self._count]
+        self._alive = alive
+
+    def _make_writable(self):
+        """
+        Copy the memory-mapped snapshot into the process memory, before it gets modified.
+        """
+        import numpy as np
+
+        for vector_name, matrix in self._matrices.items():
+            if not matrix.flags.writeable:
+                self._matrices[vector_name] = np.array(matrix, dtype=np.float32)
+
+    def _set_vectors(self, vector_name: str, positions, vectors: List[Vector]):
+        import numpy as np
+
+        rows = np.asarray(vectors, dtype=np.float32)
+        if self.index_configuration.vectors[vector_name].distance == Distance.COSINE:
+            # Vectors are normalized upfront, so the cosine similarity becomes a dot product
+            norms = np.linalg.norm(rows, axis=1, keepdims=True)
+            rows = rows / np.where(norms == 0, 1, norms)
+        self._matrices[vector_name][positions] = rows
+        self._squared_norms[vector_name][positions] = np.einsum("ij,ij->i", rows, rows)
+
+    def _prepare_query(self, vector_name: str, query: List[float]):
+        """
+        Convert the query into a float32 array, normalized if the vector uses the cosine distance.
+        """
+        import numpy as np
+
+        query = np.asarray(query, dtype=np.float32)
+        if self.index_configuration.vectors[vector_name].distance == Distance.COSINE:
+            norm = np.linalg.norm(query)
+            if norm > 0:
+                query = query / norm
+        return query
+
+    def _scores(self, vector_name: str, query: List[float], candidates):
+        """
+        Calculate the scores of the candidate rows, so the higher score means the more similar document.
+        :param vector_name: name of the vector to search in.
+        :param query: query vector.
+        :param candidates: positions of the rows to score.
+        :return: array of the scores, aligned with the candidates.
+        """
+        import numpy as np
+
+        query = self._prepare_query(vector_name, query)
+        distance = self.index_configuration.vectors[vector_name].distance
+        matrix = self._matrices[vector_name]
+        if candidates.size == self._count:
+            # Avoid copying the whole matrix, if there is nothing to exclude
+            dot_products = (matrix[: self._count] @ query)[candidates]
+        else:
+            dot_products = matrix[candidates] @ query
+        if distance != Distance.EUCLIDEAN:
+            return dot_products
+
+        squared_distances = (
+            self._squared_norms[vector_name][candidates]
+            - 2 * dot_products
+            + np.dot(query, query)
+        )
+        return -np.sqrt(np.maximum(squared_distances, 0))
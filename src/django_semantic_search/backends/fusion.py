@@ -0,0 +1,65 @@
+import statistics
+from typing import Dict, List, Optional
+
+from django_semantic_search.backends.types import Fusion, SearchResult
+from django_semantic_search.types import DocumentID
+
+# Constant of the Reciprocal Rank Fusion, reducing the impact of the top-ranked documents
+RRF_K = 60
+
+
+def fuse(
+    results: Dict[str, List[SearchResult]],
+    fusion: Fusion = Fusion.RRF,
+    weights: Optional[Dict[str, float]] = None,
+    limit: int = 10,
+) -> List[SearchResult]:
+    """
+    Combine the results of the searches in multiple vectors into a single ranking. It is used by the backends which
+    do not support the fusion natively, or when the weights are not supported by the backend.
+    :param results: search results, keyed by the vector name.
+    :param fusion: fusion method to use.
+    :param weights: weights of the vectors, equal by default.
+    :param limit: number of results to return.
+    :return: fused search results, ordered from the most relevant.
+    """
+    weights = weights or {}
+    scores: Dict[DocumentID, float] = {}
+    documents: Dict[DocumentID, SearchResult] = {}
+    for vector_name, vector_results in results.items():
+        weight = weights.get(vector_name, 1.0)
+        if fusion == Fusion.RRF:
+            fused_scores = [
+                1.0 / (RRF_K + rank + 1) for rank in range(len(vector_results))
+            ]
+        else:
+            fused_scores = _normalize_distribution(
+                [result.score for result in vector_results]
+            )
+        for result, fused_score in zip(vector_results, fused_scores):
+            scores[result.id] = scores.get(result.id, 0.0) + weight * fused_score
+            documents.setdefault(result.id, result)
+
+    ranking = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return [
+        SearchResult(
+            id=document_id, score=score, metadata=documents[document_id].metadata
+        )
+        for document_id, score in ranking[:limit]
+    ]
+
+
+def _normalize_distribution(scores: List[float]) -> List[float]:
+    """
+    Normalize the scores to the [0, 1] range, using the mean +/- 3 standard deviations as the limits.
+    :param scores: raw scores of the documents.
+    :return: normalized scores.
+    """
+    if not scores:
+        return []
+    mean = statistics.fmean(scores)
+    deviation = statistics.pstdev(scores)
+    if deviation == 0:
+        return [0.5 for _ in scores]
+    lower, upper = mean - 3 * deviation, mean + 3 * deviation
+    return [min(max((score - lower) / (upper - lower), 0.0), 1.0) for score in scores]
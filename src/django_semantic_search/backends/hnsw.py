@@ -0,0 +1,449 @@
+import heapq
+import logging
+import math
+import os
+import random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django_semantic_search.backends.brute_force import BruteForceBackend
+from django_semantic_search.backends.types import (
+    Distance,
+    FilterCondition,
+    IndexConfiguration,
+    SearchResult,
+)
+from django_semantic_search.types import Vector
+
+logger = logging.getLogger(__name__)
+
+
+class HNSWGraph:
+    """
+    Hierarchical Navigable Small World graph over the rows of a vector matrix. The graph stores only the positions
+    of the rows, while the vectors are provided by the callback, so the matrix might be reallocated freely.
+
+    Similarity is the dot product of the vectors, or the negated Euclidean distance, so the higher value always means
+    the closer vectors. Vectors compared with the cosine distance are expected to be normalized.
+    """
+
+    def __init__(
+        self,
+        vectors: Callable[[List[int]], Any],
+        distance: Distance,
+        m: int = 16,
+        ef_construction: int = 200,
+        seed: Optional[int] = None,
+    ):
+        """
+        :param vectors: callback returning the vectors of the rows at the given positions.
+        :param distance: distance used to compare the vectors.
+        :param m: number of the connections created for each node on the upper layers, twice as many on the bottom.
+        :param ef_construction: size of the candidate list while inserting the nodes.
+        :param seed: seed of the random generator used to assign the layers, for reproducible graphs.
+        """
+        self._vectors = vectors
+        self._distance = distance
+        self.m = m
+        self.ef_construction = ef_construction
+        self._level_multiplier = 1 / math.log(max(m, 2))
+        self._random = random.Random(seed)
+        self.clear()
+
+    def clear(self):
+        """
+        Remove all the nodes from the graph.
+        """
+        self._levels: Dict[int, int] = {}
+        self._layers: List[Dict[int, List[int]]] = []
+        self.entry_point: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def similarities(self, query, positions: List[int]):
+        """
+        Calculate the similarities between the query and the vectors at the given positions.
+        :param query: query vector, prepared as the stored ones.
+        :param positions: positions of the rows.
+        :return: array of the similarities, aligned with the positions.
+        """
+        import numpy as np
+
+        rows = self._vectors(positions)
+        if self._distance == Distance.EUCLIDEAN:
+            return -np.linalg.norm(rows - query, axis=1)
+        return rows @ query
+
+    def add(self, position: int):
+        """
+        Insert the row into the graph. If the row is already there, because its vector has changed, the outgoing
+        connections of the node are recalculated.
+        :param position: position of the row.
+        """
+        query = self._vectors([position])[0]
+        level = self._levels.get(position)
+        if level is None:
+            level = int(-math.log(1 - self._random.random()) * self._level_multiplier)
+            self._levels[position] = level
+        while len(self._layers) <= level:
+            self._layers.append({})
+
+        if self.entry_point is None or (
+            self.entry_point == position and len(self._levels) == 1
+        ):
+            for layer in self._layers[: level + 1]:
+                layer[position] = []
+            self.entry_point = position
+            return
+
+        max_level = self._levels[self.entry_point]
+        entry_points = [self.entry_point]
+        for layer_level in range(max_level, level, -1):
+            entry_points = [
+                nearest
+                for _, nearest in self._search_layer(
+                    query, entry_points, 1, layer_level
+                )
+            ]
+
+        for layer_level in range(min(level, max_level), -1, -1):
+            found = [
+                (similarity, candidate)
+                for similarity, candidate in self._search_layer(
+                    query, entry_points, self.ef_construction, layer_level
+                )
+                if candidate != position
+            ]
+            neighbors = [candidate for _, candidate in found[: self.m]]
+            self._layers[layer_level][position] = neighbors
+            for neighbor in neighbors:
+                self._connect(neighbor, position, layer_level)
+            entry_points = [candidate for _, candidate in found] or entry_points
+
+        for layer in self._layers[max_level + 1 : level + 1]:
+            layer[position] = []
+        if level > max_level:
+            self.entry_point = position
+
+    def search(
+        self, query, limit: int, ef: int, accept: Callable[[int], bool]
+    ) -> List[Tuple[float, int]]:
+        """
+        Search for the nodes closest to the query. The nodes not accepted by the callback, such as the deleted or
+        filtered out ones, are still traversed, but not returned.
+        :param query: query vector, prepared as the stored ones.
+        :param limit: number of the results to return.
+        :param ef: size of the candidate list, higher values improve the recall at the cost of speed.
+        :param accept: callback deciding if the node might be returned.
+        :return: list of the similarities and positions, from the closest node.
+        """
+        if self.entry_point is None:
+            return []
+
+        entry_points = [self.entry_point]
+        for layer_level in range(self._levels[self.entry_point], 0, -1):
+            entry_points = [
+                nearest
+                for _, nearest in self._search_layer(
+                    query, entry_points, 1, layer_level
+                )
+            ]
+        found = self._search_layer(query, entry_points, max(ef, limit), 0)
+        return [
+            (similarity, candidate)
+            for similarity, candidate in found
+            if accept(candidate)
+        ][:limit]
+
+    def to_arrays(self) -> Dict[str, Any]:
+        """
+        Convert the graph into flat arrays, so it might be stored with `numpy.savez`.
+        :return: dictionary of the arrays.
+        """
+        import numpy as np
+
+        arrays = {
+            "nodes": np.fromiter(self._levels.keys(), dtype=np.int64),
+            "levels": np.fromiter(self._levels.values(), dtype=np.int64),
+            "entry_point": np.asarray(
+                [-1 if self.entry_point is None else self.entry_point], dtype=np.int64
+            ),
+        }
+        for layer_level, layer in enumerate(self._layers):
+            neighbors = list(layer.values())
+            arrays[f"layer_{layer_level}_nodes"] = np.fromiter(
+                layer.keys(), dtype=np.int64
+            )
+            arrays[f"layer_{layer_level}_offsets"] = np.cumsum(
+                [0] + [len(node_neighbors) for node_neighbors in neighbors],
+                dtype=np.int64,
+            )
+            arrays[f"layer_{layer_level}_neighbors"] = np.fromiter(
+                (
+                    neighbor
+                    for node_neighbors in neighbors
+                    for neighbor in node_neighbors
+                ),
+                dtype=np.int64,
+            )
+        return arrays
+
+    def load_arrays(self, arrays: Dict[str, Any]):
+        """
+        Restore the graph out of the arrays created by `to_arrays`.
+        :param arrays: dictionary of the arrays.
+        """
+        self.clear()
+        self._levels = dict(zip(arrays["nodes"].tolist(), arrays["levels"].tolist()))
+        layer_level = 0
+        while f"layer_{layer_level}_nodes" in arrays:
+            nodes = arrays[f"layer_{layer_level}_nodes"].tolist()
+            offsets = arrays[f"layer_{layer_level}_offsets"].tolist()
+            neighbors = arrays[f"layer_{layer_level}_neighbors"].tolist()
+            self._layers.append(
+                {
+                    node: neighbors[offsets[i] : offsets[i + 1]]
+                    for i, node in enumerate(nodes)
+                }
+            )
+            layer_level += 1
+        entry_point = int(arrays["entry_point"][0])
+        self.entry_point = None if entry_point < 0 else entry_point
+
+    def _search_layer(
+        self, query, entry_points: List[int], ef: int, layer_level: int
+    ) -> List[Tuple[float, int]]:
+        """
+        Greedy beam search within a single layer of the graph.
+        :return: list of at most `ef` similarities and positions, from the closest node.
+        """
+        layer = self._layers[layer_level]
+        visited = set(entry_points)
+        similarities = self.similarities(query, entry_points).tolist()
+        candidates = [
+            (-similarity, position)
+            for similarity, position in zip(similarities, entry_points)
+        ]
+        heapq.heapify(candidates)
+        results = [
+            (similarity, position)
+            for similarity, position in zip(similarities, entry_points)
+        ]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            negated_similarity, position = heapq.heappop(candidates)
+            if len(results) >= ef and -negated_similarity < results[0][0]:
+                break
+            neighbors = [
+                neighbor
+                for neighbor in layer.get(position, ())
+                if neighbor not in visited
+            ]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+            for similarity, neighbor in zip(
+                self.similarities(query, neighbors).tolist(), neighbors
+            ):
+                if len(results) < ef or similarity > results[0][0]:
+                    heapq.heappush(candidates, (-similarity, neighbor))
+                    heapq.heappush(results, (similarity, neighbor))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return sorted(results, reverse=True)
+
+    def _connect(self, node: int, neighbor: int, layer_level: int):
+        """
+        Add the connection from the node to the neighbor, and drop the farthest connections if there are too many.
+        """
+        import numpy as np
+
+        connections = self._layers[layer_level].setdefault(node, [])
+        if neighbor in connections:
+            return
+        connections.append(neighbor)
+        max_connections = self.m * 2 if layer_level == 0 else self.m
+        if len(connections) <= max_connections:
+            return
+        similarities = self.similarities(self._vectors([node])[0], connections)
+        closest = np.argsort(-similarities, kind="stable")[:max_connections]
+        self._layers[layer_level][node] = [connections[i] for i in closest]
+
+
+class HNSWBackend(BruteForceBackend):
+    """
+    Backend performing an approximate search over a local HNSW graph, built separately for each vector. It runs
+    in-process, just like the brute force backend it extends, but the search time grows logarithmically with the
+    number of the documents, so it fits the deployments with larger catalogs that cannot run a vector database.
+
+    **Requirements**:
+
+    ```bash
+    pip install django-semantic-search[numpy]
+    ```
+
+    **Usage**:
+
+    ```python title="settings.py"
+    SEMANTIC_SEARCH = {
+        "vector_store": {
+            "backend": "django_semantic_search.backends.hnsw.HNSWBackend",
+            "configuration": {
+                "path": "/var/lib/semantic-search",
+                "m": 16,
+                "ef_construction": 200,
+                "ef_search": 64,
+            },
+        },
+        ...
+    }
+    ```
+
+    Deleted documents are kept in the graph as tombstones, and they are skipped in the results. Once they exceed
+    the compaction threshold, the graphs are rebuilt from scratch. Searches matching fewer documents than
+    `full_scan_threshold`, e.g. due to selective filters, are answered exactly, without using the graph.
+    """
+
+    def __init__(
+        self,
+        index_configuration: IndexConfiguration,
+        path: Optional[str] = None,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        full_scan_threshold: int = 1000,
+        seed: Optional[int] = None,
+    ):
+        """
+        :param index_configuration: configuration of the indexes.
+        :param path: directory to persist the snapshots of the index in.
+        :param m: number of the connections of each node in the graph.
+        :param ef_construction: size of the candidate list while building the graph.
+        :param ef_search: size of the candidate list while searching.
+        :param full_scan_threshold: number of the matching documents, below which the exact search is used.
+        :param seed: seed of the random generator, for reproducible graphs.
+        """
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.full_scan_threshold = full_scan_threshold
+        self._seed = seed
+        super().__init__(index_configuration, path=path)
+
+    def configure(self):
+        self._graphs = {
+            vector_name: HNSWGraph(
+                vectors=self._vector_getter(vector_name),
+                distance=vector_config.distance,
+                m=self.m,
+                ef_construction=self.ef_construction,
+                seed=self._seed,
+            )
+            for vector_name, vector_config in self.index_configuration.vectors.items()
+        }
+        super().configure()
+
+    def search_with_scores(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+    ) -> List[SearchResult]:
+        import numpy as np
+
+        with self._lock:
+            candidates = self._candidates(filters)
+            if candidates.size <= max(self.full_scan_threshold, limit):
+                return super().search_with_scores(
+                    vector_name, query, limit, filters, with_metadata
+                )
+
+            accepted = np.zeros(self._count, dtype=bool)
+            accepted[candidates] = True
+            prepared_query = self._prepare_query(vector_name, query)
+            ef = self.ef_search
+            while True:
+                found = self._graphs[vector_name].search(
+                    prepared_query, limit, ef, accept=accepted.__getitem__
+                )
+                # Selective filters might leave too few results among the candidates, so the search is repeated
+                # with a wider candidate list
+                if len(found) >= limit or ef >= self._count:
+                    break
+                ef *= 2
+
+            return [
+                self._to_search_result(position, similarity, with_metadata)
+                for similarity, position in found
+            ]
+
+    def compact(self):
+        with self._lock:
+            super().compact()
+            self._rebuild()
+
+    def persist(self):
+        import numpy as np
+
+        if self._snapshot_path is None:
+            raise ValueError("The path to persist the index in is not configured.")
+
+        with self._lock:
+            if self._deleted:
+                self.compact()
+            os.makedirs(self._snapshot_path, exist_ok=True)
+            # Graphs are written first, as the documents file marks the snapshot as complete
+            for vector_name, graph in self._graphs.items():
+                with self._atomic_write(f"{vector_name}.hnsw.npz", "wb") as f:
+                    np.savez(f, **graph.to_arrays())
+            super().persist()
+
+    def _load(self):
+        import numpy as np
+
+        super()._load()
+        for vector_name, graph in self._graphs.items():
+            graph_path = os.path.join(self._snapshot_path, f"{vector_name}.hnsw.npz")
+            if not os.path.exists(graph_path):
+                logger.warning(
+                    f"Graph of the vector {vector_name} is missing in {self._snapshot_path}. Rebuilding it."
+                )
+                self._rebuild(vector_name)
+                continue
+            with np.load(graph_path) as arrays:
+                graph.load_arrays(dict(arrays))
+            if len(graph) != self._count:
+                logger.warning(
+                    f"Graph of the vector {vector_name} in {self._snapshot_path} is outdated. Rebuilding it."
+                )
+                self._rebuild(vector_name)
+
+    def _set_vectors(self, vector_name: str, positions, vectors: List[Vector]):
+        super()._set_vectors(vector_name, positions, vectors)
+        graph = self._graphs[vector_name]
+        for position in positions.tolist():
+            graph.add(position)
+
+    def _rebuild(self, *vector_names: str):
+        """
+        Build the graphs from scratch, out of the stored documents.
+        :param vector_names: names of the vectors to rebuild the graphs for, all by default.
+        """
+        import numpy as np
+
+        for vector_name in vector_names or self._graphs:
+            graph = self._graphs[vector_name]
+            graph.clear()
+            for position in np.flatnonzero(self._alive[: self._count]).tolist():
+                graph.add(position)
+
+    def _vector_getter(self, vector_name: str):
+        def vectors(positions: List[int]):
+            return self._matrices[vector_name][positions]
+
+        return vectors
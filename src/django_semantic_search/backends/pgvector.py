@@ -0,0 +1,429 @@
+import json
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+from django.db import DatabaseError, connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import FloatField, QuerySet
+from django.db.models.expressions import RawSQL
+
+from django_semantic_search import Document
+from django_semantic_search.backends.base import BaseVectorSearchBackend
+from django_semantic_search.backends.types import (
+    Distance,
+    FilterCondition,
+    FilterOperator,
+    IndexConfiguration,
+    SearchResult,
+)
+from django_semantic_search.types import DocumentID, Vector, to_metadata_value
+
+logger = logging.getLogger(__name__)
+
+
+class PgVectorBackend(BaseVectorSearchBackend):
+    """
+    Backend that stores the vectors in the same PostgreSQL database as the models, using the pgvector extension.
+    Each namespace is stored in a separate table, with a column per vector, so no additional service is required.
+
+    **Requirements**:
+
+    The database has to be PostgreSQL with the [pgvector](https://github.com/pgvector/pgvector) extension available.
+    The extension is enabled automatically, if the database user is allowed to do so.
+
+    **Usage**:
+
+    ```python title="settings.py"
+    SEMANTIC_SEARCH = {
+        "vector_store": {
+            "backend": "django_semantic_search.backends.pgvector.PgVectorBackend",
+            "configuration": {
+                "using": "default",
+                "index_type": "hnsw",
+                "m": 16,
+                "ef_construction": 64,
+                "ef_search": 40,
+            },
+        },
+        ...
+    }
+    ```
+
+    The vectors are written with the same database connection as the models, so they are stored in the same
+    transaction as the model changes. The search returns a queryset, which selects the most similar documents and
+    fetches the model instances in a single SQL query.
+    """
+
+    OPERATORS = {
+        Distance.COSINE: "<=>",
+        Distance.EUCLIDEAN: "<->",
+        Distance.DOT_PRODUCT: "<#>",
+    }
+
+    OPERATOR_CLASSES = {
+        Distance.COSINE: "vector_cosine_ops",
+        Distance.EUCLIDEAN: "vector_l2_ops",
+        Distance.DOT_PRODUCT: "vector_ip_ops",
+    }
+
+    INDEX_TYPES = ("hnsw", "ivfflat")
+
+    thread_sensitive = True
+
+    def __init__(
+        self,
+        index_configuration: IndexConfiguration,
+        using: str = "default",
+        table_prefix: str = "semantic_search_",
+        index_type: Optional[str] = "hnsw",
+        m: int = 16,
+        ef_construction: int = 64,
+        ef_search: Optional[int] = None,
+        lists: int = 100,
+        probes: Optional[int] = None,
+    ):
+        """
+        :param index_configuration: configuration of the indexes.
+        :param using: alias of the database to store the vectors in.
+        :param table_prefix: prefix of the tables created for the namespaces.
+        :param index_type: type of the vector index, either "hnsw" or "ivfflat". None disables the index, so the
+                           search is always exact.
+        :param m: maximum number of the connections per node of the HNSW index.
+        :param ef_construction: size of the candidate list while building the HNSW index.
+        :param ef_search: size of the candidate list while searching the HNSW index, set per connection.
+        :param lists: number of the lists of the IVFFlat index.
+        :param probes: number of the lists searched in the IVFFlat index, set per connection.
+        """
+        if index_type is not None and index_type not in self.INDEX_TYPES:
+            raise ValueError(
+                f"Index type {index_type} is not supported, use one of {self.INDEX_TYPES}"
+            )
+        self.using = using
+        self.table_prefix = table_prefix
+        self.index_type = index_type
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.lists = lists
+        self.probes = probes
+        self._configured = False
+        super().__init__(index_configuration)
+        connection_created.connect(
+            self._configure_connection, dispatch_uid=f"{self.__class__}:{self.table}"
+        )
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    @property
+    def table(self) -> str:
+        """
+        Name of the table storing the documents of the namespace.
+        """
+        namespace = re.sub(r"\W", "_", self.index_configuration.namespace).lower()
+        return f"{self.table_prefix}{namespace}"
+
+    def configure(self):
+        """
+        Create the table and the vector indexes, unless they exist. If the database is not available yet, e.g. while
+        running the management commands, the configuration is retried on the first use of the backend.
+        """
+        try:
+            # The savepoint keeps the surrounding transaction usable if any of the statements fails
+            with (
+                transaction.atomic(using=self.using),
+                self.connection.cursor() as cursor,
+            ):
+                for statement in self._schema_statements():
+                    cursor.execute(statement)
+                self._configure_connection(connection=self.connection)
+        except DatabaseError as e:
+            logger.warning(f"Could not configure the table {self.table}: {e}")
+            return
+        self._configured = True
+
+    def search(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+    ) -> List[DocumentID]:
+        return [
+            result.id
+            for result in self.search_with_scores(
+                vector_name, query, limit, filters=filters
+            )
+        ]
+
+    def search_with_scores(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+    ) -> List[SearchResult]:
+        self._ensure_configured()
+        column = self._quote(vector_name)
+        operator = self._operator(vector_name)
+        where, params = self._where(filters)
+        sql = (
+            f"SELECT id::text, {column} {operator} %s::vector AS distance"
+            f"{', metadata::text' if with_metadata else ''} "
+            f"FROM {self._quote(self.table)}{where} "
+            f"ORDER BY distance LIMIT %s"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [self._to_vector(query), *params, limit])
+            rows = cursor.fetchall()
+        return [
+            SearchResult(
+                id=json.loads(row[0]),
+                score=self._to_score(vector_name, row[1]),
+                metadata=json.loads(row[2]) if with_metadata else {},
+            )
+            for row in rows
+        ]
+
+    def search_queryset(
+        self,
+        queryset: QuerySet,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+    ) -> Optional[QuerySet]:
+        if queryset.db != self.using:
+            return None
+
+        self._ensure_configured()
+        model_meta = queryset.model._meta
+        pk_column = (
+            f"{self._quote(model_meta.db_table)}.{self._quote(model_meta.pk.column)}"
+        )
+        pk_type = model_meta.pk.db_type(self.connection)
+        table = self._quote(self.table)
+        distance = (
+            f"{self._quote(vector_name)} {self._operator(vector_name)} %s::vector"
+        )
+        vector = self._to_vector(query)
+        where, params = self._where(filters)
+        # The subquery selects the closest documents using the vector index, while the correlated one calculates
+        # the distance for the ordering, only for the selected rows
+        return (
+            queryset.filter(
+                pk__in=RawSQL(
+                    f"SELECT (id #>> '{{}}')::{pk_type} FROM {table}{where} "
+                    f"ORDER BY {distance} LIMIT %s",
+                    [*params, vector, limit],
+                )
+            )
+            .alias(
+                semantic_search_distance=RawSQL(
+                    f"(SELECT {distance} FROM {table} WHERE {table}.id = to_jsonb({pk_column}))",
+                    [vector],
+                    output_field=FloatField(),
+                )
+            )
+            .order_by("semantic_search_distance")
+        )
+
+    def save(self, document: Document):
+        self.bulk_save([document])
+
+    def bulk_save(self, documents: List[Document]):
+        if not documents:
+            return
+
+        self._ensure_configured()
+        vector_names = list(self.index_configuration.vectors.keys())
+        columns = ", ".join(self._quote(name) for name in vector_names)
+        placeholders = ", ".join("%s::vector" for _ in vector_names)
+        updates = ", ".join(
+            f"{column} = EXCLUDED.{column}"
+            for column in [
+                "metadata",
+                "content_hashes",
+                *map(self._quote, vector_names),
+            ]
+        )
+        sql = (
+            f"INSERT INTO {self._quote(self.table)} (id, metadata, content_hashes, {columns}) "
+            f"VALUES (%s::jsonb, %s::jsonb, %s::jsonb, {placeholders}) "
+            f"ON CONFLICT (id) DO UPDATE SET {updates}"
+        )
+        rows = []
+        for document in documents:
+            vectors = document.vectors()
+            rows.append(
+                [
+                    *self._document_params(document),
+                    *(self._to_vector(vectors[name]) for name in vector_names),
+                ]
+            )
+        with self.connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    def get_content_hashes(self, document_id: DocumentID) -> Optional[Dict[str, str]]:
+        self._ensure_configured()
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT content_hashes::text FROM {self._quote(self.table)} WHERE id = %s::jsonb",
+                [self._to_id(document_id)],
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0] or "{}")
+
+    def partial_update(self, document: Document, vectors: Dict[str, Vector]):
+        self._ensure_configured()
+        assignments = ["metadata = %s::jsonb", "content_hashes = %s::jsonb"]
+        assignments.extend(f"{self._quote(name)} = %s::vector" for name in vectors)
+        document_id, metadata, content_hashes = self._document_params(document)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {self._quote(self.table)} SET {', '.join(assignments)} WHERE id = %s::jsonb",
+                [
+                    metadata,
+                    content_hashes,
+                    *(self._to_vector(vector) for vector in vectors.values()),
+                    document_id,
+                ],
+            )
+            updated = cursor.rowcount
+        if not updated:
+            self.save(document)
+
+    def delete(self, document_id: DocumentID):
+        self.bulk_delete([document_id])
+
+    def bulk_delete(self, document_ids: List[DocumentID]):
+        if not document_ids:
+            return
+
+        self._ensure_configured()
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self._quote(self.table)} WHERE id = ANY(%s::jsonb[])",
+                [[self._to_id(document_id) for document_id in document_ids]],
+            )
+
+    def _ensure_configured(self):
+        if not self._configured:
+            self.configure()
+
+    def _configure_connection(self, sender=None, connection=None, **kwargs):
+        """
+        Apply the search parameters of the vector indexes to the database connection.
+        """
+        if connection is None or connection.alias != self.using:
+            return
+        settings = []
+        if self.ef_search is not None:
+            settings.append(("hnsw.ef_search", self.ef_search))
+        if self.probes is not None:
+            settings.append(("ivfflat.probes", self.probes))
+        if not settings:
+            return
+        with connection.cursor() as cursor:
+            for name, value in settings:
+                cursor.execute("SELECT set_config(%s, %s, false)", [name, str(value)])
+
+    def _schema_statements(self) -> List[str]:
+        """
+        Create the statements creating the table and the indexes of the namespace.
+        :return: list of the SQL statements.
+        """
+        table = self._quote(self.table)
+        vector_columns = "".join(
+            f", {self._quote(name)} vector({config.size})"
+            for name, config in self.index_configuration.vectors.items()
+        )
+        statements = [
+            "CREATE EXTENSION IF NOT EXISTS vector",
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            f"id jsonb PRIMARY KEY, metadata jsonb NOT NULL DEFAULT '{{}}', "
+            f"content_hashes jsonb NOT NULL DEFAULT '{{}}'{vector_columns})",
+            f"CREATE INDEX IF NOT EXISTS {self._quote(f'{self.table}_metadata')} "
+            f"ON {table} USING gin (metadata jsonb_path_ops)",
+        ]
+        if self.index_type is None:
+            return statements
+
+        if self.index_type == "hnsw":
+            options = (
+                f"m = {int(self.m)}, ef_construction = {int(self.ef_construction)}"
+            )
+        else:
+            options = f"lists = {int(self.lists)}"
+        for name, config in self.index_configuration.vectors.items():
+            index_name = self._quote(f"{self.table}_{name}_{self.index_type}")
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} "
+                f"USING {self.index_type} ({self._quote(name)} {self.OPERATOR_CLASSES[config.distance]}) "
+                f"WITH ({options})"
+            )
+        return statements
+
+    def _where(self, filters: Optional[List[FilterCondition]]) -> Tuple[str, List[str]]:
+        """
+        Convert the filter conditions into the WHERE clause, comparing the JSON values of the metadata fields.
+        :param filters: conditions on the metadata.
+        :return: the WHERE clause, empty if there are no conditions, and its parameters.
+        """
+        if not filters:
+            return "", []
+
+        clauses, params = [], []
+        for condition in filters:
+            if condition.operator == FilterOperator.EXACT:
+                clauses.append("metadata @> %s::jsonb")
+                params.append(json.dumps({condition.field: condition.value}))
+            elif condition.operator == FilterOperator.IN:
+                clauses.append("metadata -> %s = ANY(%s::jsonb[])")
+                params.extend(
+                    [condition.field, [json.dumps(value) for value in condition.value]]
+                )
+            else:
+                operator = {
+                    FilterOperator.LT: "<",
+                    FilterOperator.LTE: "<=",
+                    FilterOperator.GT: ">",
+                    FilterOperator.GTE: ">=",
+                }[condition.operator]
+                clauses.append(f"metadata -> %s {operator} %s::jsonb")
+                params.extend([condition.field, json.dumps(condition.value)])
+        return f" WHERE {' AND '.join(clauses)}", params
+
+    def _operator(self, vector_name: str) -> str:
+        return self.OPERATORS[self.index_configuration.vectors[vector_name].distance]
+
+    def _to_score(self, vector_name: str, distance: float) -> float:
+        """
+        Convert the distance returned by pgvector into the score, so the higher score means the more similar document.
+        """
+        metric = self.index_configuration.vectors[vector_name].distance
+        if metric == Distance.COSINE:
+            return 1 - distance
+        # The inner product operator returns the negated dot product, and the Euclidean distance is negated
+        return -distance
+
+    def _document_params(self, document: Document) -> List[str]:
+        return [
+            self._to_id(document.id),
+            json.dumps(document.metadata()),
+            json.dumps(document.content_hashes()),
+        ]
+
+    def _to_id(self, document_id: DocumentID) -> str:
+        return json.dumps(to_metadata_value(document_id))
+
+    def _to_vector(self, vector: Vector) -> str:
+        return f"[{','.join(str(float(value)) for value in vector)}]"
+
+    def _quote(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
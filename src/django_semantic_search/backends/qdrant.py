@@ -1,15 +1,231 @@
+import asyncio
+import copy
+import functools
+import hashlib
+import inspect
+import itertools
+import json
 import logging
+import os
+import random
+import re
+import threading
+import time
 import uuid
-from typing import List
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
 
 from django_semantic_search import Document
 from django_semantic_search.backends.base import BaseVectorSearchBackend
-from django_semantic_search.backends.types import Distance, IndexConfiguration
-from django_semantic_search.types import DocumentID
+from django_semantic_search.backends.fusion import fuse
+from django_semantic_search.backends.types import (
+    Distance,
+    FilterCondition,
+    FilterOperator,
+    Fusion,
+    IndexConfiguration,
+    PayloadFieldType,
+    Quantization,
+    QuantizationType,
+    SchemaChange,
+    SchemaChangeType,
+    SearchResult,
+)
+from django_semantic_search.types import DocumentID, Vector
 
 logger = logging.getLogger(__name__)
 
 
+# HTTP status codes of the responses worth retrying
+TRANSIENT_STATUS_CODES = {429, 502, 503, 504}
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Check if the request failed with an error which might not happen again, e.g. a dropped connection.
+    :param error: exception raised by the Qdrant client.
+    :return: True if the request might be retried.
+    """
+    from qdrant_client.http.exceptions import (
+        ResponseHandlingException,
+        UnexpectedResponse,
+    )
+
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code in TRANSIENT_STATUS_CODES
+    if isinstance(error, ResponseHandlingException):
+        # Raised for the connection errors and the timeouts of the HTTP requests
+        return True
+    try:
+        import grpc
+
+        if isinstance(error, grpc.RpcError):
+            return error.code() in (
+                grpc.StatusCode.UNAVAILABLE,
+                grpc.StatusCode.DEADLINE_EXCEEDED,
+                grpc.StatusCode.RESOURCE_EXHAUSTED,
+            )
+    except ImportError:
+        pass
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+class RetryingClient:
+    """
+    Proxy of the synchronous or asynchronous Qdrant client, which retries the requests failed with transient errors,
+    waiting exponentially longer between the attempts. Only the idempotent requests are retried, i.e. the reads, the
+    upserts and the deletes of the points. A retried administrative request, such as creating a collection or
+    switching an alias, might be applied twice, so their errors are raised immediately.
+    """
+
+    # Methods of the client which might be safely sent again
+    RETRIED_METHODS = frozenset(
+        {
+            "batch_update_points",
+            "collection_exists",
+            "count",
+            "delete",
+            "get_aliases",
+            "get_collection",
+            "get_collection_aliases",
+            "get_collections",
+            "query_batch_points",
+            "query_points",
+            "retrieve",
+            "scroll",
+            "upsert",
+        }
+    )
+
+    def __init__(
+        self, client, retries: int = 3, backoff: float = 0.5, max_backoff: float = 8.0
+    ):
+        """
+        :param client: Qdrant client to wrap.
+        :param retries: maximum number of retries of a single request.
+        :param backoff: time, in seconds, to wait before the first retry. It is doubled with each retry.
+        :param max_backoff: maximum time, in seconds, to wait between the attempts.
+        """
+        self.wrapped = client
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.wrapped, name)
+        if (
+            not callable(attribute)
+            or self.retries < 1
+            or name not in self.RETRIED_METHODS
+        ):
+            return attribute
+
+        if inspect.iscoroutinefunction(attribute):
+
+            @functools.wraps(attribute)
+            async def acall(*args, **kwargs):
+                for attempt in itertools.count():
+                    try:
+                        return await attribute(*args, **kwargs)
+                    except Exception as e:
+                        delay = self._retry_delay(name, attempt, e)
+                    await asyncio.sleep(delay)
+
+            return acall
+
+        @functools.wraps(attribute)
+        def call(*args, **kwargs):
+            for attempt in itertools.count():
+                try:
+                    return attribute(*args, **kwargs)
+                except Exception as e:
+                    delay = self._retry_delay(name, attempt, e)
+                time.sleep(delay)
+
+        return call
+
+    def _retry_delay(self, name: str, attempt: int, error: Exception) -> float:
+        """
+        Return the time to wait before retrying the failed request, or re-raise the error if it should not be retried.
+        """
+        if attempt >= self.retries or not is_transient_error(error):
+            raise error
+        # Jitter spreads the retries of the concurrent requests in time
+        delay = min(self.backoff * 2**attempt, self.max_backoff) * random.uniform(
+            0.5, 1.0
+        )
+        logger.warning(
+            f"Qdrant request {name} failed with {error!r}, retrying in {delay:.2f}s "
+            f"({attempt + 1}/{self.retries})"
+        )
+        return delay
+
+
+class QdrantClientPool:
+    """
+    Clients shared by all the backends with the same configuration, so all the namespaces use a single connection
+    pool. The pool is emptied in the child processes after a fork, e.g. in the gunicorn workers, so the processes do
+    not share the sockets.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, RetryingClient] = {}
+        # Asynchronous clients are bound to the event loop they were created in
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, RetryingClient]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def get(self, key: str, factory: Callable[[], RetryingClient]) -> RetryingClient:
+        """
+        Return the synchronous client with the key, creating it with the factory if it does not exist yet.
+        """
+        with self._lock:
+            self._check_pid()
+            if key not in self._clients:
+                self._clients[key] = factory()
+            return self._clients[key]
+
+    def get_async(
+        self, key: str, factory: Callable[[], RetryingClient]
+    ) -> RetryingClient:
+        """
+        Return the asynchronous client with the key for the running event loop, creating it with the factory if it
+        does not exist yet.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._check_pid()
+            clients = self._async_clients.setdefault(loop, {})
+            if key not in clients:
+                clients[key] = factory()
+            return clients[key]
+
+    def reset(self):
+        """
+        Forget all the clients, without closing them, as their connections might still be used by the parent process.
+        """
+        self._clients = {}
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _check_pid(self):
+        # Processes forked without running the fork handlers, e.g. with os.fork called from C extensions
+        if self._pid != os.getpid():
+            self._clients = {}
+            self._async_clients = weakref.WeakKeyDictionary()
+            self._pid = os.getpid()
+
+
+client_pool = QdrantClientPool()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=client_pool.reset)
+
+
 class QdrantBackend(BaseVectorSearchBackend):
     """
     Backend that integrates with Qdrant vector database.
@@ -36,98 +252,1390 @@ class QdrantBackend(BaseVectorSearchBackend):
         ...
     }
     ```
+
+    Each document is stored as a single point, with the point ID derived deterministically from the namespace and the
+    primary key of the model instance. Saving the same instance again overwrites the existing point. Collections
+    created by the older versions of the library, which used random point IDs, may be cleaned up with the
+    `semantic_search_deduplicate` management command.
+
+    The documents are stored in a versioned collection, e.g. `products_v1`, behind an alias named after the namespace.
+    The collection may be rebuilt from scratch with the `rebuild` method, or the `semantic_reindex --rebuild` management
+    command, e.g. after changing the vector indexes, without interrupting the search.
+
+    All the backends with the same configuration share a single client, and its connection pool, in each process.
+    The requests failed with transient errors, e.g. dropped connections, are retried with an exponential backoff.
+
+    Bulk writes are split into chunks of `upload_batch_size` points, so a large batch does not exceed the request
+    size limits of the server. Setting `upload_parallel` to more than one sends the chunks concurrently.
     """
 
     from qdrant_client import models
 
+    # Namespace used to derive the point IDs from the document IDs
+    POINT_ID_NAMESPACE = uuid.UUID("5b0a7c3e-3ae1-4d4b-9a8f-6c1f0d2e4b17")
+
     DISTANCE_MAPPING = {
         Distance.COSINE: models.Distance.COSINE,
         Distance.EUCLIDEAN: models.Distance.EUCLID,
         Distance.DOT_PRODUCT: models.Distance.DOT,
     }
 
-    def __init__(self, index_configuration: IndexConfiguration, *args, **kwargs):
-        from qdrant_client import QdrantClient
+    FUSION_MAPPING = {
+        Fusion.RRF: models.Fusion.RRF,
+        Fusion.DBSF: models.Fusion.DBSF,
+    }
+
+    # Number of candidates fetched from each of the vectors in the hybrid search, relative to the limit
+    PREFETCH_MULTIPLIER = 2
+
+    PAYLOAD_SCHEMA_MAPPING = {
+        PayloadFieldType.KEYWORD: models.PayloadSchemaType.KEYWORD,
+        PayloadFieldType.INTEGER: models.PayloadSchemaType.INTEGER,
+        PayloadFieldType.FLOAT: models.PayloadSchemaType.FLOAT,
+        PayloadFieldType.BOOLEAN: models.PayloadSchemaType.BOOL,
+        PayloadFieldType.DATETIME: models.PayloadSchemaType.DATETIME,
+    }
+
+    # Suffix of the alias pointing to the collection being rebuilt
+    SHADOW_SUFFIX = "_shadow"
+
+    # Suffix of the collection recording the documents modified while the collection is rebuilt
+    CHANGES_SUFFIX = "_changes"
+
+    # Default number of points sent in a single upsert or delete request
+    UPLOAD_BATCH_SIZE = 256
 
-        self.client = QdrantClient(*args, **kwargs)
+    def __init__(
+        self,
+        index_configuration: IndexConfiguration,
+        *args,
+        upload_batch_size: int = UPLOAD_BATCH_SIZE,
+        upload_parallel: int = 1,
+        shadow_check_interval: float = 5.0,
+        schema_cache: Optional[str] = "default",
+        schema_cache_timeout: Optional[int] = 3600,
+        prefer_grpc: bool = False,
+        timeout: Optional[int] = None,
+        keep_alive: Optional[float] = None,
+        retries: int = 3,
+        retry_backoff: float = 0.5,
+        retry_max_backoff: float = 8.0,
+        **kwargs,
+    ):
+        """
+        :param index_configuration: configuration of the indexes.
+        :param upload_batch_size: number of points sent in a single upsert or delete request.
+        :param upload_parallel: number of the concurrent requests while saving or deleting many documents.
+        :param shadow_check_interval: how often, in seconds, the backend checks if the collection is being rebuilt,
+                                      to write the changes to the rebuilt collection as well.
+        :param schema_cache: alias of the Django cache remembering the collections validated against the index
+                             configuration, so the other processes do not validate them again. None disables it.
+        :param schema_cache_timeout: time, in seconds, the validation is remembered for. None remembers it forever.
+        :param prefer_grpc: if set, the client uses the gRPC interface instead of the REST API, when possible.
+        :param timeout: timeout of the requests, in seconds.
+        :param keep_alive: time, in seconds, the idle HTTP connections are kept open for. With gRPC, the interval of
+                           the keep-alive pings.
+        :param retries: maximum number of retries of the requests failed with transient errors, e.g. dropped
+                        connections or 503 responses.
+        :param retry_backoff: time, in seconds, to wait before the first retry. It is doubled with each retry.
+        :param retry_max_backoff: maximum time, in seconds, to wait between the retries.
+        :param args: positional arguments of the Qdrant client.
+        :param kwargs: keyword arguments of the Qdrant client.
+        """
+        self.upload_batch_size = upload_batch_size
+        self.upload_parallel = upload_parallel
+        self.shadow_check_interval = shadow_check_interval
+        self.schema_cache = schema_cache
+        self.schema_cache_timeout = schema_cache_timeout
+        # Differences between the index configuration and the collection, found while configuring the backend
+        self.schema_changes: List[SchemaChange] = []
+        kwargs.update(prefer_grpc=prefer_grpc, timeout=timeout)
+        if keep_alive is not None:
+            if prefer_grpc:
+                grpc_options = dict(kwargs.get("grpc_options") or {})
+                grpc_options.setdefault(
+                    "grpc.keepalive_time_ms", int(keep_alive * 1000)
+                )
+                kwargs["grpc_options"] = grpc_options
+            elif "limits" not in kwargs and "pool_size" not in kwargs:
+                import httpx
+
+                kwargs["limits"] = httpx.Limits(keepalive_expiry=keep_alive)
+        self._client_args = args
+        self._client_kwargs = kwargs
+        self._retry_options = dict(
+            retries=retries, backoff=retry_backoff, max_backoff=retry_max_backoff
+        )
+        # In-memory clients are not shared, as each of them has a separate storage
+        self._shared = ":memory:" not in (*args, kwargs.get("location"))
+        self._pool_key = self._client_key()
+        self._client: Optional[RetryingClient] = None
+        self._async_client: Optional[RetryingClient] = None
+        # Physical collection the backend is bound to, if it does not use the alias of the namespace
+        self._collection_name: Optional[str] = None
+        self._shadow: Optional[QdrantBackend] = None
+        self._shadow_checked_at: Optional[float] = None
         super().__init__(index_configuration)
 
     def configure(self):
-        from qdrant_client import models
-
-        try:
-            collection_info = self.client.get_collection(  # noqa
-                collection_name=self.index_configuration.namespace
-            )
-            # TODO: validate if all the vectors are present and with correct types
-        except Exception:
+        if not self.client.collection_exists(self.collection_name):
             logger.warning(
-                f"Collection {self.index_configuration.namespace} does not exist. Creating a new one."
+                f"Collection {self.collection_name} does not exist. Creating a new one."
             )
-            self.client.create_collection(
-                collection_name=self.index_configuration.namespace,
-                vectors_config={
-                    vector_name: models.VectorParams(
-                        size=vector_config.size,
-                        distance=self.DISTANCE_MAPPING.get(vector_config.distance),
+            # The documents are stored in a versioned collection behind an alias, so it might be rebuilt later
+            collection_name = self._version_name(self._latest_version() + 1)
+            self._create_collection(collection_name)
+            self._update_aliases(create={self.collection_name: collection_name})
+            return
+
+        cache = caches[self.schema_cache] if self.schema_cache is not None else None
+        cache_key = self._schema_cache_key()
+        if cache is not None and cache.get(cache_key):
+            return
+
+        self.schema_changes = self.diff_schema()
+        for change in self.schema_changes:
+            if change.destructive:
+                logger.error(
+                    f"{change.description}. The collection has to be rebuilt, e.g. with "
+                    f"the `semantic_reindex --rebuild` management command."
+                )
+                continue
+            logger.warning(f"{change.description}. Updating the collection.")
+            self._apply_schema_change(change)
+
+        if cache is not None and not any(
+            change.destructive for change in self.schema_changes
+        ):
+            cache.set(cache_key, True, self.schema_cache_timeout)
+
+    def diff_schema(self) -> List[SchemaChange]:
+        """
+        Compare the collection in Qdrant with the index configuration.
+        :return: list of the differences, empty if the collection matches the configuration.
+        """
+        collection_info = self.client.get_collection(self.collection_name)
+        stored_vectors = collection_info.config.params.vectors
+        if not isinstance(stored_vectors, dict):
+            # Collections with a single unnamed vector
+            stored_vectors = {}
+
+        changes = []
+        for vector_name, vector_config in self.index_configuration.vectors.items():
+            stored = stored_vectors.get(vector_name)
+            distance = self.DISTANCE_MAPPING.get(vector_config.distance)
+            if stored is None:
+                changes.append(
+                    SchemaChange(
+                        SchemaChangeType.MISSING_VECTOR,
+                        vector_name,
+                        f"Vector {vector_name} is missing in the collection {self.collection_name}",
                     )
-                    for vector_name, vector_config in self.index_configuration.vectors.items()
-                },
-            )
-            self.client.create_payload_index(
-                collection_name=self.index_configuration.namespace,
-                field_name=self.index_configuration.id_field,
-                field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+            elif stored.size != vector_config.size or stored.distance != distance:
+                changes.append(
+                    SchemaChange(
+                        SchemaChangeType.VECTOR_MISMATCH,
+                        vector_name,
+                        f"Vector {vector_name} of the collection {self.collection_name} has size {stored.size} "
+                        f"and distance {stored.distance}, expected size {vector_config.size} and distance {distance}",
+                    )
+                )
+            elif self._dump(stored.quantization_config) != self._dump(
+                self._quantization_config(vector_config.quantization)
+            ):
+                changes.append(
+                    SchemaChange(
+                        SchemaChangeType.QUANTIZATION_MISMATCH,
+                        vector_name,
+                        f"Vector {vector_name} of the collection {self.collection_name} has different quantization",
+                    )
+                )
+
+        stored_indexes = collection_info.payload_schema or {}
+        for field_name, field_schema in self._payload_indexes().items():
+            stored = stored_indexes.get(field_name)
+            if stored is None:
+                changes.append(
+                    SchemaChange(
+                        SchemaChangeType.MISSING_PAYLOAD_INDEX,
+                        field_name,
+                        f"Payload index {field_name} is missing in the collection {self.collection_name}",
+                    )
+                )
+            elif stored.data_type != field_schema:
+                changes.append(
+                    SchemaChange(
+                        SchemaChangeType.PAYLOAD_INDEX_MISMATCH,
+                        field_name,
+                        f"Payload index {field_name} of the collection {self.collection_name} has type "
+                        f"{stored.data_type}, expected {field_schema}",
+                    )
+                )
+        return changes
+
+    @property
+    def collection_name(self) -> str:
+        """
+        Name of the collection the documents are read from and written to. By default, it is the alias named after
+        the namespace, pointing to the current version of the collection.
+        """
+        return self._collection_name or self.index_configuration.namespace
+
+    @property
+    def shadow_alias(self) -> str:
+        """
+        Name of the alias pointing to the collection being rebuilt.
+        """
+        return f"{self.index_configuration.namespace}{self.SHADOW_SUFFIX}"
+
+    def rebuild(
+        self,
+        populate: Callable[["QdrantBackend"], Any],
+        resume: bool = False,
+        grace_period: Optional[float] = None,
+        resync: Optional[Callable[["QdrantBackend", List[DocumentID]], Any]] = None,
+    ) -> str:
+        """
+        Rebuild the collection without interrupting the search. The documents are written into a new version of the
+        collection, while the current one keeps serving the queries. Once the new version is populated, the alias of
+        the namespace is switched to it atomically, and the previous versions are removed.
+
+        All the backends write the changes to both collections while the rebuild is running, so the documents
+        modified in the meantime are not lost. They notice the rebuild within `shadow_check_interval` seconds. The
+        IDs of the modified documents are recorded as well, as the populating might overwrite them with the state
+        it has read before. They are passed to `resync` once the collection is populated, until no more changes are
+        recorded.
+
+        Collections created by the older versions of the library are not versioned, and have to be moved behind the
+        alias with the `migrate_to_alias` method first.
+
+        :param populate: callable receiving the backend bound to the new collection, which stores all the documents
+                         in it, e.g. with its `bulk_save` method.
+        :param resume: if set, an unfinished rebuild is continued in its collection, instead of starting from scratch.
+        :param grace_period: time, in seconds, to wait for the other processes to notice the rebuild before
+                             populating the new collection. Defaults to `shadow_check_interval`.
+        :param resync: callable receiving the backend bound to the new collection and the IDs of the documents
+                       modified during the rebuild, which stores their current state in it, or deletes them if they
+                       do not exist anymore. If not provided, the modified documents are not stored again.
+        :return: name of the new collection.
+        :raises ValueError: if the collection of the namespace is not versioned.
+        """
+        if self._is_unversioned():
+            raise ValueError(
+                f"Collection {self.index_configuration.namespace} is not versioned. Move it behind the alias with "
+                f"`semantic_search_configure --migrate-to-alias` before rebuilding it."
             )
+        return self._rebuild(populate, resync, resume, grace_period)
+
+    def migrate_to_alias(self, grace_period: Optional[float] = None) -> Optional[str]:
+        """
+        Move the unversioned collection, created by the older versions of the library, into the first version of the
+        collection behind the alias named after the namespace. The points are copied as they are, without embedding
+        the documents again, and the changes made in the meantime are written to both collections, as during the
+        rebuild. The alias can only be created once the unversioned collection is removed, so the search is not
+        available for the short moment between the two operations.
+        :param grace_period: time, in seconds, to wait for the other processes to notice the migration before copying
+                             the points. Defaults to `shadow_check_interval`.
+        :return: name of the new collection, or None if the collection is already versioned.
+        """
+        if not self._is_unversioned():
+            return None
+        return self._rebuild(
+            self._copy_points,
+            self._copy_points,
+            resume=False,
+            grace_period=grace_period,
+            replace_unversioned=True,
+        )
+
+    def pending_rebuild(self) -> Optional[str]:
+        """
+        Return the name of the collection of an unfinished rebuild, if there is any.
+        """
+        return self._aliases().get(self.shadow_alias)
+
+    @property
+    def client(self) -> RetryingClient:
+        """
+        Return the synchronous Qdrant client, shared with all the backends configured the same way.
+        :return: proxy of the client instance, retrying the idempotent requests.
+        """
+        if not self._shared:
+            if self._client is None:
+                self._client = self._create_client()
+            return self._client
+        return client_pool.get(self._pool_key, self._create_client)
+
+    @property
+    def async_client(self) -> RetryingClient:
+        """
+        Return the asynchronous Qdrant client, shared with all the backends configured the same way within the running
+        event loop.
+        :return: proxy of the asynchronous client instance, retrying the idempotent requests.
+        """
+        if not self._shared:
+            if self._async_client is None:
+                self._async_client = self._create_client(asynchronous=True)
+            return self._async_client
+        return client_pool.get_async(
+            self._pool_key,
+            functools.partial(self._create_client, asynchronous=True),
+        )
 
     def search(
-        self, vector_name: str, query: List[float], limit: int = 10
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
     ) -> List[DocumentID]:
-        results = self.client.query_points(
-            collection_name=self.index_configuration.namespace,
+        return [
+            result.id
+            for result in self.search_with_scores(
+                vector_name,
+                query,
+                limit,
+                filters=filters,
+                oversampling=oversampling,
+                rescore=rescore,
+            )
+        ]
+
+    async def asearch(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+    ) -> List[DocumentID]:
+        results = await self.asearch_with_scores(
+            vector_name,
+            query,
+            limit,
+            filters=filters,
+            oversampling=oversampling,
+            rescore=rescore,
+        )
+        return [result.id for result in results]
+
+    def search_with_scores(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+    ) -> List[SearchResult]:
+        """
+        Search the vector, as described in the base class. Searches of the quantized vectors might override
+        the quantization options of the vector for a single query.
+        :param oversampling: number of the candidates selected with the quantized vectors, relative to the limit.
+                             Defaults to the oversampling of the vector quantization.
+        :param rescore: flag to reorder the candidates using the original vectors. Defaults to the rescoring of
+                        the vector quantization.
+        """
+        response = self.client.query_points(
+            **self._query_kwargs(
+                vector_name,
+                query,
+                limit,
+                filters,
+                with_metadata,
+                self._search_params(vector_name, oversampling, rescore),
+            )
+        )
+        return [self._to_search_result(point) for point in response.points]
+
+    async def asearch_with_scores(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+    ) -> List[SearchResult]:
+        response = await self.async_client.query_points(
+            **self._query_kwargs(
+                vector_name,
+                query,
+                limit,
+                filters,
+                with_metadata,
+                self._search_params(vector_name, oversampling, rescore),
+            )
+        )
+        return [self._to_search_result(point) for point in response.points]
+
+    def hybrid_search(
+        self,
+        queries: Dict[str, Vector],
+        limit: int = 10,
+        fusion: Fusion = Fusion.RRF,
+        weights: Optional[Dict[str, float]] = None,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+    ) -> List[SearchResult]:
+        if weights is not None:
+            # The server-side fusion does not support the weights, so all the searches are sent in a single batch
+            # request and the results are fused on the client side
+            responses = self.client.query_batch_points(
+                **self._batch_query_kwargs(queries, limit, filters, with_metadata)
+            )
+            return self._fuse_responses(queries, responses, fusion, weights, limit)
+
+        response = self.client.query_points(
+            **self._fusion_query_kwargs(queries, limit, fusion, filters, with_metadata)
+        )
+        return [self._to_search_result(point) for point in response.points]
+
+    async def ahybrid_search(
+        self,
+        queries: Dict[str, Vector],
+        limit: int = 10,
+        fusion: Fusion = Fusion.RRF,
+        weights: Optional[Dict[str, float]] = None,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+    ) -> List[SearchResult]:
+        if weights is not None:
+            responses = await self.async_client.query_batch_points(
+                **self._batch_query_kwargs(queries, limit, filters, with_metadata)
+            )
+            return self._fuse_responses(queries, responses, fusion, weights, limit)
+
+        response = await self.async_client.query_points(
+            **self._fusion_query_kwargs(queries, limit, fusion, filters, with_metadata)
+        )
+        return [self._to_search_result(point) for point in response.points]
+
+    def save(self, document: Document):
+        self.bulk_save([document])
+
+    async def asave(self, document: Document):
+        await self.abulk_save([document])
+
+    def bulk_save(self, documents: List[Document]):
+        points = self._to_points(documents)
+        self._run_in_chunks(
+            lambda chunk: self.client.upsert(
+                collection_name=self.collection_name,
+                points=chunk,
+            ),
+            points,
+        )
+        if (shadow := self._shadow_backend()) is not None:
+            shadow._record_changes([document.id for document in documents])
+            shadow.bulk_save(documents)
+
+    async def abulk_save(self, documents: List[Document]):
+        # The metadata might query the database, e.g. for the related objects, which is not allowed in the event loop
+        points = await sync_to_async(self._to_points)(documents)
+        await self._arun_in_chunks(
+            lambda chunk: self.async_client.upsert(
+                collection_name=self.collection_name,
+                points=chunk,
+            ),
+            points,
+        )
+        if (shadow := await self._ashadow_backend()) is not None:
+            await shadow._arecord_changes([document.id for document in documents])
+            await shadow.abulk_save(documents)
+
+    def get_content_hashes(self, document_id: DocumentID) -> Optional[Dict[str, str]]:
+        points = self.client.retrieve(**self._content_hashes_kwargs(document_id))
+        return self._to_content_hashes(points)
+
+    async def aget_content_hashes(
+        self, document_id: DocumentID
+    ) -> Optional[Dict[str, str]]:
+        points = await self.async_client.retrieve(
+            **self._content_hashes_kwargs(document_id)
+        )
+        return self._to_content_hashes(points)
+
+    def partial_update(self, document: Document, vectors: Dict[str, Vector]):
+        self.client.batch_update_points(
+            **self._partial_update_kwargs(document, vectors)
+        )
+        # The document might not be stored in the rebuilt collection yet, so it is stored as a whole
+        if (shadow := self._shadow_backend()) is not None:
+            shadow._record_changes([document.id])
+            shadow.save(document)
+
+    async def apartial_update(self, document: Document, vectors: Dict[str, Vector]):
+        kwargs = await sync_to_async(self._partial_update_kwargs)(document, vectors)
+        await self.async_client.batch_update_points(**kwargs)
+        if (shadow := await self._ashadow_backend()) is not None:
+            await shadow._arecord_changes([document.id])
+            await shadow.asave(document)
+
+    def delete(self, document_id: DocumentID):
+        self.bulk_delete([document_id])
+
+    async def adelete(self, document_id: DocumentID):
+        await self.abulk_delete([document_id])
+
+    def bulk_delete(self, document_ids: List[DocumentID]):
+        self._run_in_chunks(
+            lambda chunk: self.client.delete(**self._delete_kwargs(chunk)),
+            document_ids,
+        )
+        if (shadow := self._shadow_backend()) is not None:
+            shadow._record_changes(document_ids)
+            shadow.bulk_delete(document_ids)
+
+    async def abulk_delete(self, document_ids: List[DocumentID]):
+        await self._arun_in_chunks(
+            lambda chunk: self.async_client.delete(**self._delete_kwargs(chunk)),
+            document_ids,
+        )
+        if (shadow := await self._ashadow_backend()) is not None:
+            await shadow._arecord_changes(document_ids)
+            await shadow.abulk_delete(document_ids)
+
+    def point_id(self, document_id: DocumentID) -> str:
+        """
+        Derive the ID of the point storing the document. The ID is stable for the same namespace and document ID.
+        :param document_id: ID of the document.
+        :return: point ID, in the UUID format.
+        """
+        return str(
+            uuid.uuid5(
+                self.POINT_ID_NAMESPACE,
+                f"{self.index_configuration.namespace}:{document_id}",
+            )
+        )
+
+    def deduplicate(self, batch_size: int = 256) -> int:
+        """
+        Migrate the points with random IDs, created by the older versions of the library, to the deterministic IDs.
+        If there are multiple points for the same document, only one of them is kept. Points that already use
+        the deterministic ID are never overwritten.
+        :param batch_size: number of points to process at once.
+        :return: number of removed or migrated points.
+        """
+        from qdrant_client import models
+
+        collection_name = self.collection_name
+        id_field = self.index_configuration.id_field
+        migrated_ids = set()
+        processed = 0
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+
+            legacy_points = {}
+            for point in points:
+                expected_id = self.point_id(point.payload.get(id_field))
+                if str(point.id) == expected_id:
+                    migrated_ids.add(expected_id)
+                    continue
+                legacy_points[str(point.id)] = (expected_id, point)
+
+            if legacy_points:
+                candidate_ids = list(
+                    {expected_id for expected_id, _ in legacy_points.values()}
+                    - migrated_ids
+                )
+                if candidate_ids:
+                    existing = self.client.retrieve(
+                        collection_name=collection_name,
+                        ids=candidate_ids,
+                        with_payload=False,
+                        with_vectors=False,
+                    )
+                    migrated_ids.update(str(point.id) for point in existing)
+
+                new_points = {}
+                for expected_id, point in legacy_points.values():
+                    if expected_id in migrated_ids:
+                        continue
+                    new_points[expected_id] = models.PointStruct(
+                        id=expected_id,
+                        vector=point.vector,
+                        payload=point.payload,
+                    )
+                if new_points:
+                    self.client.upsert(
+                        collection_name=collection_name,
+                        points=list(new_points.values()),
+                    )
+                    migrated_ids.update(new_points.keys())
+
+                self.client.delete(
+                    collection_name=collection_name,
+                    points_selector=models.PointIdsList(
+                        points=list(legacy_points.keys())
+                    ),
+                )
+                processed += len(legacy_points)
+                logger.info(
+                    f"Processed {processed} legacy points in collection {collection_name}"
+                )
+
+            if offset is None:
+                break
+        return processed
+
+    def _to_points(self, documents: List[Document]) -> list:
+        return [self._to_point(document) for document in documents]
+
+    def _to_point(self, document: Document):
+        """
+        Convert the document into a Qdrant point.
+        :param document: document to convert.
+        :return: point to be stored in the collection.
+        """
+        from qdrant_client import models
+
+        return models.PointStruct(
+            id=self.point_id(document.id),
+            vector=document.vectors(),
+            payload=self._payload(document),
+        )
+
+    def _query_kwargs(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int,
+        filters: Optional[List[FilterCondition]],
+        with_metadata: bool,
+        search_params=None,
+    ) -> dict:
+        return dict(
+            collection_name=self.collection_name,
             query=query,
             using=vector_name,
+            query_filter=self._to_filter(filters),
+            search_params=search_params or self._search_params(vector_name),
             limit=limit,
             with_vectors=False,
-            with_payload=True,
+            with_payload=self._with_payload(with_metadata),
         )
+
+    def _batch_query_kwargs(
+        self,
+        queries: Dict[str, Vector],
+        limit: int,
+        filters: Optional[List[FilterCondition]],
+        with_metadata: bool,
+    ) -> dict:
+        from qdrant_client import models
+
+        query_filter = self._to_filter(filters)
+        return dict(
+            collection_name=self.collection_name,
+            requests=[
+                models.QueryRequest(
+                    query=query,
+                    using=vector_name,
+                    filter=query_filter,
+                    params=self._search_params(vector_name),
+                    limit=limit * self.PREFETCH_MULTIPLIER,
+                    with_payload=self._with_payload(with_metadata),
+                    with_vector=False,
+                )
+                for vector_name, query in queries.items()
+            ],
+        )
+
+    def _fusion_query_kwargs(
+        self,
+        queries: Dict[str, Vector],
+        limit: int,
+        fusion: Fusion,
+        filters: Optional[List[FilterCondition]],
+        with_metadata: bool,
+    ) -> dict:
+        from qdrant_client import models
+
+        query_filter = self._to_filter(filters)
+        return dict(
+            collection_name=self.collection_name,
+            prefetch=[
+                models.Prefetch(
+                    query=query,
+                    using=vector_name,
+                    filter=query_filter,
+                    params=self._search_params(vector_name),
+                    limit=limit * self.PREFETCH_MULTIPLIER,
+                )
+                for vector_name, query in queries.items()
+            ],
+            query=models.FusionQuery(fusion=self.FUSION_MAPPING[fusion]),
+            query_filter=query_filter,
+            limit=limit,
+            with_vectors=False,
+            with_payload=self._with_payload(with_metadata),
+        )
+
+    def _fuse_responses(
+        self,
+        queries: Dict[str, Vector],
+        responses: list,
+        fusion: Fusion,
+        weights: Dict[str, float],
+        limit: int,
+    ) -> List[SearchResult]:
+        results = {
+            vector_name: [self._to_search_result(point) for point in response.points]
+            for vector_name, response in zip(queries.keys(), responses)
+        }
+        return fuse(results, fusion=fusion, weights=weights, limit=limit)
+
+    def _content_hashes_kwargs(self, document_id: DocumentID) -> dict:
+        return dict(
+            collection_name=self.collection_name,
+            ids=[self.point_id(document_id)],
+            with_payload=[self.index_configuration.content_hash_field],
+            with_vectors=False,
+        )
+
+    def _to_content_hashes(self, points: list) -> Optional[Dict[str, str]]:
+        if not points:
+            return None
+        return points[0].payload.get(self.index_configuration.content_hash_field, {})
+
+    def _partial_update_kwargs(
+        self, document: Document, vectors: Dict[str, Vector]
+    ) -> dict:
+        from qdrant_client import models
+
+        point_id = self.point_id(document.id)
+        operations = [
+            models.OverwritePayloadOperation(
+                overwrite_payload=models.SetPayload(
+                    payload=self._payload(document),
+                    points=[point_id],
+                )
+            )
+        ]
+        if vectors:
+            operations.insert(
+                0,
+                models.UpdateVectorsOperation(
+                    update_vectors=models.UpdateVectors(
+                        points=[models.PointVectors(id=point_id, vector=vectors)]
+                    )
+                ),
+            )
+        return dict(
+            collection_name=self.collection_name,
+            update_operations=operations,
+        )
+
+    def _delete_kwargs(self, document_ids: List[DocumentID]) -> dict:
+        from qdrant_client import models
+
+        return dict(
+            collection_name=self.collection_name,
+            points_selector=models.PointIdsList(
+                points=[self.point_id(document_id) for document_id in document_ids],
+            ),
+        )
+
+    def _chunks(self, items: list) -> List[list]:
         return [
-            result.payload.get(self.index_configuration.id_field)
-            for result in results.points
+            items[i : i + self.upload_batch_size]
+            for i in range(0, len(items), self.upload_batch_size)
         ]
 
-    def save(self, document: Document):
+    def _run_in_chunks(self, func: Callable[[list], Any], items: list):
+        """
+        Split the items into chunks and call the function with each of them, in parallel if configured.
+        :param func: function sending a single request.
+        :param items: points or ids to send.
+        """
+        chunks = self._chunks(items)
+        if self.upload_parallel > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.upload_parallel, len(chunks))
+            ) as executor:
+                # Consuming the results raises the errors of the failed requests
+                list(executor.map(func, chunks))
+            return
+        for chunk in chunks:
+            func(chunk)
+
+    async def _arun_in_chunks(self, func: Callable[[list], Awaitable], items: list):
+        """
+        Asynchronous version of the `_run_in_chunks` method.
+        """
+        semaphore = asyncio.Semaphore(max(self.upload_parallel, 1))
+
+        async def run(chunk: list):
+            async with semaphore:
+                await func(chunk)
+
+        await asyncio.gather(*(run(chunk) for chunk in self._chunks(items)))
+
+    def _quantization_config(self, quantization: Optional[Quantization]):
+        """
+        Convert the quantization into the Qdrant quantization config.
+        :param quantization: quantization of the vector.
+        :return: quantization config, or None if the quantization is disabled.
+        """
         from qdrant_client import models
 
-        vectors = document.vectors()
-        payload = {
+        if quantization is None:
+            return None
+        if quantization.type == QuantizationType.SCALAR:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=quantization.quantile,
+                    always_ram=quantization.always_ram,
+                )
+            )
+        if quantization.type == QuantizationType.BINARY:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=quantization.always_ram,
+                )
+            )
+        return models.ProductQuantization(
+            product=models.ProductQuantizationConfig(
+                compression=models.CompressionRatio(f"x{quantization.compression}"),
+                always_ram=quantization.always_ram,
+            )
+        )
+
+    def _search_params(
+        self,
+        vector_name: str,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+    ):
+        """
+        Create the search parameters of the vector, controlling the use of the quantized vectors.
+        :param vector_name: name of the vector to search in.
+        :param oversampling: optional oversampling overriding the one of the vector quantization.
+        :param rescore: optional rescoring flag overriding the one of the vector quantization.
+        :return: search parameters, or None if the vector is not quantized.
+        """
+        from qdrant_client import models
+
+        if oversampling is not None and oversampling < 1.0:
+            raise ValueError("Oversampling has to be at least 1.0.")
+        vector_config = self.index_configuration.vectors.get(vector_name)
+        if vector_config is None or vector_config.quantization is None:
+            return None
+        quantization = vector_config.quantization
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                rescore=quantization.rescore if rescore is None else rescore,
+                oversampling=(
+                    quantization.oversampling if oversampling is None else oversampling
+                ),
+            )
+        )
+
+    def _with_payload(self, with_metadata: bool):
+        return True if with_metadata else [self.index_configuration.id_field]
+
+    def _to_filter(self, filters: Optional[List[FilterCondition]]):
+        """
+        Convert the filter conditions into a Qdrant filter.
+        :param filters: conditions on the metadata.
+        :return: Qdrant filter, or None if there are no conditions.
+        """
+        from qdrant_client import models
+
+        if not filters:
+            return None
+
+        must = []
+        for condition in filters:
+            if condition.operator == FilterOperator.EXACT:
+                if isinstance(condition.value, float):
+                    field_filter = models.FieldCondition(
+                        key=condition.field,
+                        range=models.Range(gte=condition.value, lte=condition.value),
+                    )
+                else:
+                    field_filter = models.FieldCondition(
+                        key=condition.field,
+                        match=models.MatchValue(value=condition.value),
+                    )
+            elif condition.operator == FilterOperator.IN:
+                field_filter = models.FieldCondition(
+                    key=condition.field,
+                    match=models.MatchAny(any=condition.value),
+                )
+            else:
+                field_type = self.index_configuration.payload_fields.get(
+                    condition.field
+                )
+                if field_type == PayloadFieldType.DATETIME:
+                    range_cls = models.DatetimeRange
+                elif field_type in (
+                    PayloadFieldType.KEYWORD,
+                    PayloadFieldType.BOOLEAN,
+                ) or isinstance(condition.value, str):
+                    raise ValueError(
+                        f"Lookup {condition.operator.value} on the field {condition.field} is not supported, "
+                        f"Qdrant only filters the numbers and dates by ranges."
+                    )
+                else:
+                    range_cls = models.Range
+                field_filter = models.FieldCondition(
+                    key=condition.field,
+                    range=range_cls(**{condition.operator.value: condition.value}),
+                )
+            must.append(field_filter)
+        return models.Filter(must=must)
+
+    def _to_search_result(self, point) -> SearchResult:
+        """
+        Convert the scored point into a search result.
+        :param point: point returned by Qdrant.
+        :return: search result, with the metadata if the payload was requested.
+        """
+        payload = dict(point.payload or {})
+        document_id = payload.pop(self.index_configuration.id_field)
+        payload.pop(self.index_configuration.content_hash_field, None)
+        return SearchResult(id=document_id, score=point.score, metadata=payload)
+
+    def _payload(self, document: Document) -> dict:
+        """
+        Create the payload of the point storing the document.
+        :param document: document to create the payload for.
+        :return: payload with the document ID, metadata and the hashes of the embedded texts.
+        """
+        return {
             self.index_configuration.id_field: document.id,
+            self.index_configuration.content_hash_field: document.content_hashes(),
             **document.metadata(),
         }
-        self.client.upsert(
-            collection_name=self.index_configuration.namespace,
+
+    def _rebuild(
+        self,
+        populate: Callable[["QdrantBackend"], Any],
+        resync: Optional[Callable[["QdrantBackend", List[DocumentID]], Any]],
+        resume: bool,
+        grace_period: Optional[float],
+        replace_unversioned: bool = False,
+    ) -> str:
+        collection_name = self.pending_rebuild()
+        if collection_name is None or not resume:
+            if collection_name is not None:
+                logger.warning(f"Removing the unfinished rebuild {collection_name}")
+                self._update_aliases(delete=[self.shadow_alias])
+                self.client.delete_collection(collection_name)
+                self.client.delete_collection(self._changes_name(collection_name))
+            collection_name = self._version_name(self._latest_version() + 1)
+            self._create_collection(collection_name)
+            self.client.create_collection(
+                collection_name=self._changes_name(collection_name), vectors_config={}
+            )
+            self._update_aliases(create={self.shadow_alias: collection_name})
+            time.sleep(
+                self.shadow_check_interval if grace_period is None else grace_period
+            )
+        elif not self.client.collection_exists(self._changes_name(collection_name)):
+            # Rebuilds started by the older versions of the library do not record the changes
+            self.client.create_collection(
+                collection_name=self._changes_name(collection_name), vectors_config={}
+            )
+
+        logger.info(f"Rebuilding {self.collection_name} in {collection_name}")
+        target = self._bind(collection_name)
+        populate(target)
+        if resync is not None:
+            self._resync_changes(target, resync)
+        self._swap(collection_name, replace_unversioned)
+        return collection_name
+
+    def _resync_changes(
+        self,
+        target: "QdrantBackend",
+        resync: Callable[["QdrantBackend", List[DocumentID]], Any],
+    ):
+        """
+        Pass the documents modified while the collection was populated to the resync callable. The changes recorded
+        in the meantime are processed in the next round, until there are none left.
+        """
+        from qdrant_client import models
+
+        changes_name = self._changes_name(target.collection_name)
+        while True:
+            points, _ = self.client.scroll(
+                collection_name=changes_name,
+                limit=self.upload_batch_size,
+                with_payload=True,
+            )
+            if not points:
+                return
+            # Changes recorded from now on are processed in the next round
+            self.client.delete(
+                collection_name=changes_name,
+                points_selector=models.PointIdsList(
+                    points=[point.id for point in points]
+                ),
+            )
+            logger.info(f"Storing {len(points)} documents modified during the rebuild")
+            resync(
+                target,
+                [point.payload[self.index_configuration.id_field] for point in points],
+            )
+
+    def _copy_points(
+        self, target: "QdrantBackend", document_ids: Optional[List[DocumentID]] = None
+    ):
+        """
+        Copy the points of the documents from the current collection to the target one, or all of them if no IDs are
+        given. The documents missing in the current collection are deleted from the target one.
+        """
+        if document_ids is not None:
+            points = self.client.retrieve(
+                collection_name=self.collection_name,
+                ids=[self.point_id(document_id) for document_id in document_ids],
+                with_payload=True,
+                with_vectors=True,
+            )
+            self._upsert_copies(target, points)
+            copied = {str(point.id) for point in points}
+            target.bulk_delete(
+                [
+                    document_id
+                    for document_id in document_ids
+                    if self.point_id(document_id) not in copied
+                ]
+            )
+            return
+
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=self.upload_batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            self._upsert_copies(target, points)
+            if offset is None:
+                return
+
+    def _upsert_copies(self, target: "QdrantBackend", records: list):
+        from qdrant_client import models
+
+        if not records:
+            return
+        target.client.upsert(
+            collection_name=target.collection_name,
             points=[
                 models.PointStruct(
-                    id=uuid.uuid4().hex,
-                    vector=vectors,
-                    payload=payload,
+                    id=record.id, vector=record.vector, payload=record.payload
                 )
+                for record in records
             ],
         )
 
-    def delete(self, document_id: DocumentID):
+    def _swap(self, collection_name: str, replace_unversioned: bool = False):
+        """
+        Point the alias of the namespace to the rebuilt collection and remove the previous versions.
+        :param collection_name: name of the rebuilt collection.
+        :param replace_unversioned: if set, the unversioned collection named after the namespace is removed, so the
+                                    alias might be created.
+        """
+        namespace = self.index_configuration.namespace
+        current = self._aliases().get(namespace)
+        if current is None and replace_unversioned:
+            logger.warning(
+                f"Replacing the unversioned collection {namespace}, "
+                f"it is not available until the alias is created."
+            )
+            self.client.delete_collection(namespace)
+        self._update_aliases(
+            delete=[self.shadow_alias] + ([namespace] if current is not None else []),
+            create={namespace: collection_name},
+        )
+        self._shadow = None
+        self._shadow_checked_at = None
+
+        # Other processes record the changes until they notice the swap, so the changes of the rebuilt collection are
+        # only removed with the next version
+        for previous in self._versions():
+            if previous != collection_name:
+                logger.info(f"Removing the previous version {previous}")
+                self.client.delete_collection(previous)
+                self.client.delete_collection(self._changes_name(previous))
+
+    def _is_unversioned(self) -> bool:
+        """
+        Check if the namespace is a collection created by the older versions of the library, instead of an alias.
+        """
+        namespace = self.index_configuration.namespace
+        return namespace not in self._aliases() and self.client.collection_exists(
+            namespace
+        )
+
+    def _changes_name(self, collection_name: str) -> str:
+        return f"{collection_name}{self.CHANGES_SUFFIX}"
+
+    def _record_changes(self, document_ids: List[DocumentID]):
+        """
+        Record the IDs of the documents modified while the collection is rebuilt.
+        """
+        self.client.upsert(
+            collection_name=self._changes_name(self.collection_name),
+            points=self._change_points(document_ids),
+        )
+
+    async def _arecord_changes(self, document_ids: List[DocumentID]):
+        """
+        Asynchronous version of the `_record_changes` method.
+        """
+        await self.async_client.upsert(
+            collection_name=self._changes_name(self.collection_name),
+            points=self._change_points(document_ids),
+        )
+
+    def _change_points(self, document_ids: List[DocumentID]) -> list:
         from qdrant_client import models
 
-        self.client.delete(
-            collection_name=self.index_configuration.namespace,
-            points_selector=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key=self.index_configuration.id_field,
-                        match=models.MatchValue(
-                            value=document_id,
-                        ),
+        return [
+            models.PointStruct(
+                id=self.point_id(document_id),
+                vector={},
+                payload={self.index_configuration.id_field: document_id},
+            )
+            for document_id in document_ids
+        ]
+
+    def _version_name(self, version: int) -> str:
+        return f"{self.index_configuration.namespace}_v{version}"
+
+    def _versions(self) -> Dict[str, int]:
+        """
+        Return the versions of the collection of the namespace, keyed by the collection name.
+        """
+        version_pattern = re.compile(
+            rf"^{re.escape(self.index_configuration.namespace)}_v(\d+)$"
+        )
+        return {
+            collection.name: int(match.group(1))
+            for collection in self.client.get_collections().collections
+            if (match := version_pattern.match(collection.name))
+        }
+
+    def _latest_version(self) -> int:
+        """
+        Return the highest version of the collection of the namespace, or 0 if there is none.
+        """
+        return max(self._versions().values(), default=0)
+
+    def _aliases(self) -> Dict[str, str]:
+        """
+        Return the collections all the aliases point to, keyed by the alias name.
+        """
+        aliases = self.client.get_aliases().aliases
+        return {alias.alias_name: alias.collection_name for alias in aliases}
+
+    def _update_aliases(
+        self,
+        delete: Optional[List[str]] = None,
+        create: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Delete and create the aliases in a single, atomic operation.
+        """
+        from qdrant_client import models
+
+        operations = [
+            models.DeleteAliasOperation(
+                delete_alias=models.DeleteAlias(alias_name=alias)
+            )
+            for alias in delete or []
+        ]
+        operations.extend(
+            models.CreateAliasOperation(
+                create_alias=models.CreateAlias(
+                    collection_name=collection_name, alias_name=alias
+                )
+            )
+            for alias, collection_name in (create or {}).items()
+        )
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+
+    def _create_collection(self, collection_name: str):
+        """
+        Create the collection with the vectors and the payload indexes of the index configuration.
+        """
+        from qdrant_client import models
+
+        self.client.create_collection(
+            collection_name=collection_name,
+            vectors_config={
+                vector_name: models.VectorParams(
+                    size=vector_config.size,
+                    distance=self.DISTANCE_MAPPING.get(vector_config.distance),
+                    quantization_config=self._quantization_config(
+                        vector_config.quantization
+                    ),
+                )
+                for vector_name, vector_config in self.index_configuration.vectors.items()
+            },
+        )
+        for field_name, field_schema in self._payload_indexes().items():
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema,
+            )
+
+    def _payload_indexes(self) -> dict:
+        """
+        Return the schemas of the payload indexes required by the index configuration, keyed by the field name.
+        """
+        from qdrant_client import models
+
+        indexes = {self.index_configuration.id_field: models.PayloadSchemaType.KEYWORD}
+        for field_name, field_type in self.index_configuration.payload_fields.items():
+            indexes.setdefault(field_name, self.PAYLOAD_SCHEMA_MAPPING[field_type])
+        return indexes
+
+    def _apply_schema_change(self, change: SchemaChange):
+        """
+        Update the collection to remove the non-destructive difference from the index configuration.
+        """
+        from qdrant_client import models
+
+        if change.type == SchemaChangeType.QUANTIZATION_MISMATCH:
+            quantization = self._quantization_config(
+                self.index_configuration.vectors[change.name].quantization
+            )
+            self.client.update_collection(
+                collection_name=self.collection_name,
+                vectors_config={
+                    change.name: models.VectorParamsDiff(
+                        quantization_config=quantization or models.Disabled.DISABLED
                     )
-                ]
-            ),
+                },
+            )
+            return
+
+        if change.type == SchemaChangeType.PAYLOAD_INDEX_MISMATCH:
+            self.client.delete_payload_index(
+                collection_name=self.collection_name, field_name=change.name
+            )
+        self.client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name=change.name,
+            field_schema=self._payload_indexes()[change.name],
+        )
+
+    def _schema_cache_key(self) -> str:
+        """
+        Key of the validation in the schema cache, unique for the Qdrant instance, the collection and its expected
+        schema.
+        """
+        schema = json.dumps(
+            [
+                self._client_args,
+                self._client_kwargs,
+                self.collection_name,
+                {
+                    name: [config.size, config.distance, config.quantization]
+                    for name, config in self.index_configuration.vectors.items()
+                },
+                self._payload_indexes(),
+            ],
+            sort_keys=True,
+            default=repr,
+        )
+        return f"django_semantic_search:qdrant_schema:{hashlib.sha256(schema.encode()).hexdigest()}"
+
+    @staticmethod
+    def _dump(config) -> Optional[dict]:
+        if config is None:
+            return None
+        return config.model_dump(exclude_none=True)
+
+    def _bind(self, collection_name: str) -> "QdrantBackend":
+        """
+        Create a copy of the backend reading from and writing to the physical collection, sharing the clients.
+        """
+        backend = copy.copy(self)
+        backend._collection_name = collection_name
+        backend._shadow = None
+        backend._shadow_checked_at = None
+        return backend
+
+    def _shadow_backend(self) -> Optional["QdrantBackend"]:
+        """
+        Return the backend writing into the collection being rebuilt, if there is any. The aliases are checked at
+        most once per `shadow_check_interval` seconds.
+        """
+        if self._collection_name is not None:
+            return None
+        now = time.monotonic()
+        if (
+            self._shadow_checked_at is None
+            or now - self._shadow_checked_at >= self.shadow_check_interval
+        ):
+            self._update_shadow(self._aliases())
+            self._shadow_checked_at = now
+        return self._shadow
+
+    async def _ashadow_backend(self) -> Optional["QdrantBackend"]:
+        """
+        Asynchronous version of the `_shadow_backend` method.
+        """
+        if self._collection_name is not None:
+            return None
+        now = time.monotonic()
+        if (
+            self._shadow_checked_at is None
+            or now - self._shadow_checked_at >= self.shadow_check_interval
+        ):
+            response = await self.async_client.get_aliases()
+            self._update_shadow(
+                {alias.alias_name: alias.collection_name for alias in response.aliases}
+            )
+            self._shadow_checked_at = now
+        return self._shadow
+
+    def _update_shadow(self, aliases: Dict[str, str]):
+        collection_name = aliases.get(self.shadow_alias)
+        if collection_name is None:
+            self._shadow = None
+        elif self._shadow is None or self._shadow.collection_name != collection_name:
+            self._shadow = self._bind(collection_name)
+
+    def _create_client(self, asynchronous: bool = False) -> RetryingClient:
+        from qdrant_client import AsyncQdrantClient, QdrantClient
+
+        client_cls = AsyncQdrantClient if asynchronous else QdrantClient
+        # The client modifies some of the options, e.g. the gRPC ones, which would change the key of the pool
+        return RetryingClient(
+            client_cls(*self._client_args, **copy.deepcopy(self._client_kwargs)),
+            **self._retry_options,
+        )
+
+    def _client_key(self) -> str:
+        """
+        Key of the clients in the pool, unique for their configuration.
+        """
+        return json.dumps(
+            [self._client_args, self._client_kwargs, self._retry_options],
+            sort_keys=True,
+            default=repr,
         )
@@ -0,0 +1,366 @@
+import json
+import logging
+import re
+import threading
+import weakref
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.db import DatabaseError, connections, transaction
+from django.db.backends.signals import connection_created
+
+from django_semantic_search import Document
+from django_semantic_search.backends.base import BaseVectorSearchBackend
+from django_semantic_search.backends.brute_force import BruteForceBackend
+from django_semantic_search.backends.types import (
+    Distance,
+    FilterCondition,
+    IndexConfiguration,
+    SearchResult,
+)
+from django_semantic_search.types import DocumentID, Vector, to_metadata_value
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteBackend(BaseVectorSearchBackend):
+    """
+    Backend that stores the vectors in a table of the SQLite database used by the models, so the semantic search
+    works without any additional infrastructure. The vectors are stored as packed float32 blobs, and the search is
+    exact, performed with NumPy over all the vectors of the namespace.
+
+    **Requirements**:
+
+    ```bash
+    pip install django-semantic-search[numpy]
+    ```
+
+    **Usage**:
+
+    ```python title="settings.py"
+    SEMANTIC_SEARCH = {
+        "vector_store": {
+            "backend": "django_semantic_search.backends.sqlite.SQLiteBackend",
+            "configuration": {
+                "using": "default",
+            },
+        },
+        ...
+    }
+    ```
+
+    The vectors are written with the same database connection as the models, so they are stored in the same
+    transaction as the model changes. The vectors are cached in memory between the searches, and the cache is
+    invalidated with a version number incremented by every write, so the changes made by the other processes are
+    visible as soon as they are committed. The writes committed by the backend itself are applied to the cache in
+    place, unless another process has modified the namespace since the cache was loaded.
+    """
+
+    VERSIONS_TABLE = "semantic_search_versions"
+
+    thread_sensitive = True
+
+    def __init__(
+        self,
+        index_configuration: IndexConfiguration,
+        using: str = "default",
+        table_prefix: str = "semantic_search_",
+        mmap_size: Optional[int] = 256 * 1024 * 1024,
+    ):
+        """
+        :param index_configuration: configuration of the indexes.
+        :param using: alias of the SQLite database to store the vectors in.
+        :param table_prefix: prefix of the tables created for the namespaces.
+        :param mmap_size: maximum number of bytes of the database file read with the memory-mapped I/O, set per
+                          connection. None keeps the SQLite default.
+        """
+        self.using = using
+        self.table_prefix = table_prefix
+        self.mmap_size = mmap_size
+        self._configured = False
+        self._lock = threading.Lock()
+        self._cache: Optional[Tuple[int, BruteForceBackend]] = None
+        # Connections with uncommitted writes to the table
+        self._dirty_connections: "weakref.WeakSet" = weakref.WeakSet()
+        super().__init__(index_configuration)
+        connection_created.connect(
+            self._configure_connection, dispatch_uid=f"{self.__class__}:{self.table}"
+        )
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    @property
+    def table(self) -> str:
+        """
+        Name of the table storing the documents of the namespace.
+        """
+        namespace = re.sub(r"\W", "_", self.index_configuration.namespace).lower()
+        return f"{self.table_prefix}{namespace}"
+
+    def configure(self):
+        """
+        Create the table of the namespace, unless it exists. If the database is not available yet, the configuration
+        is retried on the first use of the backend.
+        """
+        vector_columns = "".join(
+            f", {self._quote(name)} BLOB NOT NULL"
+            for name in self.index_configuration.vectors
+        )
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self._quote(self.table)} ("
+                    f"id TEXT PRIMARY KEY, metadata TEXT NOT NULL, "
+                    f"content_hashes TEXT NOT NULL{vector_columns})"
+                )
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self._quote(self.VERSIONS_TABLE)} ("
+                    f"namespace TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+                )
+                cursor.execute(
+                    f"INSERT OR IGNORE INTO {self._quote(self.VERSIONS_TABLE)} (namespace, version) VALUES (%s, 0)",
+                    [self.index_configuration.namespace],
+                )
+                self._configure_connection(connection=self.connection)
+        except DatabaseError as e:
+            logger.warning(f"Could not configure the table {self.table}: {e}")
+            return
+        self._configured = True
+
+    def search(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+    ) -> List[DocumentID]:
+        return self._index().search(vector_name, query, limit, filters=filters)
+
+    def search_with_scores(
+        self,
+        vector_name: str,
+        query: List[float],
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+    ) -> List[SearchResult]:
+        return self._index().search_with_scores(
+            vector_name, query, limit, filters=filters, with_metadata=with_metadata
+        )
+
+    def save(self, document: Document):
+        self.bulk_save([document])
+
+    def bulk_save(self, documents: List[Document]):
+        if not documents:
+            return
+
+        self._ensure_configured()
+        vector_names = list(self.index_configuration.vectors.keys())
+        columns = ", ".join(self._quote(name) for name in vector_names)
+        placeholders = ", ".join("%s" for _ in vector_names)
+        rows = {}
+        for document in documents:
+            rows[to_metadata_value(document.id)] = (
+                document.vectors(),
+                document.metadata(),
+                document.content_hashes(),
+            )
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {self._quote(self.table)} "
+                f"(id, metadata, content_hashes, {columns}) VALUES (%s, %s, %s, {placeholders})",
+                [
+                    [
+                        self._to_id(document_id),
+                        json.dumps(metadata),
+                        json.dumps(content_hashes),
+                        *(self._to_blob(name, vectors[name]) for name in vector_names),
+                    ]
+                    for document_id, (vectors, metadata, content_hashes) in rows.items()
+                ],
+            )
+            version = self._increment_version(cursor)
+        self._update_index(version, lambda index: index._upsert(rows))
+
+    def get_content_hashes(self, document_id: DocumentID) -> Optional[Dict[str, str]]:
+        self._ensure_configured()
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT content_hashes FROM {self._quote(self.table)} WHERE id = %s",
+                [self._to_id(document_id)],
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def partial_update(self, document: Document, vectors: Dict[str, Vector]):
+        self._ensure_configured()
+        assignments = ["metadata = %s", "content_hashes = %s"]
+        assignments.extend(f"{self._quote(name)} = %s" for name in vectors)
+        document_id, metadata, content_hashes = self._document_params(document)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {self._quote(self.table)} SET {', '.join(assignments)} WHERE id = %s",
+                [
+                    metadata,
+                    content_hashes,
+                    *(self._to_blob(name, vector) for name, vector in vectors.items()),
+                    document_id,
+                ],
+            )
+            if not cursor.rowcount:
+                self.save(document)
+                return
+            version = self._increment_version(cursor)
+        self._update_index(
+            version, lambda index: index.partial_update(document, vectors)
+        )
+
+    def delete(self, document_id: DocumentID):
+        self.bulk_delete([document_id])
+
+    def bulk_delete(self, document_ids: List[DocumentID]):
+        if not document_ids:
+            return
+
+        self._ensure_configured()
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self._quote(self.table)} WHERE id = %s",
+                [[self._to_id(document_id)] for document_id in document_ids],
+            )
+            version = self._increment_version(cursor)
+        self._update_index(version, lambda index: index.bulk_delete(document_ids))
+
+    def _index(self) -> BruteForceBackend:
+        """
+        Return the in-memory index of all the stored vectors. It is cached as long as the version of the namespace
+        does not change. The index is not cached in the transactions which have modified the table, as it contains
+        their uncommitted changes.
+        :return: brute force index of the vectors.
+        """
+        import numpy as np
+
+        self._ensure_configured()
+        connection = self.connection
+        if not connection.in_atomic_block:
+            # The transaction with the changes was rolled back
+            self._dirty_connections.discard(connection)
+        cacheable = connection not in self._dirty_connections
+        with connection.cursor() as cursor:
+            version = self._version(cursor)
+            cache = self._cache
+            if cacheable and cache is not None and cache[0] == version:
+                return cache[1]
+
+            vector_names = list(self.index_configuration.vectors.keys())
+            columns = "".join(f", {self._quote(name)}" for name in vector_names)
+            cursor.execute(
+                f"SELECT id, metadata, content_hashes{columns} FROM {self._quote(self.table)}"
+            )
+            rows = cursor.fetchall()
+
+        index = BruteForceBackend(self.index_configuration)
+        index._replace(
+            [json.loads(row[0]) for row in rows],
+            [json.loads(row[1]) for row in rows],
+            [json.loads(row[2]) for row in rows],
+            {
+                name: np.frombuffer(
+                    b"".join(row[3 + i] for row in rows), dtype=np.float32
+                ).reshape(len(rows), self.index_configuration.vectors[name].size)
+                for i, name in enumerate(vector_names)
+            },
+        )
+        if cacheable:
+            with self._lock:
+                self._cache = (version, index)
+        return index
+
+    def _version(self, cursor) -> int:
+        cursor.execute(
+            f"SELECT version FROM {self._quote(self.VERSIONS_TABLE)} WHERE namespace = %s",
+            [self.index_configuration.namespace],
+        )
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def _increment_version(self, cursor) -> int:
+        """
+        Increment the version of the namespace, after the table was modified.
+        :return: the new version.
+        """
+        cursor.execute(
+            f"UPDATE {self._quote(self.VERSIONS_TABLE)} SET version = version + 1 WHERE namespace = %s "
+            f"RETURNING version",
+            [self.index_configuration.namespace],
+        )
+        row = cursor.fetchone()
+        connection = self.connection
+        if connection.in_atomic_block:
+            self._dirty_connections.add(connection)
+            transaction.on_commit(
+                lambda: self._dirty_connections.discard(connection), using=self.using
+            )
+        return row[0] if row else 0
+
+    def _update_index(self, version: int, update: Callable[[BruteForceBackend], None]):
+        """
+        Apply the committed write to the cached index in place, so the next search does not reload all the vectors.
+        If any other write happened since the cache was loaded, the cache is left to be reloaded.
+        :param version: version of the namespace created by the write.
+        :param update: function applying the write to the index.
+        """
+        if self.connection.in_atomic_block:
+            # The write might still be rolled back
+            return
+        with self._lock:
+            cache = self._cache
+            if cache is None or cache[0] != version - 1:
+                return
+            update(cache[1])
+            self._cache = (version, cache[1])
+
+    def _ensure_configured(self):
+        if not self._configured:
+            self.configure()
+
+    def _configure_connection(self, sender=None, connection=None, **kwargs):
+        """
+        Enable the memory-mapped I/O of the database connection, so reading the vectors does not copy the pages.
+        """
+        if connection is None or connection.alias != self.using:
+            return
+        if self.mmap_size is None:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+
+    def _document_params(self, document: Document) -> List[str]:
+        return [
+            self._to_id(document.id),
+            json.dumps(document.metadata()),
+            json.dumps(document.content_hashes()),
+        ]
+
+    def _to_id(self, document_id: DocumentID) -> str:
+        return json.dumps(to_metadata_value(document_id))
+
+    def _to_blob(self, vector_name: str, vector: Vector) -> bytes:
+        """
+        Pack the vector into the float32 blob. Vectors compared with the cosine distance are normalized upfront.
+        """
+        import numpy as np
+
+        vector = np.asarray(vector, dtype=np.float32)
+        if self.index_configuration.vectors[vector_name].distance == Distance.COSINE:
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector = vector / norm
+        return vector.tobytes()
+
+    def _quote(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict
+from typing import Any, Dict, Mapping, Optional, Union
+
+from django_semantic_search.types import DocumentID, MetadataValue, to_metadata_value
 
 
 class Distance(str, Enum):
@@ -9,10 +11,149 @@ class Distance(str, Enum):
     DOT_PRODUCT = "dot_product"
 
 
+class Fusion(str, Enum):
+    # Reciprocal Rank Fusion, combining the positions of the documents in the results
+    RRF = "rrf"
+    # Distribution-Based Score Fusion, combining the normalized scores of the documents
+    DBSF = "dbsf"
+
+
+class PayloadFieldType(str, Enum):
+    KEYWORD = "keyword"
+    INTEGER = "integer"
+    FLOAT = "float"
+    BOOLEAN = "boolean"
+    DATETIME = "datetime"
+
+
+class FilterOperator(str, Enum):
+    EXACT = "exact"
+    IN = "in"
+    LT = "lt"
+    LTE = "lte"
+    GT = "gt"
+    GTE = "gte"
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class FilterCondition:
+    """
+    Single condition on the metadata of the documents, created out of a Django-style lookup, e.g. `price__lt=10`.
+    """
+
+    # Name of the metadata field
+    field: str
+    # Comparison to perform
+    operator: FilterOperator
+    # Value to compare with, converted to the metadata representation
+    value: Any
+
+    @classmethod
+    def from_lookup(cls, lookup: str, value: Any) -> "FilterCondition":
+        """
+        Create the condition out of a Django-style lookup.
+        :param lookup: lookup, such as `category` or `price__lt`.
+        :param value: value of the lookup.
+        :return: filter condition.
+        """
+        field_name, _, operator = lookup.partition("__")
+        try:
+            operator = FilterOperator(operator or FilterOperator.EXACT)
+        except ValueError:
+            raise ValueError(f"Lookup {operator} is not supported in {lookup}")
+        if operator == FilterOperator.IN:
+            value = [to_metadata_value(item) for item in value]
+        else:
+            value = to_metadata_value(value)
+        return cls(field=field_name, operator=operator, value=value)
+
+    def matches(self, metadata: Mapping[str, MetadataValue]) -> bool:
+        """
+        Check if the metadata of a document matches the condition. Backends without native filtering support may
+        use it to filter the documents on their side.
+        :param metadata: metadata of the document.
+        :return: True if the document matches, False otherwise.
+        """
+        if self.field not in metadata:
+            return False
+        actual = to_metadata_value(metadata[self.field])
+        if self.operator == FilterOperator.EXACT:
+            return actual == self.value
+        if self.operator == FilterOperator.IN:
+            return actual in self.value
+        if actual is None:
+            return False
+        if self.operator == FilterOperator.LT:
+            return actual < self.value
+        if self.operator == FilterOperator.LTE:
+            return actual <= self.value
+        if self.operator == FilterOperator.GT:
+            return actual > self.value
+        return actual >= self.value
+
+
+class QuantizationType(str, Enum):
+    # Each float32 dimension compressed into a single int8 value, 4x smaller
+    SCALAR = "scalar"
+    # Each dimension compressed into a single bit, 32x smaller
+    BINARY = "binary"
+    # Chunks of dimensions replaced with the identifiers of their centroids, 4x up to 64x smaller
+    PRODUCT = "product"
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class Quantization:
+    """
+    Quantization of the vectors, which reduces the memory usage of the vector index at the cost of its precision.
+    The original vectors are kept as well, so the results might be rescored with them.
+    """
+
+    # Type of the quantization
+    type: QuantizationType
+    # Flag to keep the quantized vectors in memory, even if the original ones are stored on disk
+    always_ram: bool = True
+    # Quantile of the values used to calculate the quantization bounds, only for the scalar quantization
+    quantile: Optional[float] = None
+    # Compression ratio, only for the product quantization
+    compression: int = 16
+    # Number of the candidates selected with the quantized vectors, relative to the limit
+    oversampling: Optional[float] = None
+    # Flag to reorder the candidates using the original vectors
+    rescore: bool = True
+
+    COMPRESSION_RATIOS = (4, 8, 16, 32, 64)
+
+    def __post_init__(self):
+        object.__setattr__(self, "type", QuantizationType(self.type))
+        if self.quantile is not None and not 0.5 <= self.quantile <= 1.0:
+            raise ValueError("Quantile has to be between 0.5 and 1.0.")
+        if self.compression not in self.COMPRESSION_RATIOS:
+            raise ValueError(
+                f"Compression ratio has to be one of {self.COMPRESSION_RATIOS}."
+            )
+        if self.oversampling is not None and self.oversampling < 1.0:
+            raise ValueError("Oversampling has to be at least 1.0.")
+
+    @classmethod
+    def create(
+        cls, quantization: Union["Quantization", QuantizationType, str, None]
+    ) -> Optional["Quantization"]:
+        """
+        Create the quantization out of its full definition or just the type, with the default options.
+        :param quantization: quantization, its type, or None.
+        :return: quantization instance, or None if disabled.
+        """
+        if quantization is None or isinstance(quantization, Quantization):
+            return quantization
+        return cls(type=QuantizationType(quantization))
+
+
 @dataclass(frozen=True, eq=True, slots=True)
 class VectorConfiguration:
     size: int
     distance: Distance
+    # Quantization of the vectors, if the backend supports it
+    quantization: Optional[Quantization] = None
 
 
 @dataclass(frozen=True, eq=True, slots=True)
@@ -27,7 +168,72 @@ class IndexConfiguration:
     vectors: Dict[str, VectorConfiguration] = field(default_factory=dict)
     # Name of the property that contains the document id
     id_field: str = "id"
+    # Name of the property that contains the hashes of the embedded texts
+    content_hash_field: str = "content_hashes"
+    # Metadata fields that might be used in the filters, along with their types
+    payload_fields: Dict[str, PayloadFieldType] = field(default_factory=dict)
 
     def __hash__(self):
         frozen_vectors = frozenset(sorted(self.vectors.items()))
-        return hash(self.namespace) + hash(self.id_field) + hash(frozen_vectors)
+        frozen_payload_fields = frozenset(sorted(self.payload_fields.items()))
+        return (
+            hash(self.namespace)
+            + hash(self.id_field)
+            + hash(self.content_hash_field)
+            + hash(frozen_vectors)
+            + hash(frozen_payload_fields)
+        )
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class SearchResult:
+    """
+    Single result of the search in the vector store.
+    """
+
+    # ID of the document, i.e. the primary key of the model instance
+    id: DocumentID
+    # Similarity score of the document, higher is more similar
+    score: float
+    # Metadata stored along with the document, if requested
+    metadata: Dict[str, MetadataValue] = field(default_factory=dict)
+
+
+class SchemaChangeType(str, Enum):
+    # Vector declared in the index configuration, but missing in the vector store
+    MISSING_VECTOR = "missing_vector"
+    # Vector stored with a different size or distance than declared
+    VECTOR_MISMATCH = "vector_mismatch"
+    # Vector stored with a different quantization than declared
+    QUANTIZATION_MISMATCH = "quantization_mismatch"
+    # Payload field used in the filters, but not indexed in the vector store
+    MISSING_PAYLOAD_INDEX = "missing_payload_index"
+    # Payload field indexed with a different type than declared
+    PAYLOAD_INDEX_MISMATCH = "payload_index_mismatch"
+
+    @property
+    def destructive(self) -> bool:
+        """
+        Whether fixing the change requires recreating the collection, and storing all the documents again.
+        """
+        return self in (
+            SchemaChangeType.MISSING_VECTOR,
+            SchemaChangeType.VECTOR_MISMATCH,
+        )
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class SchemaChange:
+    """
+    Single difference between the index configuration and the schema of the collection in the vector store.
+    """
+
+    type: SchemaChangeType
+    # Name of the vector or the payload field the change refers to
+    name: str
+    # Human-readable description of the difference
+    description: str
+
+    @property
+    def destructive(self) -> bool:
+        return self.type.destructive
@@ -0,0 +1,349 @@
+import abc
+import copy
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from django_semantic_search.types import Vector
+
+logger = logging.getLogger(__name__)
+
+QueryCacheKey = Tuple[str, Optional[str], str]
+DocumentCacheKey = Tuple[str, Optional[str], str]
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize the query text, so the queries differing only in whitespace share the same embedding.
+    :param query: query to normalize.
+    :return: normalized query.
+    """
+    return " ".join(query.split())
+
+
+class BaseQueryEmbeddingCache(abc.ABC):
+    """
+    Base class for the caches of the query embeddings. The keys are tuples of the model identifier, the query prompt
+    and the normalized query text.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: QueryCacheKey) -> Optional[Vector]:
+        """
+        Get the cached embedding of the query. The caller gets its own copy, so modifying it does not affect the cache.
+        :param key: cache key of the query.
+        :return: cached embedding, or None if it is not cached.
+        """
+        vector = self._get(key)
+        with self._stats_lock:
+            if vector is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return copy.copy(vector)
+
+    def set(self, key: QueryCacheKey, vector: Vector):
+        """
+        Store the embedding of the query in the cache. A copy is stored, so the caller may modify the embedding later.
+        :param key: cache key of the query.
+        :param vector: embedding of the query.
+        """
+        self._set(key, copy.copy(vector))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the statistics of the cache usage in the current process.
+        :return: dictionary with the number of hits and misses.
+        """
+        with self._stats_lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    @abc.abstractmethod
+    def _get(self, key: QueryCacheKey) -> Optional[Vector]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _set(self, key: QueryCacheKey, vector: Vector):
+        raise NotImplementedError
+
+
+class InMemoryQueryEmbeddingCache(BaseQueryEmbeddingCache):
+    """
+    Size-bounded LRU cache of the query embeddings, kept in the memory of the current process.
+
+    **Usage**:
+
+    ```python title="settings.py"
+    SEMANTIC_SEARCH = {
+        "query_embeddings_cache": {
+            "backend": "django_semantic_search.cache.InMemoryQueryEmbeddingCache",
+            "configuration": {
+                "max_size": 1024,
+                "ttl": 3600,
+            },
+        },
+        ...
+    }
+    ```
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        """
+        :param max_size: maximum number of the cached embeddings.
+        :param ttl: time, in seconds, after which the cached embedding expires. Never expires if not set.
+        """
+        super().__init__()
+        if max_size < 1:
+            raise ValueError("Maximum size of the cache has to be a positive integer.")
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[QueryCacheKey, Tuple[Vector, Optional[float]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, int]:
+        return {**super().stats(), "size": len(self._entries)}
+
+    def _get(self, key: QueryCacheKey) -> Optional[Vector]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            vector, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return vector
+
+    def _set(self, key: QueryCacheKey, vector: Vector):
+        expires_at = time.monotonic() + self._ttl if self._ttl is not None else None
+        with self._lock:
+            self._entries[key] = (vector, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+class DjangoQueryEmbeddingCache(BaseQueryEmbeddingCache):
+    """
+    Cache of the query embeddings stored in the Django cache framework, so it might be shared between the workers.
+    The size and the eviction policy are controlled by the configuration of the selected Django cache.
+
+    **Usage**:
+
+    ```python title="settings.py"
+    SEMANTIC_SEARCH = {
+        "query_embeddings_cache": {
+            "backend": "django_semantic_search.cache.DjangoQueryEmbeddingCache",
+            "configuration": {
+                "cache_alias": "default",
+                "ttl": 3600,
+            },
+        },
+        ...
+    }
+    ```
+    """
+
+    def __init__(
+        self,
+        cache_alias: str = "default",
+        ttl: Optional[float] = None,
+        key_prefix: str = "django-semantic-search:query",
+    ):
+        """
+        :param cache_alias: alias of the Django cache to use.
+        :param ttl: time, in seconds, after which the cached embedding expires. Never expires if not set.
+        :param key_prefix: prefix of the keys in the Django cache.
+        """
+        super().__init__()
+        self._cache_alias = cache_alias
+        self._ttl = ttl
+        self._key_prefix = key_prefix
+
+    @property
+    def _cache(self):
+        from django.core.cache import caches
+
+        return caches[self._cache_alias]
+
+    def _cache_key(self, key: QueryCacheKey) -> str:
+        # Hash the key, so it is safe for all the cache backends, such as memcached
+        key_hash = hashlib.sha256(repr(key).encode()).hexdigest()
+        return f"{self._key_prefix}:{key_hash}"
+
+    def _get(self, key: QueryCacheKey) -> Optional[Vector]:
+        return self._cache.get(self._cache_key(key))
+
+    def _set(self, key: QueryCacheKey, vector: Vector):
+        self._cache.set(self._cache_key(key), vector, timeout=self._ttl)
+
+
+class BaseDocumentEmbeddingCache(abc.ABC):
+    """
+    Base class for the caches of the document embeddings. The keys are tuples of the model identifier, the document
+    prompt and the SHA-256 hash of the document text, so the cache stays valid for the unchanged texts, no matter
+    which model instance, collection or backend they are indexed for.
+    """
+
+    @abc.abstractmethod
+    def get_many(
+        self, keys: Iterable[DocumentCacheKey]
+    ) -> Dict[DocumentCacheKey, Vector]:
+        """
+        Get the cached embeddings of multiple documents at once.
+        :param keys: cache keys of the documents.
+        :return: dictionary of the cached embeddings. Keys missing in the cache are not included.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set_many(self, items: Dict[DocumentCacheKey, Vector]):
+        """
+        Store the embeddings of multiple documents at once.
+        :param items: dictionary of the embeddings, keyed by the cache keys.
+        """
+        raise NotImplementedError
+
+
+class SQLiteDocumentEmbeddingCache(BaseDocumentEmbeddingCache):
+    """
+    Persistent cache of the document embeddings, stored in a local SQLite database as float32 blobs. When the number
+    of entries exceeds the maximum size, the least recently used entries are evicted. The entries are counted only
+    once the writes of the process might have exceeded the maximum size, so with multiple processes writing to the
+    same file, the cache might temporarily grow above it.
+
+    **Usage**:
+
+    ```python title="settings.py"
+    SEMANTIC_SEARCH = {
+        "document_embeddings_cache": {
+            "backend": "django_semantic_search.cache.SQLiteDocumentEmbeddingCache",
+            "configuration": {
+                "path": BASE_DIR / "embeddings.sqlite3",
+                "max_entries": 1_000_000,
+            },
+        },
+        ...
+    }
+    ```
+    """
+
+    # Fraction of the maximum size to free up on eviction, to avoid evicting on every write
+    EVICTION_RATIO = 0.1
+    # Maximum number of the SQL variables used in a single lookup
+    LOOKUP_CHUNK_SIZE = 256
+
+    def __init__(self, path: Union[str, Path], max_entries: int = 1_000_000):
+        """
+        :param path: path to the SQLite database file. It is created if it does not exist.
+        :param max_entries: maximum number of the cached embeddings.
+        """
+        if max_entries < 1:
+            raise ValueError("Maximum number of entries has to be a positive integer.")
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(path), timeout=30, check_same_thread=False
+        )
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, "
+                "prompt TEXT NOT NULL, "
+                "text_hash TEXT NOT NULL, "
+                "vector BLOB NOT NULL, "
+                "last_used REAL NOT NULL, "
+                "PRIMARY KEY (model, prompt, text_hash))"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+            )
+            # Upper bound of the number of the entries, as the replaced entries are counted as new ones
+            self._count = self._connection.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()[0]
+
+    def get_many(
+        self, keys: Iterable[DocumentCacheKey]
+    ) -> Dict[DocumentCacheKey, Vector]:
+        keys = list(dict.fromkeys(keys))
+        results = {}
+        now = time.time()
+        with self._lock, self._connection:
+            for start in range(0, len(keys), self.LOOKUP_CHUNK_SIZE):
+                chunk = keys[start : start + self.LOOKUP_CHUNK_SIZE]
+                conditions = " OR ".join(
+                    ["(model = ? AND prompt = ? AND text_hash = ?)"] * len(chunk)
+                )
+                rows = self._connection.execute(
+                    f"SELECT model, prompt, text_hash, vector FROM embeddings WHERE {conditions}",
+                    [value for key in chunk for value in self._row_key(key)],
+                ).fetchall()
+                for model, prompt, text_hash, blob in rows:
+                    results[(model, prompt or None, text_hash)] = array(
+                        "f", blob
+                    ).tolist()
+                self._connection.executemany(
+                    "UPDATE embeddings SET last_used = ? "
+                    "WHERE model = ? AND prompt = ? AND text_hash = ?",
+                    [(now, *row[:3]) for row in rows],
+                )
+        return results
+
+    def set_many(self, items: Dict[DocumentCacheKey, Vector]):
+        if not items:
+            return
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, prompt, text_hash, vector, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (*self._row_key(key), array("f", vector).tobytes(), now)
+                    for key, vector in items.items()
+                ],
+            )
+            self._count += len(items)
+            if self._count > self._max_entries:
+                self._evict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()[0]
+
+    def _evict(self):
+        count = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[
+            0
+        ]
+        self._count = count
+        if count <= self._max_entries:
+            return
+        target = int(self._max_entries * (1 - self.EVICTION_RATIO))
+        self._connection.execute(
+            "DELETE FROM embeddings WHERE rowid IN ("
+            "SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+            (count - target,),
+        )
+        self._count = target
+        logger.debug(f"Evicted {count - target} cached document embeddings")
+
+    @staticmethod
+    def _row_key(key: DocumentCacheKey) -> List[str]:
+        model, prompt, text_hash = key
+        return [model, prompt or "", text_hash]
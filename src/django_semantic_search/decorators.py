@@ -1,12 +1,15 @@
 import logging
-from typing import Type
+import threading
+from typing import Dict, List, Type
 
 from django.core.exceptions import ImproperlyConfigured
-from django.db import models
+from django.db import models, transaction
 from django.dispatch import receiver
 
+from django_semantic_search import registry
 from django_semantic_search.documents import Document
-from django_semantic_search.utils import load_backend
+from django_semantic_search.types import DocumentID
+from django_semantic_search.utils import load_deferred_queue
 
 logger = logging.getLogger(__name__)
 
@@ -34,16 +37,86 @@ def register_document(document_cls: Type[Document]) -> Type[Document]:
     # Register the model handlers
     register_model_handlers(document_cls)
 
-    # Set up the document class to initialize vector store
-    index_configuration = document_cls.index_configuration
-    backend = load_backend(index_configuration)
-    logger.info(
-        f"Initializing vector store for {document_cls.meta.model} with backend {backend}"
-    )
+    # The embedding models and the vector store are loaded lazily, on the first use of the document. Loading them
+    # upfront is possible with the `warm_up` function.
+    registry.register(document_cls)
 
     return document_cls
 
 
+class _DeleteBatch:
+    """
+    Documents of a single class removed by a single `delete()` call, either of a model instance or a queryset.
+    """
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.expected = set()
+        self.document_ids: List[DocumentID] = []
+
+
+class _PendingDeletes(threading.local):
+    """
+    Deletes collected from the `pre_delete` and `post_delete` signals, kept separately for each thread.
+    """
+
+    def __init__(self):
+        self.batches: Dict[Type[Document], _DeleteBatch] = {}
+
+
+_pending_deletes = _PendingDeletes()
+
+
+def expect_delete(document_cls: Type[Document], document_id: DocumentID, origin=None):
+    """
+    Announce the document is going to be deleted by the `delete()` call of the origin.
+    :param document_cls: class of the document to delete.
+    :param document_id: id of the document to delete.
+    :param origin: model instance or queryset the delete was called on.
+    """
+    batch = _pending_deletes.batches.get(document_cls)
+    if batch is None or batch.origin is not origin:
+        if batch is not None:
+            # The previous delete did not complete, so its transaction was rolled back and the rows still exist
+            logger.debug(
+                f"Discarding {len(batch.document_ids)} documents of {document_cls.__name__} "
+                f"of an incomplete delete"
+            )
+        batch = _DeleteBatch(origin)
+        _pending_deletes.batches[document_cls] = batch
+    batch.expected.add(document_id)
+
+
+def schedule_delete(document_cls: Type[Document], document_id: DocumentID, origin=None):
+    """
+    Delete the document from the vector store. Django sends the `post_delete` signal for each of the rows removed
+    by a queryset `delete()`, so the documents are collected and removed with a single call to the backend, once
+    the signal is received for all the rows announced with :func:`expect_delete`.
+    :param document_cls: class of the document to delete.
+    :param document_id: id of the document to delete.
+    :param origin: model instance or queryset the delete was called on.
+    """
+    batch = _pending_deletes.batches.get(document_cls)
+    if batch is None or batch.origin is not origin:
+        document_cls.backend.bulk_delete([document_id])
+        return
+
+    batch.expected.discard(document_id)
+    batch.document_ids.append(document_id)
+    if not batch.expected:
+        del _pending_deletes.batches[document_cls]
+        _flush(document_cls, batch)
+
+
+def _flush(document_cls: Type[Document], batch: _DeleteBatch):
+    if not batch.document_ids:
+        return
+    logger.debug(
+        f"Deleting {len(batch.document_ids)} documents of {document_cls.__name__}"
+    )
+    document_cls.backend.bulk_delete(batch.document_ids)
+
+
 def register_model_handlers(document_cls: Type[Document]) -> Type[Document]:
     """
     Register all the model signals to update the documents in the vector store.
@@ -64,21 +137,49 @@ def register_model_handlers(document_cls: Type[Document]) -> Type[Document]:
         logger.warning(f"Signals are already registered for {document_cls.meta.model}.")
         return document_cls
 
+    deferred_signals = getattr(
+        document_cls.meta, "deferred_signals", Document.Meta.deferred_signals
+    )
+
     @receiver(models.signals.post_save, sender=document_cls.meta.model, weak=False)
     def save_model(sender, instance: document_cls.meta.model, created: bool, **kwargs):
-        logger.debug(f"Saving document for {instance}")
-        # TODO: detect the changes in the model and determine if the document should be updated
+        if deferred_signals:
+            logger.debug(f"Deferring document save for {instance}")
+            document_id = instance.pk
+            transaction.on_commit(
+                lambda: load_deferred_queue().enqueue_save(document_cls, document_id)
+            )
+            return
 
-        # Create the document instance out of the model instance and save it
+        logger.debug(f"Saving document for {instance}")
+        # Create the document instance out of the model instance and save it. The document detects which
+        # of the indexes have to be re-embedded, based on the modified fields and the stored content hashes.
         document = document_cls(instance)
-        document.save()
+        document.save(update_fields=kwargs.get("update_fields"), created=created)
 
     @receiver(models.signals.post_delete, sender=document_cls.meta.model, weak=False)
     def delete_model(sender, instance: document_cls.meta.model, **kwargs):
+        if deferred_signals:
+            logger.debug(f"Deferring document delete for {instance}")
+            document_id = instance.pk
+            transaction.on_commit(
+                lambda: load_deferred_queue().enqueue_delete(document_cls, document_id)
+            )
+            return
+
         logger.debug(f"Deleting document for {instance}")
-        # Create the document instance out of the model instance and delete it
-        document = document_cls(instance)
-        document.delete()
+        # The documents of a queryset are removed together, when the last of its rows is deleted
+        schedule_delete(
+            document_cls, document_cls(instance).id, origin=kwargs.get("origin")
+        )
+
+    if not deferred_signals:
+
+        @receiver(models.signals.pre_delete, sender=document_cls.meta.model, weak=False)
+        def expect_model_delete(sender, instance: document_cls.meta.model, **kwargs):
+            expect_delete(
+                document_cls, document_cls(instance).id, origin=kwargs.get("origin")
+            )
 
     # Mark the signals as registered
     setattr(document_cls.meta, "__signals_registered__", True)
@@ -8,9 +8,7 @@ SEMANTIC_SEARCH = {
             "location": "http://localhost:6333",
         },
     },
-    # Default embeddings are used to generate the embeddings for the documents if no embeddings are provided.
-    # For the time being, there is no way to provide embeddings for the documents, so the default embeddings
-    # are used for all the documents.
+    # Default embeddings are used by the vector indexes which do not specify their own embedding model.
     "default_embeddings": {
         # Either the path to the embeddings model class or the class itself
         "model": "django_semantic_search.embeddings.SentenceTransformerModel",
@@ -19,4 +17,44 @@ SEMANTIC_SEARCH = {
             "model_name": "sentence-transformers/all-MiniLM-L6-v2",
         },
     },
+    # Additional embedding models, keyed by the alias used in `VectorIndex(..., embedding_model="alias")`. Each
+    # of them is defined the same way as the default embeddings, and loaded on the first use.
+    "embedding_models": {},
+    # Deferred updates are used by the documents with `deferred_signals` enabled. Model changes are queued after
+    # the transaction commits and applied in batches by a background thread.
+    "deferred_updates": {
+        # Number of pending updates that triggers a flush
+        "batch_size": 100,
+        # Maximum time, in seconds, an update waits in the queue
+        "flush_interval": 1.0,
+        # Maximum number of the retries of the updates which failed, e.g. when the vector store was not available
+        "max_retries": 3,
+        # Time, in seconds, before the first retry of a failed update, doubled with every next retry
+        "retry_backoff": 1.0,
+    },
+    # Query embeddings cache stores the embeddings of the recent queries, so the repeated queries do not have to be
+    # embedded again. Set the backend to None to disable the cache.
+    "query_embeddings_cache": {
+        # Either the path to the cache class or the class itself
+        "backend": "django_semantic_search.cache.InMemoryQueryEmbeddingCache",
+        # Configuration is passed directly to the cache class during initialization.
+        "configuration": {
+            "max_size": 1024,
+            "ttl": None,
+        },
+    },
+    # Document embeddings cache stores the embeddings of the indexed texts, so rebuilding the index out of
+    # the unchanged data does not have to run the embedding model again. Disabled by default.
+    "document_embeddings_cache": {
+        # Either the path to the cache class, e.g. "django_semantic_search.cache.SQLiteDocumentEmbeddingCache",
+        # or the class itself
+        "backend": None,
+        # Configuration is passed directly to the cache class during initialization.
+        "configuration": {},
+    },
+    # Asynchronous API runs the embedding models in a bounded pool of threads, so they do not block the event loop.
+    "async": {
+        # Maximum number of the concurrent embedding model inferences
+        "embedding_workers": 4,
+    },
 }
@@ -0,0 +1,257 @@
+import atexit
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+
+from django.db import close_old_connections
+
+from django_semantic_search.types import DocumentID
+
+if TYPE_CHECKING:
+    from django_semantic_search.documents import Document
+
+logger = logging.getLogger(__name__)
+
+SAVE = "save"
+DELETE = "delete"
+
+
+class DeferredUpdateQueue:
+    """
+    In-process queue of the pending document updates. Model changes are pushed to the queue and processed by
+    a background worker thread, so the request thread does not pay for the embedding and the vector store round trip.
+
+    Repeated updates of the same model instance are coalesced, so only the last operation is applied. The queue is
+    flushed in batches, either when the number of pending updates reaches the batch size, or when the oldest pending
+    update waits longer than the flush interval. Pending updates are drained when the process exits.
+
+    Updates of a batch which failed, e.g. because the vector store was not available, are retried with an exponential
+    backoff, unless a newer update of the same instance was queued in the meantime. Updates still failing after
+    the maximum number of retries are logged along with the IDs of their instances, so they might be reindexed later.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+    ):
+        """
+        :param batch_size: number of pending updates that triggers a flush.
+        :param flush_interval: maximum time, in seconds, an update waits in the queue.
+        :param max_retries: maximum number of the retries of a failed update.
+        :param retry_backoff: time, in seconds, before the first retry of a failed update. It is doubled with every
+                              next retry.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size has to be a positive integer.")
+        if max_retries < 0:
+            raise ValueError("Maximum number of retries cannot be negative.")
+
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._pending: Dict[Tuple[Type["Document"], DocumentID], str] = {}
+        # Failed updates waiting for a retry, along with the number of the failed attempts and the time of the retry
+        self._retries: Dict[
+            Tuple[Type["Document"], DocumentID], Tuple[str, int, float]
+        ] = {}
+        self._oldest_pending: Optional[float] = None
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def enqueue_save(self, document_cls: Type["Document"], document_id: DocumentID):
+        """
+        Schedule the document to be (re)indexed.
+        :param document_cls: document class of the changed instance.
+        :param document_id: primary key of the changed instance.
+        """
+        self._enqueue(document_cls, document_id, SAVE)
+
+    def enqueue_delete(self, document_cls: Type["Document"], document_id: DocumentID):
+        """
+        Schedule the document to be removed from the vector store.
+        :param document_cls: document class of the removed instance.
+        :param document_id: primary key of the removed instance.
+        """
+        self._enqueue(document_cls, document_id, DELETE)
+
+    def flush(self):
+        """
+        Process all the pending updates, and the failed ones due for a retry, in the calling thread. Once the queue
+        is stopped, all the failed updates are retried immediately.
+        """
+        with self._flush_lock:
+            with self._condition:
+                pending = self._pending
+                self._pending = {}
+                self._oldest_pending = None
+                now = time.monotonic()
+                retried = {
+                    key: (operation, attempts)
+                    for key, (operation, attempts, retry_at) in self._retries.items()
+                    if self._stopped or retry_at <= now
+                }
+                for key in retried:
+                    del self._retries[key]
+            updates = {key: operation for key, (operation, _) in retried.items()}
+            updates.update(pending)
+            if updates:
+                failed = self._process(updates)
+                attempts = {key: attempts for key, (_, attempts) in retried.items()}
+                self._schedule_retries(failed, attempts)
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """
+        Stop the worker thread and drain all the pending updates.
+        :param timeout: maximum time, in seconds, to wait for the worker thread to finish.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout)
+        self.flush()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._pending.keys() | self._retries.keys())
+
+    def _enqueue(
+        self, document_cls: Type["Document"], document_id: DocumentID, operation: str
+    ):
+        with self._condition:
+            if self._stopped:
+                logger.warning(
+                    f"Deferred update queue is stopped, applying the {operation} of "
+                    f"{document_cls.__name__} {document_id} immediately."
+                )
+            else:
+                self._pending[(document_cls, document_id)] = operation
+                # The newer update replaces the failed one
+                self._retries.pop((document_cls, document_id), None)
+                if self._oldest_pending is None:
+                    self._oldest_pending = time.monotonic()
+                self._ensure_worker()
+                self._condition.notify_all()
+                return
+        self._process({(document_cls, document_id): operation})
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(
+            target=self._run, name="django-semantic-search-deferred", daemon=True
+        )
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped and not self._should_flush():
+                    self._condition.wait(timeout=self._time_to_flush())
+                if self._stopped:
+                    return
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def _should_flush(self) -> bool:
+        time_to_flush = self._time_to_flush()
+        if time_to_flush is None:
+            return False
+        return len(self._pending) >= self._batch_size or time_to_flush <= 0.0
+
+    def _time_to_flush(self) -> Optional[float]:
+        deadlines = [retry_at for _, _, retry_at in self._retries.values()]
+        if self._oldest_pending is not None:
+            deadlines.append(self._oldest_pending + self._flush_interval)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def _schedule_retries(
+        self,
+        failed: Dict[Tuple[Type["Document"], DocumentID], str],
+        attempts: Dict[Tuple[Type["Document"], DocumentID], int],
+    ):
+        """
+        Schedule the retries of the failed updates, or give up on them after the maximum number of retries.
+        :param failed: failed updates.
+        :param attempts: number of the previous failed attempts of the retried updates.
+        """
+        abandoned: Dict[Type["Document"], List[DocumentID]] = {}
+        with self._condition:
+            for key, operation in failed.items():
+                if key in self._pending:
+                    # A newer update of the instance was queued in the meantime
+                    continue
+                attempt = attempts.get(key, 0) + 1
+                if self._stopped or attempt > self._max_retries:
+                    document_cls, document_id = key
+                    abandoned.setdefault(document_cls, []).append(document_id)
+                    continue
+                retry_at = time.monotonic() + self._retry_backoff * 2 ** (attempt - 1)
+                self._retries[key] = (operation, attempt, retry_at)
+            if self._retries:
+                self._ensure_worker()
+                self._condition.notify_all()
+        for document_cls, document_ids in abandoned.items():
+            logger.error(
+                f"Giving up the deferred updates of {document_cls.__name__} {document_ids}, "
+                f"the documents have to be reindexed"
+            )
+
+    def _process(
+        self, pending: Dict[Tuple[Type["Document"], DocumentID], str]
+    ) -> Dict[Tuple[Type["Document"], DocumentID], str]:
+        """
+        Apply the pending updates, grouped by the document class.
+        :return: updates of the batches which failed.
+        """
+        failed = {}
+        grouped: Dict[Type["Document"], Dict[DocumentID, str]] = {}
+        for (document_cls, document_id), operation in pending.items():
+            grouped.setdefault(document_cls, {})[document_id] = operation
+
+        for document_cls, operations in grouped.items():
+            saved_ids = [pk for pk, op in operations.items() if op == SAVE]
+            deleted_ids = [pk for pk, op in operations.items() if op == DELETE]
+            try:
+                if saved_ids:
+                    queryset = document_cls.meta.model.objects.filter(pk__in=saved_ids)
+                    document_cls.objects.index(queryset, batch_size=self._batch_size)
+                if deleted_ids:
+                    document_cls.backend.bulk_delete(deleted_ids)
+            except Exception:
+                logger.exception(
+                    f"Failed to apply {len(operations)} deferred updates of {document_cls.__name__}"
+                )
+                failed.update(
+                    {
+                        (document_cls, document_id): operation
+                        for document_id, operation in operations.items()
+                    }
+                )
+            else:
+                logger.debug(
+                    f"Applied {len(saved_ids)} saves and {len(deleted_ids)} deletes of {document_cls.__name__}"
+                )
+        return failed
+
+
+def create_deferred_queue(**kwargs) -> DeferredUpdateQueue:
+    """
+    Create the deferred update queue and drain it when the process exits.
+    :param kwargs: configuration of the queue.
+    :return: queue instance.
+    """
+    queue = DeferredUpdateQueue(**kwargs)
+    atexit.register(queue.shutdown)
+    return queue
@@ -1,16 +1,47 @@
 import abc
+import dataclasses
+import hashlib
 import logging
-from typing import Dict, Generic, Iterable, List, Optional, Type, TypeVar
+import math
+import time
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist
 from django.db import models
 from django.db.models import QuerySet
 
 from django_semantic_search.backends.types import (
     Distance,
+    FilterCondition,
+    Fusion,
     IndexConfiguration,
+    PayloadFieldType,
+    Quantization,
+    QuantizationType,
+    SearchResult,
     VectorConfiguration,
 )
-from django_semantic_search.types import DocumentID, MetadataValue, Vector
+from django_semantic_search.embeddings.base import BaseEmbeddingModel
+from django_semantic_search.types import (
+    DocumentID,
+    MetadataValue,
+    Vector,
+    to_metadata_value,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -23,28 +54,46 @@ class VectorIndex:
     but also allows to surpass the default settings of django-semantic-search.
     """
 
-    # TODO: allow specifying the embedding model for the index
-
     def __init__(
         self,
         *fields: str,
         index_name: Optional[str] = None,
         distance: Distance = Distance.COSINE,
+        quantization: Union[Quantization, QuantizationType, str, None] = None,
+        dimensions: Optional[int] = None,
+        embedding_model: Union[str, BaseEmbeddingModel, None] = None,
     ):
         """
         :param fields: model fields to index together.
         :param index_name: name of the index to use in a backend. By default, it is the concatenation of the fields.
+        :param distance: distance metric to compare the vectors with.
+        :param quantization: quantization of the vectors, either its type ("scalar", "binary" or "product") or
+                             a `Quantization` instance with the detailed options. Disabled by default.
+        :param dimensions: number of the leading dimensions of the embeddings to keep. The truncated embeddings are
+                           normalized again. It only makes sense for the models trained with Matryoshka
+                           Representation Learning. By default, the full embeddings are used.
+        :param embedding_model: alias of the embedding model registered in the `embedding_models` setting, or
+                                the model instance itself. By default, the model from the `default_embeddings`
+                                setting is used. Models are loaded on the first use of the index.
         """
-        # Loading the default embedding model here, as otherwise it would create a circular import
-        from django_semantic_search.utils import load_embedding_model
-
         if len(fields) != 1:
             raise ValueError("Only single field indexes are supported at the moment.")
 
         self._fields: List[str] = list(fields)
         self._index_name = index_name or "_".join(fields)
         self._distance = distance
-        self._embedding_model = load_embedding_model()
+        self._quantization = Quantization.create(quantization)
+        self._dimensions = dimensions
+        if dimensions is not None and dimensions < 1:
+            raise ValueError(
+                f"Dimensions of the index {self._index_name} have to be positive, got {dimensions}."
+            )
+        self._embedding_model_alias: Optional[str] = None
+        self._embedding_model: Optional[BaseEmbeddingModel] = None
+        if isinstance(embedding_model, BaseEmbeddingModel):
+            self._set_embedding_model(embedding_model)
+        else:
+            self._embedding_model_alias = embedding_model
 
     def validate(self, model_cls: Type[models.Model]):
         """
@@ -65,6 +114,14 @@ class VectorIndex:
         """
         return field in self._fields
 
+    @property
+    def fields(self) -> List[str]:
+        """
+        Return the model fields used to create the embeddings.
+        :return: list of field names.
+        """
+        return self._fields
+
     @property
     def index_name(self) -> str:
         """
@@ -81,13 +138,75 @@ class VectorIndex:
         """
         return self._distance
 
+    @property
+    def quantization(self) -> Optional[Quantization]:
+        """
+        Return the quantization of the vectors in the index.
+        :return: quantization, or None if disabled.
+        """
+        return self._quantization
+
+    @property
+    def embedding_model(self) -> BaseEmbeddingModel:
+        """
+        Return the embedding model used by the index. The model is loaded on the first access.
+        :return: embedding model instance.
+        """
+        if self._embedding_model is None:
+            # Importing here, as otherwise it would create a circular import
+            from django_semantic_search.utils import load_embedding_model
+
+            self._set_embedding_model(load_embedding_model(self._embedding_model_alias))
+        return self._embedding_model
+
+    def _set_embedding_model(self, embedding_model: BaseEmbeddingModel):
+        """
+        Use the embedding model in the index, validating the number of dimensions against it.
+        """
+        if (
+            self._dimensions is not None
+            and self._dimensions > embedding_model.vector_size()
+        ):
+            raise ValueError(
+                f"Dimensions of the index {self._index_name} cannot exceed {embedding_model.vector_size()}, "
+                f"the size of the embedding model, got {self._dimensions}."
+            )
+        self._embedding_model = embedding_model
+
+    @property
+    def dimensions(self) -> Optional[int]:
+        """
+        Return the number of dimensions the embeddings are truncated to.
+        :return: number of dimensions, or None if the full embeddings are used.
+        """
+        return self._dimensions
+
     @property
     def vector_size(self) -> int:
         """
         Return the size of the individual embedding.
         :return: size of the embedding.
         """
-        return self._embedding_model.vector_size()
+        if self._dimensions is not None:
+            return self._dimensions
+        return self.embedding_model.vector_size()
+
+    def get_text(self, instance: models.Model) -> str:
+        """
+        Get the text to embed for the instance.
+        :param instance: model instance to get the text for.
+        :return: concatenated values of the indexed fields.
+        """
+        return " ".join(getattr(instance, field) for field in self._fields)
+
+    def get_content_hash(self, instance: models.Model) -> str:
+        """
+        Get the hash of the text to embed for the instance. It is used to detect whether the embedding has to be
+        recalculated after the instance is modified.
+        :param instance: model instance to get the hash for.
+        :return: SHA-256 hash of the text, in the hexadecimal format.
+        """
+        return hashlib.sha256(self.get_text(instance).encode()).hexdigest()
 
     def get_model_embedding(self, instance: models.Model) -> Vector:
         """
@@ -95,9 +214,17 @@ class VectorIndex:
         :param instance: model instance to get the embedding for.
         :return: embedding for the instance.
         """
-        return self._embedding_model.embed_document(
-            " ".join(getattr(instance, field) for field in self._fields)
-        )
+        return self.get_model_embeddings([instance])[0]
+
+    def get_model_embeddings(self, instances: List[models.Model]) -> List[Vector]:
+        """
+        Get the embeddings for multiple instances at once, using a single call to the embedding model. If the document
+        embeddings cache is enabled, only the texts missing in the cache are embedded.
+        :param instances: model instances to get the embeddings for.
+        :return: embeddings for the instances, in the same order as the instances.
+        """
+        texts = [self.get_text(instance) for instance in instances]
+        return [self._truncate(vector) for vector in self._embed_documents(texts)]
 
     def get_query_embedding(self, query: str) -> Vector:
         """
@@ -105,7 +232,105 @@ class VectorIndex:
         :param query: query to get the embedding for.
         :return: embedding for the query.
         """
-        return self._embedding_model.embed_query(query)
+        return self._truncate(self._embed_query(query))
+
+    def _embed_documents(self, texts: List[str]) -> List[Vector]:
+        """
+        Embed the texts with the embedding model, or load their full embeddings from the document embeddings cache.
+        """
+        from django_semantic_search.utils import load_document_embeddings_cache
+
+        document_cache = load_document_embeddings_cache()
+        if document_cache is None:
+            return self.embedding_model.embed_documents(texts)
+
+        model_identifier = self.embedding_model.identifier()
+        document_prompt = self.embedding_model.document_prompt
+        keys = [
+            (
+                model_identifier,
+                document_prompt,
+                hashlib.sha256(text.encode()).hexdigest(),
+            )
+            for text in texts
+        ]
+        # Vectors of a different size were stored by another model sharing the identifier, e.g. by the older versions
+        # of the library, so they are embedded again
+        vector_size = self.embedding_model.vector_size()
+        vectors = {
+            key: vector
+            for key, vector in document_cache.get_many(keys).items()
+            if len(vector) == vector_size
+        }
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            embedded = dict(
+                zip(
+                    missing.keys(),
+                    self.embedding_model.embed_documents(list(missing.values())),
+                )
+            )
+            document_cache.set_many(embedded)
+            vectors.update(embedded)
+        return [vectors[key] for key in keys]
+
+    def _embed_query(self, query: str) -> Vector:
+        """
+        Embed the query with the embedding model, or load its full embedding from the query embeddings cache.
+        """
+        from django_semantic_search.cache import normalize_query
+        from django_semantic_search.utils import load_query_embeddings_cache
+
+        query_cache = load_query_embeddings_cache()
+        if query_cache is None:
+            return self.embedding_model.embed_query(query)
+
+        # Queries differing only in whitespace share the cached embedding
+        key = (
+            self.embedding_model.identifier(),
+            self.embedding_model.query_prompt,
+            normalize_query(query),
+        )
+        vector = query_cache.get(key)
+        if vector is None:
+            vector = self.embedding_model.embed_query(query)
+            query_cache.set(key, vector)
+        return vector
+
+    def _truncate(self, vector: Vector) -> Vector:
+        """
+        Keep the configured number of the leading dimensions of the embedding, and normalize it again.
+        """
+        if self._dimensions is None:
+            return vector
+        truncated = [float(value) for value in vector[: self._dimensions]]
+        norm = math.sqrt(sum(value * value for value in truncated))
+        if norm == 0:
+            return truncated
+        return [value / norm for value in truncated]
+
+
+PAYLOAD_FIELD_TYPES = {
+    "AutoField": PayloadFieldType.INTEGER,
+    "BigAutoField": PayloadFieldType.INTEGER,
+    "SmallAutoField": PayloadFieldType.INTEGER,
+    "IntegerField": PayloadFieldType.INTEGER,
+    "BigIntegerField": PayloadFieldType.INTEGER,
+    "SmallIntegerField": PayloadFieldType.INTEGER,
+    "PositiveIntegerField": PayloadFieldType.INTEGER,
+    "PositiveBigIntegerField": PayloadFieldType.INTEGER,
+    "PositiveSmallIntegerField": PayloadFieldType.INTEGER,
+    "FloatField": PayloadFieldType.FLOAT,
+    "DecimalField": PayloadFieldType.FLOAT,
+    "BooleanField": PayloadFieldType.BOOLEAN,
+    "CharField": PayloadFieldType.KEYWORD,
+    "SlugField": PayloadFieldType.KEYWORD,
+    "EmailField": PayloadFieldType.KEYWORD,
+    "URLField": PayloadFieldType.KEYWORD,
+    "UUIDField": PayloadFieldType.KEYWORD,
+    "DateField": PayloadFieldType.DATETIME,
+    "DateTimeField": PayloadFieldType.DATETIME,
+}
 
 
 class MetaManager:
@@ -134,15 +359,31 @@ class IndexConfigurationManager:
             model_name = model.__name__ if model else None
             index_namespace = getattr(attr_meta, "namespace", model_name)
             indexes = getattr(attr_meta, "indexes", [])
+            payload_fields = {}
+            if model is not None:
+                for field_name, key in owner.metadata_keys().items():
+                    try:
+                        field = model._meta.get_field(field_name)
+                    except FieldDoesNotExist:
+                        # Properties and other attributes are stored, but not indexed for filtering
+                        continue
+                    if field.is_relation and field.concrete:
+                        # Foreign keys are stored as the primary keys of the related objects
+                        field = field.target_field
+                    field_type = PAYLOAD_FIELD_TYPES.get(field.get_internal_type())
+                    if field_type is not None:
+                        payload_fields[key] = field_type
             owner._index_configuration = IndexConfiguration(
                 namespace=index_namespace,
                 vectors={
                     index.index_name: VectorConfiguration(
                         size=index.vector_size,
                         distance=index.distance,
+                        quantization=index.quantization,
                     )
                     for index in indexes
                 },
+                payload_fields=payload_fields,
             )
         return owner._index_configuration
 
@@ -174,29 +415,326 @@ class DocumentManager(Generic[T]):
     def search(
         self,
         limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        fusion: Union[Fusion, str] = Fusion.RRF,
+        weights: Optional[Dict[str, float]] = None,
         **kwargs,
     ) -> QuerySet[T]:
         """
         Find the documents similar to the query in the vector index. If there are multiple indexes, the search is
         performed in all of them and the results are combined.
         :param limit: number of results to return.
+        :param filters: Django-style lookups on the metadata fields, e.g. `{"price__lt": 10, "in_stock": True}`.
+                        The filters are applied by the backend, so the results contain up to `limit` matching
+                        documents. Only the fields listed in `include_fields` might be used.
+        :param fusion: method of combining the results of multiple indexes, either "rrf" or "dbsf".
+        :param weights: weights of the indexes used in the fusion, keyed by the field name. Equal by default.
         :param kwargs: query parameters to restrict the search.
         :return:
         """
-        if len(kwargs) != 1:
-            raise ValueError("Only single field indexes are supported at the moment.")
+        fusion = Fusion(fusion)
+        queries = self._embed_queries(kwargs)
+        filter_conditions = self._build_filters(filters)
+        if len(queries) == 1:
+            ((index_name, query_embedding),) = queries.items()
+            queryset = self.cls.backend.search_queryset(
+                self.cls.meta.model.objects.all(),
+                index_name,
+                query_embedding,
+                limit=limit,
+                filters=filter_conditions,
+            )
+            if queryset is not None:
+                return queryset
+            document_ids = self.cls.backend.search(
+                index_name,
+                query_embedding,
+                limit=limit,
+                filters=filter_conditions,
+            )
+        else:
+            results = self.cls.backend.hybrid_search(
+                queries,
+                limit=limit,
+                fusion=fusion,
+                weights=self._index_weights(weights),
+                filters=filter_conditions,
+            )
+            document_ids = [result.id for result in results]
+        return self._ordered_queryset(document_ids)
+
+    async def asearch(
+        self,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        fusion: Union[Fusion, str] = Fusion.RRF,
+        weights: Optional[Dict[str, float]] = None,
+        **kwargs,
+    ) -> QuerySet[T]:
+        """
+        Asynchronous version of the `search` method. The query is embedded in the embedding executor, and the backend
+        is queried asynchronously. The returned queryset is lazy, so it should be evaluated with the asynchronous
+        iteration, e.g. `[instance async for instance in queryset]`.
+        """
+        from django_semantic_search.utils import run_in_embedding_executor
 
-        field_name, field_value = next(iter(kwargs.items()))
+        fusion = Fusion(fusion)
+        queries = await run_in_embedding_executor(self._embed_queries, kwargs)
+        filter_conditions = self._build_filters(filters)
+        if len(queries) == 1:
+            ((index_name, query_embedding),) = queries.items()
+            queryset = self.cls.backend.search_queryset(
+                self.cls.meta.model.objects.all(),
+                index_name,
+                query_embedding,
+                limit=limit,
+                filters=filter_conditions,
+            )
+            if queryset is not None:
+                return queryset
+            document_ids = await self.cls.backend.asearch(
+                index_name,
+                query_embedding,
+                limit=limit,
+                filters=filter_conditions,
+            )
+        else:
+            results = await self.cls.backend.ahybrid_search(
+                queries,
+                limit=limit,
+                fusion=fusion,
+                weights=self._index_weights(weights),
+                filters=filter_conditions,
+            )
+            document_ids = [result.id for result in results]
+        return self._ordered_queryset(document_ids)
+
+    def search_with_scores(
+        self,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        from_metadata: bool = False,
+        fusion: Union[Fusion, str] = Fusion.RRF,
+        weights: Optional[Dict[str, float]] = None,
+        **kwargs,
+    ) -> List[Tuple[T, float]]:
+        """
+        Find the documents similar to the query in the vector index, along with their similarity scores. Contrary to
+        the `search` method, the results are ordered in Python, so the database is queried without any custom ordering.
+        :param limit: number of results to return.
+        :param filters: Django-style lookups on the metadata fields, as in the `search` method.
+        :param from_metadata: if set, the model instances are created out of the metadata stored in the vector store,
+                              without querying the database at all. Only the fields listed in `include_fields` are
+                              populated, and they come back in their serialized form, e.g. dates as strings.
+        :param fusion: method of combining the results of multiple indexes, as in the `search` method.
+        :param weights: weights of the indexes used in the fusion, as in the `search` method.
+        :param kwargs: query parameters to restrict the search.
+        :return: list of the model instances and their scores, ordered from the most similar.
+        """
+        fusion = Fusion(fusion)
+        queries = self._embed_queries(kwargs)
+        filter_conditions = self._build_filters(filters)
+        if len(queries) == 1:
+            ((index_name, query_embedding),) = queries.items()
+            results = self.cls.backend.search_with_scores(
+                index_name,
+                query_embedding,
+                limit=limit,
+                filters=filter_conditions,
+                with_metadata=from_metadata,
+            )
+        else:
+            results = self.cls.backend.hybrid_search(
+                queries,
+                limit=limit,
+                fusion=fusion,
+                weights=self._index_weights(weights),
+                filters=filter_conditions,
+                with_metadata=from_metadata,
+            )
+        return self._hydrate(results, from_metadata=from_metadata)
+
+    async def asearch_with_scores(
+        self,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        from_metadata: bool = False,
+        fusion: Union[Fusion, str] = Fusion.RRF,
+        weights: Optional[Dict[str, float]] = None,
+        **kwargs,
+    ) -> List[Tuple[T, float]]:
+        """
+        Asynchronous version of the `search_with_scores` method.
+        """
+        from django_semantic_search.utils import run_in_embedding_executor
+
+        fusion = Fusion(fusion)
+        queries = await run_in_embedding_executor(self._embed_queries, kwargs)
+        filter_conditions = self._build_filters(filters)
+        if len(queries) == 1:
+            ((index_name, query_embedding),) = queries.items()
+            results = await self.cls.backend.asearch_with_scores(
+                index_name,
+                query_embedding,
+                limit=limit,
+                filters=filter_conditions,
+                with_metadata=from_metadata,
+            )
+        else:
+            results = await self.cls.backend.ahybrid_search(
+                queries,
+                limit=limit,
+                fusion=fusion,
+                weights=self._index_weights(weights),
+                filters=filter_conditions,
+                with_metadata=from_metadata,
+            )
+        if from_metadata or not results:
+            return self._hydrate(results, from_metadata=from_metadata)
+        instances = await self.cls.meta.model.objects.ain_bulk(
+            [result.id for result in results]
+        )
+        return self._order_instances(results, instances)
+
+    def _get_index(self, field_name: str) -> VectorIndex:
+        """
+        Find the vector index created for the field.
+        :param field_name: name of the model field.
+        :return: vector index.
+        """
         vector_index = next(
-            index for index in self.cls.meta.indexes if index.is_for_field(field_name)
+            (
+                index
+                for index in self.cls.meta.indexes
+                if index.is_for_field(field_name)
+            ),
+            None,
         )
         if vector_index is None:
             raise ValueError(f"No index found for field {field_name}")
+        return vector_index
 
-        query_embedding = vector_index.get_query_embedding(field_value)
-        document_ids = self.cls.backend.search(
-            vector_index.index_name, query_embedding, limit=limit
-        )
+    def _embed_queries(self, kwargs: Dict[str, str]) -> Dict[str, Vector]:
+        """
+        Select the vector indexes for the query parameters and embed the queries with them. The same query is only
+        embedded once per embedding model, even if it is used for multiple indexes.
+        :param kwargs: query parameters, mapping the field name to the query.
+        :return: query embeddings, keyed by the index name.
+        """
+        if not kwargs:
+            raise ValueError("At least one field has to be queried.")
+
+        embeddings: Dict[Tuple[int, Optional[int], str], Vector] = {}
+        queries = {}
+        for field_name, field_value in kwargs.items():
+            vector_index = self._get_index(field_name)
+            key = (
+                id(vector_index.embedding_model),
+                vector_index.dimensions,
+                field_value,
+            )
+            if key not in embeddings:
+                embeddings[key] = vector_index.get_query_embedding(field_value)
+            queries[vector_index.index_name] = embeddings[key]
+        return queries
+
+    def _index_weights(
+        self, weights: Optional[Dict[str, float]]
+    ) -> Optional[Dict[str, float]]:
+        """
+        Convert the weights keyed by the field name into the weights keyed by the index name.
+        :param weights: weights of the fields.
+        :return: weights of the indexes, or None if not provided.
+        """
+        if weights is None:
+            return None
+        return {
+            self._get_index(field_name).index_name: weight
+            for field_name, weight in weights.items()
+        }
+
+    def _build_filters(
+        self, filters: Optional[Dict[str, Any]]
+    ) -> Optional[List[FilterCondition]]:
+        """
+        Convert the Django-style lookups into the backend filter conditions.
+        :param filters: lookups, mapping to the values.
+        :return: list of the filter conditions, or None if there are no filters.
+        """
+        if not filters:
+            return None
+
+        metadata_keys = self.cls.metadata_keys()
+        conditions = []
+        for lookup, value in filters.items():
+            condition = FilterCondition.from_lookup(lookup, value)
+            if condition.field in metadata_keys:
+                # Foreign keys might be filtered by the field name, e.g. `category=1`
+                condition = dataclasses.replace(
+                    condition, field=metadata_keys[condition.field]
+                )
+            elif condition.field not in metadata_keys.values():
+                raise ValueError(
+                    f"Field {condition.field} is not included in the metadata of "
+                    f"{self.cls.__name__}, so it cannot be used in the filters."
+                )
+            conditions.append(condition)
+        return conditions
+
+    def _hydrate(
+        self, results: List[SearchResult], from_metadata: bool = False
+    ) -> List[Tuple[T, float]]:
+        """
+        Convert the search results into the model instances, keeping the order of the results.
+        :param results: search results returned by the backend.
+        :param from_metadata: if set, the instances are created out of the stored metadata.
+        :return: list of the model instances and their scores.
+        """
+        model = self.cls.meta.model
+        if from_metadata:
+            # Foreign keys are stored under their attribute names, e.g. `category_id`
+            attnames = {field.attname for field in model._meta.concrete_fields}
+            return [
+                (
+                    model(
+                        pk=result.id,
+                        **{
+                            attname: value
+                            for attname, value in result.metadata.items()
+                            if attname in attnames
+                        },
+                    ),
+                    result.score,
+                )
+                for result in results
+            ]
+
+        if not results:
+            return []
+        instances = model.objects.in_bulk([result.id for result in results])
+        return self._order_instances(results, instances)
+
+    def _order_instances(
+        self, results: List[SearchResult], instances: Dict[DocumentID, T]
+    ) -> List[Tuple[T, float]]:
+        """
+        Pair the fetched model instances with their scores, in the order of the search results.
+        :param results: search results returned by the backend.
+        :param instances: model instances, keyed by the primary key.
+        :return: list of the model instances and their scores.
+        """
+        return [
+            (instances[result.id], result.score)
+            for result in results
+            if result.id in instances
+        ]
+
+    def _ordered_queryset(self, document_ids: List[DocumentID]) -> QuerySet[T]:
+        """
+        Create a queryset of the model instances, ordered as the document IDs.
+        :param document_ids: IDs of the documents, ordered from the most relevant.
+        :return: ordered queryset.
+        """
         if not document_ids:
             return self.cls.meta.model.objects.none()
 
@@ -208,14 +746,123 @@ class DocumentManager(Generic[T]):
         )
         return queryset
 
-    def index(self, qs: QuerySet[T]):
+    def index(
+        self,
+        qs: QuerySet[T],
+        batch_size: int = 256,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
         """
-        Index the queryset of the model instances.
+        Index the queryset of the model instances. The queryset is iterated in chunks, each chunk is embedded with
+        a single call to the embedding model per vector index, and stored in the backend with a single bulk write.
         :param qs: queryset of the model instances to index.
+        :param batch_size: number of instances to process at once.
+        :param progress_callback: optional callable receiving the number of indexed instances and the total count.
+        :return: number of indexed instances.
         """
-        # TODO: this is the most basic implementation, it should be optimized
-        for instance in qs:
-            self.cls(instance).save()
+        if batch_size < 1:
+            raise ValueError("Batch size has to be a positive integer.")
+
+        total = qs.count()
+        indexed = 0
+        start_time = time.monotonic()
+        iterator = qs.iterator(chunk_size=batch_size)
+        while batch := list(islice(iterator, batch_size)):
+            self.cls.backend.bulk_save(self._create_documents(batch))
+            indexed += len(batch)
+            self._report_progress(indexed, total, start_time, progress_callback)
+        return indexed
+
+    async def aindex(
+        self,
+        qs: QuerySet[T],
+        batch_size: int = 256,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """
+        Asynchronous version of the `index` method. The embeddings are calculated in the embedding executor, while
+        the queryset is iterated and the documents are stored asynchronously.
+        :param qs: queryset of the model instances to index.
+        :param batch_size: number of instances to process at once.
+        :param progress_callback: optional callable receiving the number of indexed instances and the total count.
+        :return: number of indexed instances.
+        """
+        from django_semantic_search.utils import run_in_embedding_executor
+
+        if batch_size < 1:
+            raise ValueError("Batch size has to be a positive integer.")
+
+        total = await qs.acount()
+        indexed = 0
+        start_time = time.monotonic()
+        batch = []
+        async for instance in qs.aiterator(chunk_size=batch_size):
+            batch.append(instance)
+            if len(batch) < batch_size:
+                continue
+            documents = await run_in_embedding_executor(self._create_documents, batch)
+            await self.cls.backend.abulk_save(documents)
+            indexed += len(batch)
+            self._report_progress(indexed, total, start_time, progress_callback)
+            batch = []
+        if batch:
+            documents = await run_in_embedding_executor(self._create_documents, batch)
+            await self.cls.backend.abulk_save(documents)
+            indexed += len(batch)
+            self._report_progress(indexed, total, start_time, progress_callback)
+        return indexed
+
+    def _create_documents(
+        self, batch: List[T], vectors: Optional[Dict[str, List[Vector]]] = None
+    ) -> List["Document"]:
+        """
+        Create the documents for the batch of model instances, embedding the batch with a single call to the
+        embedding model per vector index.
+        :param batch: model instances to create the documents for.
+        :param vectors: embeddings of the batch calculated upfront with `_embed_batch`, if available.
+        :return: documents with precomputed vectors.
+        """
+        if vectors is None:
+            vectors = self._embed_batch(batch)
+        return [
+            self.cls(
+                instance,
+                vectors={
+                    index_name: index_vectors[i]
+                    for index_name, index_vectors in vectors.items()
+                },
+            )
+            for i, instance in enumerate(batch)
+        ]
+
+    def _embed_batch(self, batch: List[T]) -> Dict[str, List[Vector]]:
+        """
+        Embed the batch of model instances with a single call to the embedding model per vector index.
+        :param batch: model instances to embed.
+        :return: embeddings of the instances, keyed by the index name.
+        """
+        return {
+            index.index_name: index.get_model_embeddings(batch)
+            for index in self.cls.meta.indexes
+        }
+
+    def _report_progress(
+        self,
+        indexed: int,
+        total: int,
+        start_time: float,
+        progress_callback: Optional[Callable[[int, int], None]],
+    ):
+        """
+        Log the progress of the indexing and pass it to the callback, if provided.
+        """
+        elapsed = time.monotonic() - start_time
+        logger.info(
+            f"Indexed {indexed}/{total} instances of {self.cls.meta.model.__name__} "
+            f"({indexed / elapsed if elapsed else 0.0:.1f} instances/s)"
+        )
+        if progress_callback is not None:
+            progress_callback(indexed, total)
 
 
 class DocumentManagerDescriptor(Generic[T]):
@@ -293,24 +940,129 @@ class Document(abc.ABC, Generic[T]):
     backend = BackendManager()
     objects: DocumentManager = DocumentManagerDescriptor[T]()
 
-    def __init__(self, instance: T):
+    def __init__(self, instance: T, vectors: Optional[Dict[str, Vector]] = None):
+        """
+        :param instance: model instance the document is created for.
+        :param vectors: precomputed vectors of the document, keyed by the index name. If not provided, the vectors
+                        are calculated with the embedding models of the indexes.
+        """
         self._instance = instance
+        self._vectors = vectors
 
-    def save(self) -> None:
+    def save(
+        self, update_fields: Optional[Iterable[str]] = None, created: bool = False
+    ) -> None:
         """
-        Save the document in the vector store.
+        Save the document in the vector store. Embeddings are only calculated for the indexes whose source text has
+        changed since the document was stored. If none of them changed, only the metadata is updated.
+        :param update_fields: names of the modified model fields, if known. If none of the indexed or included fields
+                              were modified, the vector store is not updated at all.
+        :param created: if set, the model instance was just created, so the document is stored as a whole, without
+                        looking up the stored hashes.
+        """
+        if created:
+            self.backend.save(self)
+            return
+        if not self._has_tracked_changes(update_fields):
+            return
+
+        stored_hashes = self.backend.get_content_hashes(self.id)
+        changed_indexes = self._changed_indexes(stored_hashes)
+        if changed_indexes is None:
+            self.backend.save(self)
+            return
+
+        vectors = {
+            index.index_name: index.get_model_embedding(self._instance)
+            for index in changed_indexes
+        }
+        self.backend.partial_update(self, vectors)
+
+    async def asave(
+        self, update_fields: Optional[Iterable[str]] = None, created: bool = False
+    ) -> None:
+        """
+        Asynchronous version of the `save` method. The embeddings are calculated in the embedding executor, and the
+        texts of the instance are read in a synchronous thread, so they might query the database.
+        :param update_fields: names of the modified model fields, if known.
+        :param created: if set, the model instance was just created, so the stored hashes are not looked up.
+        """
+        from django_semantic_search.utils import run_in_embedding_executor
+
+        if created:
+            changed_indexes = None
+        elif not self._has_tracked_changes(update_fields):
+            return
+        else:
+            stored_hashes = await self.backend.aget_content_hashes(self.id)
+            changed_indexes = await sync_to_async(self._changed_indexes)(stored_hashes)
+        if changed_indexes is None:
+            self._vectors = await run_in_embedding_executor(self.vectors)
+            await self.backend.asave(self)
+            return
+
+        vectors = await run_in_embedding_executor(
+            lambda: {
+                index.index_name: index.get_model_embedding(self._instance)
+                for index in changed_indexes
+            }
+        )
+        await self.backend.apartial_update(self, vectors)
+
+    def delete(self) -> None:
+        """
+        Delete the document from the vector store.
+        """
+        self.backend.delete(self.id)
+
+    async def adelete(self) -> None:
+        """
+        Asynchronous version of the `delete` method.
+        """
+        await self.backend.adelete(self.id)
+
+    def _has_tracked_changes(self, update_fields: Optional[Iterable[str]]) -> bool:
+        """
+        Check if any of the indexed or included fields might have been modified.
+        :param update_fields: names of the modified model fields, if known.
+        :return: True if the document has to be updated, False otherwise.
         """
         if not self._instance.pk:
             raise ValueError(
                 "The model instance has to be saved before creating a document."
             )
-        self.backend.save(self)
 
-    def delete(self) -> None:
+        if update_fields is None:
+            return True
+        tracked_fields = set(self.include_fields())
+        for index in self.meta.indexes:
+            tracked_fields.update(index.fields)
+        if not tracked_fields.intersection(update_fields):
+            logger.debug(f"No tracked fields of {self._instance} were modified")
+            return False
+        return True
+
+    def _changed_indexes(
+        self, stored_hashes: Optional[Dict[str, str]]
+    ) -> Optional[List[VectorIndex]]:
         """
-        Delete the document from the vector store.
+        Compare the stored hashes of the embedded texts with the current ones.
+        :param stored_hashes: hashes stored in the backend, or None if the document is not stored.
+        :return: indexes whose text has changed, or None if the whole document has to be saved.
         """
-        self.backend.delete(self.id)
+        if stored_hashes is None:
+            return None
+
+        indexes = list(self.meta.indexes)
+        content_hashes = self.content_hashes()
+        changed_indexes = [
+            index
+            for index in indexes
+            if stored_hashes.get(index.index_name) != content_hashes[index.index_name]
+        ]
+        if len(changed_indexes) == len(indexes):
+            return None
+        return changed_indexes
 
     @property
     def id(self) -> DocumentID:
@@ -325,22 +1077,60 @@ class Document(abc.ABC, Generic[T]):
         Return the vectors for the document.
         :return: dictionary of the vectors.
         """
+        if self._vectors is not None:
+            return self._vectors
         return {
             index.index_name: index.get_model_embedding(self._instance)
             for index in self.meta.indexes
         }
 
-    def metadata(self) -> Dict[str, MetadataValue]:
+    def content_hashes(self) -> Dict[str, str]:
         """
-        Return the metadata for the document.
-        :return: dictionary of the metadata.
+        Return the hashes of the texts used to create the vectors of the document.
+        :return: dictionary of the hashes, keyed by the index name.
+        """
+        return {
+            index.index_name: index.get_content_hash(self._instance)
+            for index in self.meta.indexes
+        }
+
+    @classmethod
+    def include_fields(cls) -> List[str]:
+        """
+        Return the names of the model fields included in the metadata.
+        :return: list of field names.
         """
         include_fields = getattr(
-            self.meta, "include_fields", Document.Meta.include_fields
+            cls.meta, "include_fields", Document.Meta.include_fields
         )
         if "*" in include_fields:
-            include_fields = [field.name for field in self._instance._meta.fields]
-        return {field: getattr(self._instance, field) for field in include_fields}
+            include_fields = [field.name for field in cls.meta.model._meta.fields]
+        return include_fields
+
+    @classmethod
+    def metadata_keys(cls) -> Dict[str, str]:
+        """
+        Return the keys of the included fields in the metadata. Foreign keys are stored under their attribute names,
+        e.g. `category_id`, so the related objects are not loaded.
+        :return: dictionary of the metadata keys, keyed by the field names.
+        """
+        model_fields = {
+            field.name: field for field in cls.meta.model._meta.concrete_fields
+        }
+        return {
+            name: model_fields[name].attname if name in model_fields else name
+            for name in cls.include_fields()
+        }
+
+    def metadata(self) -> Dict[str, MetadataValue]:
+        """
+        Return the metadata for the document.
+        :return: dictionary of the metadata.
+        """
+        return {
+            key: to_metadata_value(getattr(self._instance, key))
+            for key in self.metadata_keys().values()
+        }
 
     class Meta:
         # The model this document is associated with
@@ -353,3 +1143,5 @@ class Document(abc.ABC, Generic[T]):
         include_fields: List[str] = ["*"]
         # Flag to disable signals on the model, so the documents are not updated on model changes
         disable_signals: bool = False
+        # Flag to apply the model changes in the background, in batches, after the transaction commits
+        deferred_signals: bool = False
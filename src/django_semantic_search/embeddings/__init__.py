@@ -1,3 +1,4 @@
+from .batching import MicroBatchingModel
 from .sentence_transformers import SentenceTransformerModel
 
-__all__ = ["SentenceTransformerModel"]
+__all__ = ["MicroBatchingModel", "SentenceTransformerModel"]
@@ -1,4 +1,5 @@
 import abc
+from typing import List, Optional
 
 from django_semantic_search.types import Vector
 
@@ -8,6 +9,15 @@ class BaseEmbeddingModel(abc.ABC):
     Base class for all the embedding models, such as sentence-transformers or 3rd party libraries.
     """
 
+    def identifier(self) -> str:
+        """
+        Return the identifier of the model. Models producing different embeddings for the same input should have
+        different identifiers, as the identifier is used as a part of the cache keys. By default, it is the class path,
+        so the models with configurable behaviour should override it, including their configuration.
+        :return: identifier of the model.
+        """
+        return f"{self.__class__.__module__}.{self.__class__.__qualname__}"
+
     def vector_size(self) -> int:
         """
         Return the size of the individual embedding.
@@ -21,6 +31,22 @@ class TextEmbeddingMixin:
     Mixin class for all the text embedding models.
     """
 
+    @property
+    def document_prompt(self) -> Optional[str]:
+        """
+        Return the prompt used for the documents, if any.
+        :return: document prompt.
+        """
+        return None
+
+    @property
+    def query_prompt(self) -> Optional[str]:
+        """
+        Return the prompt used for the queries, if any.
+        :return: query prompt.
+        """
+        return None
+
     def embed_document(self, document: str) -> Vector:
         """
         Embed a document into a vector.
@@ -29,6 +55,15 @@ class TextEmbeddingMixin:
         """
         raise NotImplementedError
 
+    def embed_documents(self, documents: List[str]) -> List[Vector]:
+        """
+        Embed multiple documents into vectors. Subclasses should override this method if the underlying model
+        supports batching, as the default implementation embeds the documents one by one.
+        :param documents: documents to embed.
+        :return: document embeddings, in the same order as the documents.
+        """
+        return [self.embed_document(document) for document in documents]
+
     def embed_query(self, query: str) -> Vector:
         """
         Embed a query into a vector.
@@ -36,3 +71,12 @@ class TextEmbeddingMixin:
         :return: query embedding.
         """
         raise NotImplementedError
+
+    def embed_queries(self, queries: List[str]) -> List[Vector]:
+        """
+        Embed multiple queries into vectors. Subclasses should override this method if the underlying model
+        supports batching, as the default implementation embeds the queries one by one.
+        :param queries: queries to embed.
+        :return: query embeddings, in the same order as the queries.
+        """
+        return [self.embed_query(query) for query in queries]
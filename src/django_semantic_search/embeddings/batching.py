@@ -0,0 +1,165 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple, Type, Union
+
+from django.utils.module_loading import import_string
+
+from django_semantic_search.embeddings.base import (
+    BaseEmbeddingModel,
+    TextEmbeddingMixin,
+)
+from django_semantic_search.types import Vector
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatchingModel(BaseEmbeddingModel, TextEmbeddingMixin):
+    """
+    Wrapper around another text embedding model, which groups the queries embedded concurrently by multiple threads
+    into a single batch. The queries arriving within a short time window, or up to the maximum batch size, are
+    embedded with a single call to the wrapped model, and the results are handed back to each of the callers.
+
+    It improves the throughput of the models that benefit from batching, such as sentence-transformers, when many
+    request threads search at the same time. Documents are passed to the wrapped model directly, as they are already
+    embedded in batches when indexing.
+
+    **Usage:**
+
+    ```python title="settings.py"
+    SEMANTIC_SEARCH = {
+        "default_embeddings": {
+            "model": "django_semantic_search.embeddings.MicroBatchingModel",
+            "configuration": {
+                "model": "django_semantic_search.embeddings.SentenceTransformerModel",
+                "configuration": {
+                    "model_name": "sentence-transformers/all-MiniLM-L6-v2",
+                },
+                "max_batch_size": 32,
+                "max_wait": 0.003,
+            },
+        },
+        ...
+    }
+    ```
+    """
+
+    def __init__(
+        self,
+        model: Union[str, Type[BaseEmbeddingModel]],
+        configuration: Optional[dict] = None,
+        max_batch_size: int = 32,
+        max_wait: float = 0.003,
+        timeout: Optional[float] = 60.0,
+    ):
+        """
+        :param model: either the path to the wrapped embedding model class or the class itself.
+        :param configuration: configuration passed to the wrapped model class during initialization.
+        :param max_batch_size: maximum number of the queries embedded at once.
+        :param max_wait: maximum time, in seconds, the first query of a batch waits for the other ones.
+        :param timeout: maximum time, in seconds, a query waits for its embedding, or None to wait indefinitely.
+        """
+        if max_batch_size < 1:
+            raise ValueError("Maximum batch size has to be a positive integer.")
+
+        if isinstance(model, str):
+            model = import_string(model)
+        self._model = model(**(configuration or {}))
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._timeout = timeout
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_pid: Optional[int] = None
+
+    def identifier(self) -> str:
+        return self._model.identifier()
+
+    @property
+    def document_prompt(self) -> Optional[str]:
+        return self._model.document_prompt
+
+    @property
+    def query_prompt(self) -> Optional[str]:
+        return self._model.query_prompt
+
+    def vector_size(self) -> int:
+        return self._model.vector_size()
+
+    def embed_document(self, document: str) -> Vector:
+        return self._model.embed_document(document)
+
+    def embed_documents(self, documents: List[str]) -> List[Vector]:
+        return self._model.embed_documents(documents)
+
+    def embed_query(self, query: str) -> Vector:
+        """
+        Embed a query into a vector. The query is embedded together with the other queries submitted concurrently.
+        :param query: query to embed.
+        :return: query embedding.
+        :raises TimeoutError: if the query is not embedded within the timeout.
+        """
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((query, future))
+        return future.result(timeout=self._timeout)
+
+    def embed_queries(self, queries: List[str]) -> List[Vector]:
+        return self._model.embed_queries(queries)
+
+    def _worker_running(self) -> bool:
+        # The worker thread does not survive forking, so it is started again in the child process
+        return (
+            self._worker is not None
+            and self._worker_pid == os.getpid()
+            and self._worker.is_alive()
+        )
+
+    def _ensure_worker(self):
+        if self._worker_running():
+            return
+        with self._lock:
+            if self._worker_running():
+                return
+            if self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+            self._worker = threading.Thread(
+                target=self._run, name="django-semantic-search-batching", daemon=True
+            )
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def _run(self):
+        pending = self._queue
+        while True:
+            batch = [pending.get()]
+            try:
+                deadline = time.monotonic() + self._max_wait
+                while len(batch) < self._max_batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(pending.get(timeout=timeout))
+                    except queue.Empty:
+                        break
+                self._process(batch)
+            except BaseException as e:
+                logger.exception(f"Failed to embed a batch of {len(batch)} queries")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                # The worker is started again by the next query
+                if not isinstance(e, Exception):
+                    raise
+
+    def _process(self, batch: List[Tuple[str, Future]]):
+        # Identical queries submitted at the same time are embedded once
+        queries = list(dict.fromkeys(query for query, _ in batch))
+        vectors = dict(zip(queries, self._model.embed_queries(queries)))
+        for query, future in batch:
+            future.set_result(vectors[query])
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from django_semantic_search.embeddings.base import (
     BaseEmbeddingModel,
@@ -52,6 +52,23 @@ class SentenceTransformerModel(BaseEmbeddingModel, TextEmbeddingMixin):
         ...
     }
     ```
+
+    Documents and queries passed in bulk are encoded in batches. The size of the batches can be adjusted with the
+    `batch_size` parameter. Sentence-transformers sorts the inputs by their length before splitting them into batches,
+    so texts of similar length are padded together.
+
+    ```python title="settings.py"
+    SEMANTIC_SEARCH = {
+        "default_embeddings": {
+            "model": "django_semantic_search.embeddings.SentenceTransformerModel",
+            "configuration": {
+                "model_name": "sentence-transformers/all-MiniLM-L6-v2",
+                "batch_size": 64,
+            },
+        },
+        ...
+    }
+    ```
     """
 
     def __init__(
@@ -59,6 +76,7 @@ class SentenceTransformerModel(BaseEmbeddingModel, TextEmbeddingMixin):
         model_name: str,
         document_prompt: Optional[str] = None,
         query_prompt: Optional[str] = None,
+        batch_size: int = 32,
     ):
         """
         Initialize the sentence-transformers model.
@@ -70,12 +88,38 @@ class SentenceTransformerModel(BaseEmbeddingModel, TextEmbeddingMixin):
         :param model_name: name of the model to use.
         :param document_prompt: prompt to use for the document, defaults to None.
         :param query_prompt: prompt to use for the query, defaults to None.
+        :param batch_size: number of texts encoded at once when embedding in bulk, defaults to 32.
         """
         from sentence_transformers import SentenceTransformer
 
         self._model = SentenceTransformer(model_name)
         self._document_prompt = document_prompt
         self._query_prompt = query_prompt
+        self._batch_size = batch_size
+        self._model_name = model_name
+
+    def identifier(self) -> str:
+        """
+        Return the identifier of the model.
+        :return: name of the sentence-transformers model.
+        """
+        return self._model_name
+
+    @property
+    def document_prompt(self) -> Optional[str]:
+        """
+        Return the prompt used for the documents, if any.
+        :return: document prompt.
+        """
+        return self._document_prompt
+
+    @property
+    def query_prompt(self) -> Optional[str]:
+        """
+        Return the prompt used for the queries, if any.
+        :return: query prompt.
+        """
+        return self._query_prompt
 
     def vector_size(self) -> int:
         """
@@ -92,6 +136,14 @@ class SentenceTransformerModel(BaseEmbeddingModel, TextEmbeddingMixin):
         """
         return self._model.encode(document, prompt=self._document_prompt).tolist()
 
+    def embed_documents(self, documents: List[str]) -> List[Vector]:
+        """
+        Embed multiple documents into vectors, in batches.
+        :param documents: documents to embed.
+        :return: document embeddings, in the same order as the documents.
+        """
+        return self._encode(documents, prompt=self._document_prompt)
+
     def embed_query(self, query: str) -> Vector:
         """
         Embed a query into a vector.
@@ -99,3 +151,24 @@ class SentenceTransformerModel(BaseEmbeddingModel, TextEmbeddingMixin):
         :return: query embedding.
         """
         return self._model.encode(query, prompt=self._query_prompt).tolist()
+
+    def embed_queries(self, queries: List[str]) -> List[Vector]:
+        """
+        Embed multiple queries into vectors, in batches.
+        :param queries: queries to embed.
+        :return: query embeddings, in the same order as the queries.
+        """
+        return self._encode(queries, prompt=self._query_prompt)
+
+    def _encode(self, texts: List[str], prompt: Optional[str]) -> List[Vector]:
+        """
+        Encode the texts with the model, in batches.
+        :param texts: texts to encode.
+        :param prompt: prompt to prepend to each of the texts.
+        :return: embeddings of the texts.
+        """
+        if not texts:
+            return []
+        return self._model.encode(
+            texts, prompt=prompt, batch_size=self._batch_size
+        ).tolist()
@@ -0,0 +1,162 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from django_semantic_search import registry
+from django_semantic_search.reindex import Checkpoint, document_path, reindex, resync
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the vector index of the document from all the instances of its model. The rows are split into "
+        "primary key ranges, embedded by a pool of worker processes and stored by a single uploader."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "document",
+            help="Name of the registered document class, or the dotted path to it, "
+            "e.g. products.documents.ProductDocument",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of the worker processes embedding the rows. Defaults to the number of CPUs. "
+            "With 0, the rows are embedded in the command process.",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=None,
+            help="Number of the primary key ranges. Defaults to four times the number of workers.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=256,
+            help="Number of rows fetched, embedded and stored at once.",
+        )
+        parser.add_argument(
+            "--queue-size",
+            type=int,
+            default=None,
+            help="Maximum number of the embedded batches waiting for the upload. Defaults to twice the number of "
+            "workers.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help="Path of the checkpoint file. If the file exists, the reindexing is resumed from it.",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Store the documents in a new version of the collection, and switch to it once all of them are "
+            "stored, so the search keeps working with the current version in the meantime.",
+        )
+
+    def handle(self, *args, **options):
+        document_cls = self._get_document(options["document"])
+
+        backend = document_cls.backend
+        if options["rebuild"] and not hasattr(backend, "rebuild"):
+            raise CommandError(
+                f"Backend {backend.__class__.__name__} does not support rebuilding."
+            )
+
+        # The rows stored before resuming do not count to the throughput
+        resumed = 0
+        if options["checkpoint"] is not None:
+            try:
+                checkpoint = Checkpoint.load(
+                    options["checkpoint"], document_path(document_cls)
+                )
+            except ValueError as e:
+                raise CommandError(str(e))
+            if (
+                checkpoint is not None
+                and options["rebuild"]
+                and backend.pending_rebuild() is None
+            ):
+                # The checkpoint refers to the collection which is not being rebuilt anymore
+                self.stdout.write(
+                    self.style.WARNING("No unfinished rebuild, starting from scratch")
+                )
+                checkpoint.remove()
+                checkpoint = None
+            if checkpoint is not None:
+                resumed = checkpoint.indexed
+                self.stdout.write(f"Resuming after {resumed} stored rows")
+
+        start_time = time.monotonic()
+        last_report = 0.0
+
+        def report_progress(indexed: int, total: int):
+            nonlocal last_report
+            now = time.monotonic()
+            if now - last_report < 1.0 and indexed < total:
+                return
+            last_report = now
+            elapsed = now - start_time
+            # The clock might not advance between the first reports
+            rate = (indexed - resumed) / elapsed if elapsed > 0 else 0.0
+            remaining = (
+                timedelta(seconds=round(max(total - indexed, 0) / rate))
+                if rate
+                else "unknown"
+            )
+            self.stdout.write(
+                f"Indexed {indexed}/{total} rows ({rate:.1f} rows/s, remaining {remaining})"
+            )
+
+        def run(target_backend=None) -> int:
+            return reindex(
+                document_cls,
+                workers=options["workers"],
+                num_shards=options["shards"],
+                batch_size=options["batch_size"],
+                queue_size=options["queue_size"],
+                checkpoint_path=options["checkpoint"],
+                progress_callback=report_progress,
+                backend=target_backend,
+            )
+
+        try:
+            if options["rebuild"]:
+                result = {}
+                collection_name = backend.rebuild(
+                    lambda target_backend: result.update(indexed=run(target_backend)),
+                    resume=resumed > 0,
+                    resync=lambda target_backend, document_ids: resync(
+                        document_cls, document_ids, target_backend
+                    ),
+                )
+                indexed = result["indexed"]
+                self.stdout.write(f"Switched to the collection {collection_name}")
+            else:
+                indexed = run()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        elapsed = timedelta(seconds=round(time.monotonic() - start_time))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reindexed {indexed} rows of {document_cls.__name__} in {elapsed}"
+            )
+        )
+
+    def _get_document(self, name: str):
+        if "." in name:
+            try:
+                return import_string(name)
+            except ImportError as e:
+                raise CommandError(f"Could not import {name}: {e}")
+
+        registry.autodiscover()
+        for document_cls in registry.get_documents():
+            if document_cls.__name__ == name:
+                return document_cls
+        raise CommandError(f"Document {name} is not registered.")
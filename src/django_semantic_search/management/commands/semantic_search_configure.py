@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from django_semantic_search import registry
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the collections of the documents in the vector store, unless they exist. By default, all the documents "
+        "defined in the documents modules of the installed apps are configured."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "documents",
+            nargs="*",
+            help="Dotted paths to the document classes, e.g. products.documents.ProductDocument",
+        )
+        parser.add_argument(
+            "--migrate-to-alias",
+            action="store_true",
+            help="Move the unversioned collections, created by the older versions of the library, behind the aliases "
+            "named after the namespaces, so they might be rebuilt without downtime.",
+        )
+
+    def handle(self, *args, **options):
+        if options["documents"]:
+            documents = []
+            for document_path in options["documents"]:
+                try:
+                    documents.append(import_string(document_path))
+                except ImportError as e:
+                    raise CommandError(f"Could not import {document_path}: {e}")
+        else:
+            registry.autodiscover()
+            documents = registry.get_documents()
+
+        if not documents:
+            self.stdout.write(self.style.WARNING("No documents found."))
+            return
+
+        for document_cls in documents:
+            # Backends configure the vector store when they are created
+            backend = document_cls.backend
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Configured {document_cls.index_configuration.namespace} "
+                    f"for {document_cls.__name__} with {backend.__class__.__name__}"
+                )
+            )
+            if options["migrate_to_alias"] and hasattr(backend, "migrate_to_alias"):
+                collection_name = backend.migrate_to_alias()
+                if collection_name is not None:
+                    self.stdout.write(f"  Migrated to the collection {collection_name}")
+            # Backends validating the existing collections report the differences from the configuration
+            for change in getattr(backend, "schema_changes", []):
+                if change.destructive:
+                    self.stdout.write(
+                        self.style.ERROR(
+                            f"  {change.description}. Rebuild the collection with "
+                            f"`semantic_reindex {document_cls.__name__} --rebuild`."
+                        )
+                    )
+                else:
+                    self.stdout.write(
+                        self.style.WARNING(f"  {change.description}. Fixed.")
+                    )
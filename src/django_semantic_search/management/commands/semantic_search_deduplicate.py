@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove the duplicated points from the vector store, created by the older versions of django-semantic-search "
+        "which used random point IDs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "documents",
+            nargs="+",
+            help="Dotted paths to the document classes, e.g. products.documents.ProductDocument",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=256,
+            help="Number of points to process at once.",
+        )
+
+    def handle(self, *args, **options):
+        for document_path in options["documents"]:
+            try:
+                document_cls = import_string(document_path)
+            except ImportError as e:
+                raise CommandError(f"Could not import {document_path}: {e}")
+
+            backend = document_cls.backend
+            if not hasattr(backend, "deduplicate"):
+                raise CommandError(
+                    f"Backend {backend.__class__.__name__} does not support deduplication."
+                )
+
+            processed = backend.deduplicate(batch_size=options["batch_size"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Processed {processed} legacy points for {document_path}"
+                )
+            )
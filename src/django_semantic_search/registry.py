@@ -0,0 +1,63 @@
+import logging
+import threading
+from typing import List, Optional, Type
+
+from django.utils.module_loading import autodiscover_modules
+
+from django_semantic_search.documents import Document
+
+logger = logging.getLogger(__name__)
+
+_documents: List[Type[Document]] = []
+_documents_lock = threading.Lock()
+
+
+def register(document_cls: Type[Document]):
+    """
+    Add the document class to the registry, so it is known to the warm-up and the management commands.
+    :param document_cls: document class to add.
+    """
+    with _documents_lock:
+        if document_cls not in _documents:
+            _documents.append(document_cls)
+
+
+def get_documents() -> List[Type[Document]]:
+    """
+    Return all the registered document classes, in the order of registration.
+    :return: list of the document classes.
+    """
+    with _documents_lock:
+        return list(_documents)
+
+
+def autodiscover():
+    """
+    Import the `documents` module of each installed app, so all the documents defined there get registered.
+    """
+    autodiscover_modules("documents")
+
+
+def warm_up(documents: Optional[List[Type[Document]]] = None, embed_query: bool = True):
+    """
+    Load the embedding models and the backends of the documents upfront. Both are loaded lazily on the first use by
+    default, so the management commands start quickly and do not require the vector store to be available. Web workers
+    may call this function at startup, e.g. in the `wsgi.py` file, so the first request does not pay for it.
+    :param documents: document classes to warm up. By default, all the documents discovered in the installed apps.
+    :param embed_query: if set, a sample query is embedded with each model, to initialize its runtime as well.
+    """
+    if documents is None:
+        autodiscover()
+        documents = get_documents()
+
+    warmed_up_models = set()
+    for document_cls in documents:
+        for index in document_cls.meta.indexes:
+            model = index.embedding_model
+            if embed_query and id(model) not in warmed_up_models:
+                model.embed_query("warm up")
+            warmed_up_models.add(id(model))
+        backend = document_cls.backend
+        logger.info(
+            f"Warmed up {document_cls.__name__} with backend {backend.__class__.__name__}"
+        )
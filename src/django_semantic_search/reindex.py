@@ -0,0 +1,415 @@
+import json
+import logging
+import math
+import os
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.module_loading import import_string
+
+from django_semantic_search.backends.base import BaseVectorSearchBackend
+from django_semantic_search.documents import Document
+from django_semantic_search.types import Vector
+
+logger = logging.getLogger(__name__)
+
+# Document class loaded by the worker process
+_worker_document: Optional[Type[Document]] = None
+
+
+class Shard:
+    """
+    Range of the primary keys processed as a single stream of batches. The lower bound is exclusive and moves
+    forward as the batches of the shard get stored, so the shard can be resumed from the last stored batch.
+    """
+
+    def __init__(self, after: Any = None, upper: Any = None, done: bool = False):
+        """
+        :param after: primary key after which the remaining rows of the shard start, or None for the first shard.
+        :param upper: primary key of the last row of the shard, inclusive, or None for the last shard.
+        :param done: whether all the rows of the shard are stored.
+        """
+        self.after = after
+        self.upper = upper
+        self.done = done
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"after": self.after, "upper": self.upper, "done": self.done}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Shard":
+        return cls(data["after"], data["upper"], data["done"])
+
+
+def document_path(document_cls: Type[Document]) -> str:
+    """
+    Return the dotted path the document class can be imported from.
+    """
+    return f"{document_cls.__module__}.{document_cls.__qualname__}"
+
+
+def create_shards(qs: QuerySet, num_shards: int) -> List[Shard]:
+    """
+    Split the queryset into shards of roughly the same number of rows, by the ranges of the primary keys.
+    :param qs: queryset to split.
+    :param num_shards: maximum number of shards.
+    :return: list of the shards, ordered by the primary key.
+    """
+    if num_shards < 1:
+        raise ValueError("Number of shards has to be a positive integer.")
+
+    total = qs.count()
+    shard_size = max(1, math.ceil(total / num_shards))
+    pks = qs.order_by("pk").values_list("pk", flat=True)
+    boundaries = [
+        pks[offset] for offset in range(shard_size - 1, total - 1, shard_size)
+    ]
+    lower_bounds = [None, *boundaries]
+    upper_bounds = [*boundaries, None]
+    return [Shard(after, upper) for after, upper in zip(lower_bounds, upper_bounds)]
+
+
+class Checkpoint:
+    """
+    State of the reindexing stored in a JSON file, so the reindexing can be resumed after a crash. The file is
+    replaced atomically, so it always contains the state after one of the stored batches.
+    """
+
+    def __init__(self, path: str, document: str, shards: List[Shard], indexed: int = 0):
+        """
+        :param path: path of the checkpoint file.
+        :param document: dotted path of the reindexed document class.
+        :param shards: shards of the reindexed queryset.
+        :param indexed: number of the rows already stored.
+        """
+        self.path = path
+        self.document = document
+        self.shards = shards
+        self.indexed = indexed
+
+    @classmethod
+    def load(cls, path: str, document: str) -> Optional["Checkpoint"]:
+        """
+        Load the checkpoint from the file, if it exists and was created for the same document.
+        :param path: path of the checkpoint file.
+        :param document: dotted path of the reindexed document class.
+        :return: checkpoint, or None if there is nothing to resume.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path) as fp:
+            data = json.load(fp)
+        if data["document"] != document:
+            raise ValueError(
+                f"Checkpoint {path} was created for {data['document']}, not for {document}."
+            )
+        return cls(
+            path,
+            document,
+            [Shard.from_dict(shard) for shard in data["shards"]],
+            data["indexed"],
+        )
+
+    def save(self):
+        data = {
+            "document": self.document,
+            "shards": [shard.to_dict() for shard in self.shards],
+            "indexed": self.indexed,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(data, fp, cls=DjangoJSONEncoder)
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _init_worker(path: str):
+    """
+    Set up Django and load the embedding models of the document once per worker process.
+    """
+    global _worker_document
+
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+    _worker_document = import_string(path)
+    for index in _worker_document.meta.indexes:
+        index.embedding_model  # noqa: B018
+
+
+def _start_worker():
+    """
+    Task without any work, submitted to start the worker processes of the pool.
+    """
+
+
+def _embed_shard_batch(
+    shard: Shard, batch_size: int, document_cls: Optional[Type[Document]] = None
+) -> Tuple[list, Dict[str, List[Vector]]]:
+    """
+    Fetch the next batch of the shard and embed it.
+    :param shard: shard to fetch the batch from.
+    :param batch_size: maximum number of rows in the batch.
+    :param document_cls: document class, defaults to the one loaded by the worker process.
+    :return: model instances of the batch and their embeddings, keyed by the index name.
+    """
+    document_cls = document_cls or _worker_document
+    qs = document_cls.meta.model._default_manager.order_by("pk")
+    if shard.after is not None:
+        qs = qs.filter(pk__gt=shard.after)
+    if shard.upper is not None:
+        qs = qs.filter(pk__lte=shard.upper)
+    batch = list(qs[:batch_size])
+    if not batch:
+        return batch, {}
+    return batch, document_cls.objects._embed_batch(batch)
+
+
+class _InlineExecutor:
+    """
+    Executor running the tasks in the calling thread, used when no worker processes are requested.
+    """
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        pass
+
+
+def reindex(
+    document_cls: Type[Document],
+    workers: Optional[int] = None,
+    num_shards: Optional[int] = None,
+    batch_size: int = 256,
+    queue_size: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    backend: Optional[BaseVectorSearchBackend] = None,
+) -> int:
+    """
+    Reindex all the instances of the document model. The primary key range is split into shards, which are
+    fetched and embedded in batches by a pool of worker processes, each of them loading the embedding models once.
+    The embedded batches are stored by a single uploader thread, fed through a bounded queue, so the workers pause
+    if the vector store cannot keep up.
+    :param document_cls: document class to reindex.
+    :param workers: number of the worker processes, defaults to the number of CPUs. With 0, the batches are embedded
+                    in the calling process.
+    :param num_shards: number of the primary key ranges, defaults to four times the number of workers.
+    :param batch_size: number of rows fetched, embedded and stored at once.
+    :param queue_size: maximum number of the embedded batches waiting for the upload, defaults to twice the number
+                       of workers.
+    :param checkpoint_path: optional path of the checkpoint file. If it exists, the reindexing is resumed from it,
+                            and it is removed once the reindexing completes.
+    :param progress_callback: optional callable receiving the number of the stored rows and the total count.
+    :param backend: backend to store the documents in, defaults to the backend of the document class.
+    :return: number of the stored rows, including the ones stored before resuming.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size has to be a positive integer.")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    concurrency = max(workers, 1)
+    num_shards = num_shards or 4 * concurrency
+    queue_size = queue_size or 2 * concurrency
+
+    path = document_path(document_cls)
+    qs = document_cls.meta.model._default_manager.all()
+    total = qs.count()
+    checkpoint = None
+    if checkpoint_path is not None:
+        checkpoint = Checkpoint.load(checkpoint_path, path)
+    if checkpoint is None:
+        checkpoint = Checkpoint(checkpoint_path, path, create_shards(qs, num_shards))
+    else:
+        logger.info(f"Resuming the reindexing of {path} from {checkpoint_path}")
+
+    if workers == 0:
+        executor = _InlineExecutor()
+        task_args = (document_cls,)
+    else:
+        # Connections must not be shared with the forked worker processes
+        connections.close_all()
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(path,)
+        )
+        # The pool starts the worker processes on the first submitted task, so they are forked before the backend
+        # opens any connections and before the uploader thread is started
+        executor.submit(_start_worker).result()
+        task_args = ()
+
+    uploads: queue.Queue = queue.Queue(maxsize=queue_size)
+    uploader = _Uploader(
+        document_cls,
+        backend or document_cls.backend,
+        checkpoint,
+        uploads,
+        total,
+        progress_callback,
+    )
+    uploader.start()
+
+    pending: Dict[Future, Shard] = {}
+    try:
+        for shard in list(checkpoint.shards):
+            if not shard.done:
+                pending[
+                    executor.submit(_embed_shard_batch, shard, batch_size, *task_args)
+                ] = shard
+            # Only a limited number of shards is processed at once
+            while len(pending) >= concurrency:
+                _process_completed(
+                    pending, executor, uploads, uploader, batch_size, task_args
+                )
+        while pending:
+            _process_completed(
+                pending, executor, uploads, uploader, batch_size, task_args
+            )
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        uploader.stop()
+        raise
+    executor.shutdown()
+    uploader.stop()
+    uploader.raise_error()
+
+    if checkpoint_path is not None:
+        checkpoint.remove()
+    return checkpoint.indexed
+
+
+def resync(
+    document_cls: Type[Document],
+    document_ids: List[Any],
+    backend: Optional[BaseVectorSearchBackend] = None,
+):
+    """
+    Store the current state of the documents, and delete the ones whose model instances do not exist anymore. It is
+    used to synchronize the documents modified while the index was rebuilt.
+    :param document_cls: document class of the documents.
+    :param document_ids: IDs of the documents to synchronize.
+    :param backend: backend to store the documents in, defaults to the backend of the document class.
+    """
+    backend = backend or document_cls.backend
+    instances = document_cls.meta.model._default_manager.in_bulk(document_ids)
+    if instances:
+        backend.bulk_save(
+            document_cls.objects._create_documents(list(instances.values()))
+        )
+    # The IDs stored in the vector store might have a different type than the primary keys, e.g. for UUIDs
+    existing = {str(pk) for pk in instances}
+    removed = [
+        document_id for document_id in document_ids if str(document_id) not in existing
+    ]
+    if removed:
+        backend.bulk_delete(removed)
+
+
+def _process_completed(
+    pending: Dict[Future, Shard],
+    executor,
+    uploads: queue.Queue,
+    uploader: "_Uploader",
+    batch_size: int,
+    task_args: tuple,
+):
+    """
+    Wait for any of the embedded batches, pass it to the uploader and request the next batch of the same shard.
+    """
+    completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in completed:
+        shard = pending.pop(future)
+        batch, vectors = future.result()
+        done = len(batch) < batch_size
+        next_shard = Shard(batch[-1].pk if batch else shard.after, shard.upper, done)
+        uploader.put((shard, next_shard, batch, vectors))
+        if not done:
+            pending[
+                executor.submit(_embed_shard_batch, next_shard, batch_size, *task_args)
+            ] = next_shard
+
+
+class _Uploader(threading.Thread):
+    """
+    Thread storing the embedded batches in the vector store and updating the checkpoint after each of them.
+    """
+
+    def __init__(
+        self,
+        document_cls: Type[Document],
+        backend: BaseVectorSearchBackend,
+        checkpoint: Checkpoint,
+        uploads: queue.Queue,
+        total: int,
+        progress_callback: Optional[Callable[[int, int], None]],
+    ):
+        super().__init__(daemon=True)
+        self.document_cls = document_cls
+        self.backend = backend
+        self.checkpoint = checkpoint
+        self.uploads = uploads
+        self.total = total
+        self.progress_callback = progress_callback
+        self.error: Optional[BaseException] = None
+
+    def put(self, item):
+        """
+        Pass the batch to the uploader, blocking while the queue is full.
+        """
+        while True:
+            self.raise_error()
+            try:
+                self.uploads.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def stop(self):
+        self.uploads.put(None)
+        self.join()
+
+    def raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def run(self):
+        try:
+            while (item := self.uploads.get()) is not None:
+                shard, next_shard, batch, vectors = item
+                if batch:
+                    documents = self.document_cls.objects._create_documents(
+                        batch, vectors
+                    )
+                    self.backend.bulk_save(documents)
+                # Shards are processed one batch at a time, so they are updated in order
+                index = self.checkpoint.shards.index(shard)
+                self.checkpoint.shards[index] = next_shard
+                self.checkpoint.indexed += len(batch)
+                if self.checkpoint.path is not None:
+                    self.checkpoint.save()
+                if self.progress_callback is not None:
+                    self.progress_callback(self.checkpoint.indexed, self.total)
+        except BaseException as e:
+            self.error = e
+            # Drain the queue, so the producer is not blocked
+            while self.uploads.get() is not None:
+                pass
+        finally:
+            connections.close_all()
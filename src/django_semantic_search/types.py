@@ -1,6 +1,30 @@
-from typing import List, Union
+import datetime
+import decimal
+import uuid
+from typing import Any, List, Union
+
+from django.db import models
 
 Vector = List[float]
 DocumentID = Union[int, str]
 # TODO: support more types in the metadata value, preferably the same as in the database
 MetadataValue = Union[int, str, float, bool]
+
+
+def to_metadata_value(value: Any) -> MetadataValue:
+    """
+    Convert the value of a model field into a value that might be stored in the metadata of the document.
+    Decimals are converted to floats, dates, times and UUIDs are converted to strings, and related model instances are
+    replaced with their primary keys.
+    :param value: value of the model field.
+    :return: metadata value.
+    """
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, models.Model):
+        return to_metadata_value(value.pk)
+    return value
@@ -1,35 +1,154 @@
-from functools import cache
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, partial
+from typing import Any, Callable, Dict, Optional, TypeVar
 
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.module_loading import import_string
 
+from django_semantic_search import default_settings
 from django_semantic_search.backends.types import IndexConfiguration
 from django_semantic_search.embeddings.base import BaseEmbeddingModel
 
+R = TypeVar("R")
 
-@cache
-def load_embedding_model() -> BaseEmbeddingModel:
+
+def get_setting(name: str) -> Any:
     """
-    Load the default embedding model, as specified in the settings.
-    :return: default embedding model instance.
+    Get the value of the semantic search setting, falling back to the default value if it is not set.
+    :param name: name of the setting, e.g. "vector_store".
+    :return: value of the setting.
     """
-    semantic_search_settings = settings.SEMANTIC_SEARCH
-    model_cls = semantic_search_settings["default_embeddings"]["model"]
-    if isinstance(model_cls, str):
-        model_cls = import_string(model_cls)
-    model_config = semantic_search_settings["default_embeddings"]["configuration"]
-    return model_cls(**model_config)
+    semantic_search_settings = getattr(settings, "SEMANTIC_SEARCH", {})
+    if name in semantic_search_settings:
+        return semantic_search_settings[name]
+    return default_settings.SEMANTIC_SEARCH[name]
+
+
+# Alias of the model configured in the `default_embeddings` setting
+DEFAULT_EMBEDDING_MODEL = "default"
+
+_embedding_models: Dict[str, BaseEmbeddingModel] = {}
+_embedding_models_lock = threading.Lock()
+
+
+def load_embedding_model(alias: Optional[str] = None) -> BaseEmbeddingModel:
+    """
+    Load the embedding model registered under the alias in the `embedding_models` setting, or the default one. Models
+    with the same class and configuration are loaded only once, even if they are registered under multiple aliases.
+    :param alias: alias of the model. The default model is loaded if not provided.
+    :return: embedding model instance.
+    """
+    if alias is None or alias == DEFAULT_EMBEDDING_MODEL:
+        model_settings = get_setting("default_embeddings")
+    else:
+        registry = get_setting("embedding_models")
+        if alias not in registry:
+            raise ImproperlyConfigured(
+                f"Embedding model {alias} is not defined in the embedding_models setting."
+            )
+        model_settings = registry[alias]
+
+    model_cls = model_settings["model"]
+    model_config = model_settings.get("configuration", {})
+    key = json.dumps([model_cls, model_config], sort_keys=True, default=repr)
+    # Loading a model might take a while, so the lock makes sure it is not loaded by multiple threads at once
+    with _embedding_models_lock:
+        if key not in _embedding_models:
+            if isinstance(model_cls, str):
+                model_cls = import_string(model_cls)
+            _embedding_models[key] = model_cls(**model_config)
+        return _embedding_models[key]
+
+
+_backends_lock = threading.Lock()
 
 
-@cache
 def load_backend(index_configuration: IndexConfiguration):
     """
-    Load the backend, as specified in the settings.
+    Load the backend, as specified in the settings. The backends are loaded lazily, so the lock makes sure the threads
+    handling the first concurrent requests do not create multiple instances for the same configuration.
     :return: backend instance.
     """
+    with _backends_lock:
+        return _load_backend(index_configuration)
+
+
+@cache
+def _load_backend(index_configuration: IndexConfiguration):
     semantic_search_settings = settings.SEMANTIC_SEARCH
     backend_cls = semantic_search_settings["vector_store"]["backend"]
     if isinstance(backend_cls, str):
         backend_cls = import_string(backend_cls)
     backend_config = semantic_search_settings["vector_store"]["configuration"]
     return backend_cls(index_configuration, **backend_config)
+
+
+@cache
+def load_deferred_queue():
+    """
+    Load the queue of the deferred document updates, as specified in the settings.
+    :return: deferred update queue instance.
+    """
+    from django_semantic_search.deferred import create_deferred_queue
+
+    return create_deferred_queue(**get_setting("deferred_updates"))
+
+
+@cache
+def load_query_embeddings_cache():
+    """
+    Load the cache of the query embeddings, as specified in the settings.
+    :return: cache instance, or None if the cache is disabled.
+    """
+    cache_settings = get_setting("query_embeddings_cache")
+    if not cache_settings or cache_settings.get("backend") is None:
+        return None
+    cache_cls = cache_settings["backend"]
+    if isinstance(cache_cls, str):
+        cache_cls = import_string(cache_cls)
+    return cache_cls(**cache_settings.get("configuration", {}))
+
+
+@cache
+def load_document_embeddings_cache():
+    """
+    Load the cache of the document embeddings, as specified in the settings.
+    :return: cache instance, or None if the cache is disabled.
+    """
+    cache_settings = get_setting("document_embeddings_cache")
+    if not cache_settings or cache_settings.get("backend") is None:
+        return None
+    cache_cls = cache_settings["backend"]
+    if isinstance(cache_cls, str):
+        cache_cls = import_string(cache_cls)
+    return cache_cls(**cache_settings.get("configuration", {}))
+
+
+@cache
+def load_embedding_executor() -> ThreadPoolExecutor:
+    """
+    Load the executor running the embedding models on behalf of the asynchronous API, as specified in the settings.
+    The executor is bounded, so the concurrent requests do not start more inferences than the configured workers.
+    :return: executor instance.
+    """
+    async_settings = get_setting("async")
+    return ThreadPoolExecutor(
+        max_workers=async_settings.get("embedding_workers"),
+        thread_name_prefix="django-semantic-search-embeddings",
+    )
+
+
+async def run_in_embedding_executor(func: Callable[..., R], *args, **kwargs) -> R:
+    """
+    Run the blocking function, such as the embedding model inference, in the embedding executor.
+    :param func: function to run.
+    :return: result of the function.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        load_embedding_executor(), partial(func, *args, **kwargs)
+    )
@@ -0,0 +1,132 @@
+import pytest
+from mocks import StubDocument as BaseStubDocument
+
+from django_semantic_search.backends.brute_force import BruteForceBackend
+from django_semantic_search.backends.types import (
+    Distance,
+    FilterCondition,
+    IndexConfiguration,
+    VectorConfiguration,
+)
+
+
+class StubDocument(BaseStubDocument):
+    vector_names = ("cosine", "dot", "euclidean")
+
+    def vectors(self):
+        return dict.fromkeys(self.vector_names, self._vector)
+
+
+def create_backend(path=None):
+    index_configuration = IndexConfiguration(
+        namespace="stub",
+        vectors={
+            "cosine": VectorConfiguration(size=2, distance=Distance.COSINE),
+            "dot": VectorConfiguration(size=2, distance=Distance.DOT_PRODUCT),
+            "euclidean": VectorConfiguration(size=2, distance=Distance.EUCLIDEAN),
+        },
+    )
+    return BruteForceBackend(index_configuration, path=path)
+
+
+@pytest.fixture
+def backend():
+    backend = create_backend()
+    backend.bulk_save(
+        [
+            StubDocument(1, [1.0, 0.0], category="a"),
+            StubDocument(2, [3.0, 3.0], category="b"),
+            StubDocument(3, [0.0, 0.5], category="a"),
+        ]
+    )
+    return backend
+
+
+@pytest.mark.parametrize(
+    "vector_name, expected_ids, expected_top_score",
+    [
+        ("cosine", [1, 2, 3], 1.0),
+        ("dot", [2, 1, 3], 3.0),
+        ("euclidean", [1, 3, 2], 0.0),
+    ],
+)
+def test_search_ranks_by_distance(
+    backend, vector_name, expected_ids, expected_top_score
+):
+    """
+    Test that the documents are ranked exactly, according to the distance of the vector.
+    """
+    results = backend.search_with_scores(vector_name, [1.0, 0.0], limit=3)
+
+    assert [result.id for result in results] == expected_ids
+    assert results[0].score == pytest.approx(expected_top_score)
+    assert backend.search(vector_name, [1.0, 0.0], limit=1) == expected_ids[:1]
+
+
+def test_search_applies_filters_and_returns_metadata(backend):
+    """
+    Test that only the documents matching the filters are returned, along with their metadata.
+    """
+    results = backend.search_with_scores(
+        "dot",
+        [1.0, 0.0],
+        filters=[FilterCondition.from_lookup("category", "a")],
+        with_metadata=True,
+    )
+
+    assert [result.id for result in results] == [1, 3]
+    assert results[0].metadata == {"category": "a"}
+
+
+def test_save_overwrites_and_delete_compacts(backend):
+    """
+    Test that saving the same document replaces its vector, and the deleted rows are eventually compacted.
+    """
+    backend.save(StubDocument(3, [5.0, 0.0], category="a"))
+    assert len(backend) == 3
+    assert backend.search("dot", [1.0, 0.0], limit=1) == [3]
+
+    backend.delete(3)
+    backend.delete(42)
+    assert len(backend) == 2
+    assert backend.search("dot", [1.0, 0.0], limit=10) == [2, 1]
+    assert backend._deleted == 0
+    assert backend._matrices["dot"].shape == (2, 2)
+
+
+def test_partial_update_keeps_the_other_vectors(backend):
+    """
+    Test that the partial update replaces the selected vectors and the metadata only.
+    """
+    assert backend.get_content_hashes(1) == {"cosine": "[1.0, 0.0]"}
+    assert backend.get_content_hashes(42) is None
+
+    backend.partial_update(
+        StubDocument(1, [0.0, 9.0], category="c"), {"dot": [0.0, 9.0]}
+    )
+
+    assert backend.search("dot", [0.0, 1.0], limit=1) == [1]
+    assert backend.search("cosine", [1.0, 0.0], limit=1) == [1]
+    assert backend.search("euclidean", [1.0, 0.0], limit=1) == [1]
+    assert backend.search(
+        "dot", [0.0, 1.0], filters=[FilterCondition.from_lookup("category", "c")]
+    ) == [1]
+
+
+def test_persisted_snapshot_is_memory_mapped(backend, tmp_path):
+    """
+    Test that the persisted snapshot is loaded by the new backends, and copied on the first write.
+    """
+    backend._path = str(tmp_path)
+    backend.persist()
+
+    loaded = create_backend(path=str(tmp_path))
+    assert len(loaded) == 3
+    assert not loaded._matrices["dot"].flags.writeable
+    assert loaded.search("euclidean", [1.0, 0.0], limit=3) == [1, 3, 2]
+    assert loaded.get_content_hashes(2) == {"cosine": "[3.0, 3.0]"}
+
+    loaded.save(StubDocument(4, [10.0, 0.0]))
+    assert loaded._matrices["dot"].flags.writeable
+    assert loaded.search("dot", [1.0, 0.0], limit=1) == [4]
+    assert create_backend(path=str(tmp_path)).search("dot", [1.0, 0.0], limit=1) == [2]
@@ -0,0 +1,254 @@
+import hashlib
+from unittest import mock
+
+import pytest
+
+import django_semantic_search as dss
+from django_semantic_search.cache import (
+    DjangoQueryEmbeddingCache,
+    InMemoryQueryEmbeddingCache,
+    SQLiteDocumentEmbeddingCache,
+)
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    """
+    Test that the in-memory cache keeps up to max_size most recently used embeddings.
+    """
+    query_cache = InMemoryQueryEmbeddingCache(max_size=2)
+    query_cache.set(("model", None, "first"), [1.0])
+    query_cache.set(("model", None, "second"), [2.0])
+    assert query_cache.get(("model", None, "first")) == [1.0]
+
+    query_cache.set(("model", None, "third"), [3.0])
+    assert query_cache.get(("model", None, "second")) is None
+    assert query_cache.get(("model", None, "first")) == [1.0]
+    assert query_cache.get(("model", None, "third")) == [3.0]
+    assert query_cache.stats() == {"hits": 3, "misses": 1, "size": 2}
+
+
+def test_in_memory_cache_expires_entries():
+    """
+    Test that the cached embeddings expire after the TTL.
+    """
+    query_cache = InMemoryQueryEmbeddingCache(ttl=10)
+    with mock.patch("django_semantic_search.cache.time.monotonic", return_value=100):
+        query_cache.set(("model", None, "query"), [1.0])
+    with mock.patch("django_semantic_search.cache.time.monotonic", return_value=105):
+        assert query_cache.get(("model", None, "query")) == [1.0]
+    with mock.patch("django_semantic_search.cache.time.monotonic", return_value=111):
+        assert query_cache.get(("model", None, "query")) is None
+
+
+def test_in_memory_cache_is_not_modified_by_callers():
+    """
+    Test that modifying the stored or the returned embedding does not change the cached one, and the statistics are
+    counted correctly from multiple threads.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    query_cache = InMemoryQueryEmbeddingCache()
+    vector = [1.0, 2.0]
+    query_cache.set(("model", None, "query"), vector)
+    vector[0] = 0.0
+    query_cache.get(("model", None, "query"))[1] = 0.0
+    assert query_cache.get(("model", None, "query")) == [1.0, 2.0]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(
+            executor.map(
+                lambda i: query_cache.get(
+                    ("model", None, "query" if i % 2 else "other")
+                ),
+                range(1000),
+            )
+        )
+    assert query_cache.stats() == {"hits": 502, "misses": 500, "size": 1}
+
+
+def test_django_cache_stores_embeddings():
+    """
+    Test that the embeddings are stored in the Django cache framework.
+    """
+    query_cache = DjangoQueryEmbeddingCache()
+    assert query_cache.get(("model", "Query: ", "query")) is None
+    query_cache.set(("model", "Query: ", "query"), [1.0, 2.0])
+    assert query_cache.get(("model", "Query: ", "query")) == [1.0, 2.0]
+    assert query_cache.get(("model", None, "query")) is None
+    assert query_cache.stats() == {"hits": 1, "misses": 2}
+
+
+def test_vector_index_reuses_query_embeddings():
+    """
+    Test that the repeated queries, differing only in whitespace, are embedded once.
+    """
+    index = dss.VectorIndex("name")
+    with mock.patch.object(
+        index.embedding_model,
+        "embed_query",
+        wraps=index.embedding_model.embed_query,
+    ) as embed_query:
+        first = index.get_query_embedding("cached  query")
+        second = index.get_query_embedding(" cached query ")
+
+    assert first == second
+    assert embed_query.call_count == 1
+
+
+def test_vector_index_embeds_queries_unchanged_without_cache():
+    """
+    Test that the queries are normalized only for the cache keys, and passed to the model unchanged.
+    """
+    index = dss.VectorIndex("name")
+    with (
+        mock.patch(
+            "django_semantic_search.utils.load_query_embeddings_cache",
+            return_value=None,
+        ),
+        mock.patch.object(
+            index.embedding_model,
+            "embed_query",
+            wraps=index.embedding_model.embed_query,
+        ) as embed_query,
+    ):
+        index.get_query_embedding(" uncached  query ")
+
+    embed_query.assert_called_once_with(" uncached  query ")
+
+
+def test_sqlite_cache_stores_embeddings(tmp_path):
+    """
+    Test that the embeddings are persisted in the SQLite database and survive reopening the cache.
+    """
+    path = tmp_path / "embeddings.sqlite3"
+    document_cache = SQLiteDocumentEmbeddingCache(path)
+    document_cache.set_many(
+        {
+            ("model", None, "first"): [0.5, 1.0],
+            ("model", "Doc: ", "first"): [1.5, 2.0],
+        }
+    )
+
+    reopened_cache = SQLiteDocumentEmbeddingCache(path)
+    assert reopened_cache.get_many(
+        [
+            ("model", None, "first"),
+            ("model", "Doc: ", "first"),
+            ("model", None, "missing"),
+        ]
+    ) == {
+        ("model", None, "first"): [0.5, 1.0],
+        ("model", "Doc: ", "first"): [1.5, 2.0],
+    }
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    """
+    Test that the least recently used embeddings are evicted when the cache exceeds its size.
+    """
+    document_cache = SQLiteDocumentEmbeddingCache(
+        tmp_path / "cache.sqlite3", max_entries=10
+    )
+    with mock.patch("django_semantic_search.cache.time.time", return_value=1):
+        document_cache.set_many(
+            {("model", None, str(i)): [float(i)] for i in range(10)}
+        )
+    with mock.patch("django_semantic_search.cache.time.time", return_value=2):
+        document_cache.get_many([("model", None, "0")])
+        document_cache.set_many({("model", None, "10"): [10.0]})
+
+    assert len(document_cache) == 9
+    cached = document_cache.get_many([("model", None, str(i)) for i in range(11)])
+    assert ("model", None, "0") in cached
+    assert ("model", None, "10") in cached
+
+
+def test_sqlite_cache_counts_entries_only_when_they_might_exceed_the_size(tmp_path):
+    """
+    Test that the entries are not counted on every write, but only once the writes might exceed the maximum size.
+    """
+    document_cache = SQLiteDocumentEmbeddingCache(
+        tmp_path / "cache.sqlite3", max_entries=10
+    )
+    statements = []
+    document_cache._connection.set_trace_callback(statements.append)
+
+    for i in range(10):
+        document_cache.set_many({("model", None, str(i)): [float(i)]})
+    assert not any("COUNT" in statement for statement in statements)
+
+    # Replacing the existing entry triggers the count, but does not evict anything
+    document_cache.set_many({("model", None, "0"): [0.0]})
+    assert sum("COUNT" in statement for statement in statements) == 1
+    assert len(document_cache) == 10
+
+    document_cache.set_many({("model", None, "10"): [10.0]})
+    assert len(document_cache) == 9
+
+
+def test_vector_index_embeds_only_uncached_documents(tmp_path):
+    """
+    Test that the vector index only embeds the texts missing in the document embeddings cache.
+    """
+    from django.db import models
+
+    class CachedModel(models.Model):
+        name = models.CharField(max_length=255)
+
+        class Meta:
+            app_label = "test_cache"
+
+    index = dss.VectorIndex("name")
+    document_cache = SQLiteDocumentEmbeddingCache(tmp_path / "cache.sqlite3")
+    instances = [CachedModel(name="first"), CachedModel(name="second")]
+    with (
+        mock.patch(
+            "django_semantic_search.utils.load_document_embeddings_cache",
+            return_value=document_cache,
+        ),
+        mock.patch.object(
+            index.embedding_model,
+            "embed_documents",
+            wraps=index.embedding_model.embed_documents,
+        ) as embed_documents,
+    ):
+        first_vectors = index.get_model_embeddings(instances)
+        instances.append(CachedModel(name="third"))
+        second_vectors = index.get_model_embeddings(instances)
+
+    assert embed_documents.call_args_list == [
+        mock.call(["first", "second"]),
+        mock.call(["third"]),
+    ]
+    # Cached vectors are stored with float32 precision
+    assert second_vectors[0] == pytest.approx(first_vectors[0], rel=1e-6)
+    assert second_vectors[1] == pytest.approx(first_vectors[1], rel=1e-6)
+    assert len(second_vectors) == 3
+
+
+def test_document_cache_ignores_embeddings_of_a_different_size(tmp_path):
+    """
+    Test that the cached document embeddings of a different size, stored by another model under the same identifier,
+    are embedded again.
+    """
+    from mocks import MockTextEmbeddingModel
+
+    index = dss.VectorIndex("name")
+    index._set_embedding_model(MockTextEmbeddingModel(size=4))
+    document_cache = SQLiteDocumentEmbeddingCache(tmp_path / "cache.sqlite3")
+    document_cache.set_many(
+        {
+            (
+                index.embedding_model.identifier(),
+                None,
+                hashlib.sha256(b"text").hexdigest(),
+            ): [1.0, 2.0]
+        }
+    )
+    with mock.patch(
+        "django_semantic_search.utils.load_document_embeddings_cache",
+        return_value=document_cache,
+    ):
+        vectors = index._embed_documents(["text"])
+
+    assert len(vectors[0]) == 4
@@ -70,3 +70,107 @@ def test_register_document_creates_update_delete_signals():
 
     assert models.signals.post_save.has_listeners(SingleUseDummyModel)
     assert models.signals.post_delete.has_listeners(SingleUseDummyModel)
+
+
+def test_register_document_loads_models_and_backend_lazily():
+    """
+    Test that registering the document does not load the embedding models nor the backend, until they are used
+    or warmed up explicitly.
+    """
+    from io import StringIO
+    from unittest import mock
+
+    from django.core.management import call_command
+
+    from django_semantic_search import registry
+    from django_semantic_search.management.commands import semantic_search_configure
+
+    class LazyModel(models.Model):
+        name = models.CharField(max_length=100)
+
+        class Meta:
+            app_label = "test_decorators"
+
+    with mock.patch("django_semantic_search.utils._load_backend") as load_backend:
+
+        @dss.register_document
+        class LazyDocument(dss.Document):
+            class Meta:
+                model = LazyModel
+                namespace = "lazy"
+                indexes = [dss.VectorIndex("name")]
+
+        index = LazyDocument.meta.indexes[0]
+        assert index._embedding_model is None
+        assert not hasattr(LazyDocument, "_backend")
+        assert LazyDocument in registry.get_documents()
+
+        dss.warm_up([LazyDocument])
+        assert index._embedding_model is not None
+        load_backend.assert_called_once_with(LazyDocument.index_configuration)
+
+        stdout = StringIO()
+        with mock.patch.object(registry, "get_documents", return_value=[LazyDocument]):
+            call_command(semantic_search_configure.Command(), stdout=stdout)
+        assert "Configured lazy for LazyDocument" in stdout.getvalue()
+
+
+def test_queryset_delete_removes_the_documents_at_once():
+    """
+    Test that deleting a queryset removes all its documents with a single call to the backend.
+    """
+    from unittest import mock
+
+    from django.db import connection
+
+    class BulkDeleteModel(models.Model):
+        name = models.CharField(max_length=100)
+
+        class Meta:
+            app_label = "test_decorators"
+
+    @dss.register_document
+    class BulkDeleteDocument(dss.Document):
+        class Meta:
+            model = BulkDeleteModel
+            namespace = "bulk_delete"
+            indexes = [dss.VectorIndex("name")]
+
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(BulkDeleteModel)
+        instances = [BulkDeleteModel.objects.create(name=f"test {i}") for i in range(3)]
+        backend = BulkDeleteDocument.backend
+
+        with mock.patch.object(
+            backend, "bulk_delete", wraps=backend.bulk_delete
+        ) as bulk_delete:
+            instances[0].delete()
+            BulkDeleteModel.objects.all().delete()
+
+        assert bulk_delete.call_count == 2
+        assert sorted(bulk_delete.call_args.args[0]) == [
+            instance.pk for instance in instances[1:]
+        ]
+        assert BulkDeleteDocument.objects.search(name="test").count() == 0
+        schema_editor.delete_model(BulkDeleteModel)
+
+
+def test_incomplete_delete_does_not_remove_the_documents():
+    """
+    Test that the documents collected by a delete which failed before completing are not removed, as the rows were
+    restored by the rollback.
+    """
+    from unittest import mock
+
+    from django_semantic_search.decorators import expect_delete, schedule_delete
+
+    document_cls = mock.Mock(__name__="StubDocument")
+    failed_delete, next_delete = object(), object()
+    expect_delete(document_cls, 1, failed_delete)
+    expect_delete(document_cls, 2, failed_delete)
+    schedule_delete(document_cls, 1, failed_delete)
+
+    expect_delete(document_cls, 3, next_delete)
+    schedule_delete(document_cls, 3, next_delete)
+
+    document_cls.backend.bulk_delete.assert_called_once_with([3])
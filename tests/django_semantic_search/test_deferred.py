@@ -0,0 +1,167 @@
+from unittest import mock
+
+import pytest
+from django.db import models
+
+import django_semantic_search as dss
+from django_semantic_search.deferred import DeferredUpdateQueue
+
+
+class DeferredModel(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = "test_deferred"
+
+
+@dss.register_document
+class DeferredDocument(dss.Document):
+    class Meta:
+        model = DeferredModel
+        namespace = "deferred"
+        indexes = [
+            dss.VectorIndex("name"),
+        ]
+        deferred_signals = True
+
+
+def indexed_ids():
+    """Return the IDs of all the documents stored in the backend."""
+    return sorted(DeferredDocument.backend.search("name", [0.0] * 10, limit=100))
+
+
+@pytest.fixture
+def deferred_queue():
+    """
+    Create a queue that is only flushed explicitly, and use it for the signal handlers.
+    """
+    from django.db import connection
+
+    queue = DeferredUpdateQueue(
+        batch_size=1000, flush_interval=3600, retry_backoff=3600
+    )
+    # Schema editor runs in a transaction, so the table is created outside the test to let on_commit fire
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(DeferredModel)
+    with mock.patch(
+        "django_semantic_search.decorators.load_deferred_queue",
+        return_value=queue,
+    ):
+        yield queue
+    queue.shutdown(timeout=1)
+    with connection.schema_editor() as schema_editor:
+        schema_editor.delete_model(DeferredModel)
+
+
+def test_deferred_signals_do_not_update_the_backend_immediately(deferred_queue):
+    """
+    Test that the model changes are only applied to the backend when the queue is flushed.
+    """
+    instance = DeferredModel.objects.create(name="test")
+    assert len(deferred_queue) == 1
+    assert indexed_ids() == []
+
+    deferred_queue.flush()
+    assert len(deferred_queue) == 0
+    assert indexed_ids() == [instance.pk]
+
+    instance_id = instance.pk
+    instance.delete()
+    assert indexed_ids() == [instance_id]
+
+    deferred_queue.flush()
+    assert indexed_ids() == []
+
+
+def test_deferred_updates_are_coalesced(deferred_queue):
+    """
+    Test that repeated updates of the same instance are applied only once.
+    """
+    first = DeferredModel.objects.create(name="first")
+    second = DeferredModel.objects.create(name="second")
+    for i in range(3):
+        first.name = f"first {i}"
+        first.save()
+    second.delete()
+    assert len(deferred_queue) == 2
+
+    with mock.patch.object(
+        DeferredDocument.backend, "bulk_save", wraps=DeferredDocument.backend.bulk_save
+    ) as bulk_save:
+        deferred_queue.flush()
+
+    assert bulk_save.call_count == 1
+    assert [document.id for document in bulk_save.call_args.args[0]] == [first.pk]
+    assert indexed_ids() == [first.pk]
+
+    first.delete()
+    deferred_queue.flush()
+
+
+def test_shutdown_drains_pending_updates(deferred_queue):
+    """
+    Test that the pending updates are applied when the queue is shut down.
+    """
+    instance = DeferredModel.objects.create(name="test")
+    deferred_queue.shutdown(timeout=1)
+    assert indexed_ids() == [instance.pk]
+
+    # The queue is stopped, so the changes are applied immediately
+    instance.delete()
+    assert len(deferred_queue) == 0
+    assert indexed_ids() == []
+
+
+def test_failed_updates_are_retried(deferred_queue, caplog):
+    """
+    Test that the updates of a failed batch are retried with a backoff, unless they are replaced by newer updates,
+    and that they are given up after the maximum number of retries.
+    """
+    first = DeferredModel.objects.create(name="first")
+    second = DeferredModel.objects.create(name="second")
+    with mock.patch.object(
+        DeferredDocument.backend, "bulk_save", side_effect=ConnectionError
+    ) as bulk_save:
+        deferred_queue.flush()
+        assert len(deferred_queue) == 2
+
+        # The retries are not due yet
+        deferred_queue.flush()
+        assert bulk_save.call_count == 1
+
+        # The newer update replaces the failed one, and its retries start over
+        second.name = "second updated"
+        second.save()
+        assert len(deferred_queue) == 2
+        deferred_queue.flush()
+        assert bulk_save.call_count == 2
+
+        # Both updates are due for their retries
+        deferred_queue._retries = {
+            key: (operation, attempts, 0.0)
+            for key, (operation, attempts, _) in deferred_queue._retries.items()
+        }
+        deferred_queue.flush()
+        assert bulk_save.call_count == 3
+    assert indexed_ids() == []
+    assert {
+        key[1]: attempts for key, (_, attempts, _) in deferred_queue._retries.items()
+    } == {first.pk: 2, second.pk: 2}
+
+    # Stopping the queue retries the failed updates immediately
+    deferred_queue.shutdown(timeout=1)
+    assert indexed_ids() == [first.pk, second.pk]
+    assert len(deferred_queue) == 0
+
+    failing_queue = DeferredUpdateQueue(flush_interval=3600, max_retries=0)
+    failing_queue.enqueue_save(DeferredDocument, first.pk)
+    with mock.patch.object(
+        DeferredDocument.backend, "bulk_save", side_effect=ConnectionError
+    ):
+        failing_queue.flush()
+    failing_queue.shutdown(timeout=1)
+    assert len(failing_queue) == 0
+    assert (
+        f"Giving up the deferred updates of DeferredDocument [{first.pk}]"
+        in caplog.text
+    )
@@ -12,6 +12,34 @@ class DummyModel(models.Model):
     class Meta:
         app_label = "test_documents"
 
+    @property
+    def name_length(self) -> int:
+        return len(self.name)
+
+
+class DummyCategory(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = "test_documents"
+
+
+class DummyProduct(models.Model):
+    name = models.CharField(max_length=255)
+    category = models.ForeignKey(DummyCategory, on_delete=models.CASCADE)
+
+    class Meta:
+        app_label = "test_documents"
+
+
+class DummyProductDocument(dss.Document):
+    class Meta:
+        model = DummyProduct
+        namespace = "dummy_product"
+        indexes = [dss.VectorIndex("name")]
+        include_fields = ["name", "category"]
+        disable_signals = True
+
 
 @dss.register_document
 class DummyDocument(dss.Document):
@@ -37,6 +65,22 @@ def django_test_database():
         schema_editor.delete_model(DummyModel)
 
 
+@pytest.fixture(scope="module")
+def django_foreign_key_database():
+    """
+    Create a test database for Django with the models related by a foreign key.
+    :return:
+    """
+    from django.db import connection
+
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(DummyCategory)
+        schema_editor.create_model(DummyProduct)
+        yield
+        schema_editor.delete_model(DummyProduct)
+        schema_editor.delete_model(DummyCategory)
+
+
 def test_dummy_document_produces_vectors():
     """
     Test that the document produces the correct vectors.
@@ -151,3 +195,392 @@ def test_model_has_more_entries_than_vector_backend():
         assert JustAnotherDocument.objects.search(name="a").count() == 3
 
         schema_editor.delete_model(JustAnotherModel)
+
+
+def test_index_processes_queryset_in_batches(django_test_database):
+    """
+    Test that the indexing embeds and stores the instances in batches, and reports the progress.
+    """
+    from unittest import mock
+
+    DummyDocument.backend._documents.clear()
+    with mock.patch.object(models.signals.post_save, "send"):
+        for i in range(5):
+            DummyModel(name=f"test {i}", description=f"description {i}").save()
+
+    progress = []
+    with mock.patch.object(
+        DummyDocument.backend,
+        "bulk_save",
+        wraps=DummyDocument.backend.bulk_save,
+    ) as bulk_save:
+        indexed = DummyDocument.objects.index(
+            DummyModel.objects.all(),
+            batch_size=2,
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+    assert indexed == 5
+    assert bulk_save.call_count == 3
+    assert progress == [(2, 5), (4, 5), (5, 5)]
+    assert DummyDocument.objects.search(name="test", limit=10).count() == 5
+
+    DummyModel.objects.all().delete()
+
+
+def test_save_embeds_only_the_changed_indexes(django_test_database):
+    """
+    Test that saving the document recalculates the embeddings of the modified indexes only.
+    """
+    from unittest import mock
+
+    from django_semantic_search.backends.qdrant import QdrantBackend
+
+    class ChangeTrackingDocument(dss.Document):
+        class Meta:
+            model = DummyModel
+            namespace = "change_tracking"
+            indexes = [
+                dss.VectorIndex("name"),
+                dss.VectorIndex("description"),
+            ]
+            include_fields = ["name", "description"]
+
+    ChangeTrackingDocument._backend = QdrantBackend(
+        ChangeTrackingDocument.index_configuration, location=":memory:"
+    )
+    name_index, description_index = ChangeTrackingDocument.meta.indexes
+
+    with mock.patch.object(models.signals.post_save, "send"):
+        dummy = DummyModel.objects.create(name="test", description="description")
+
+    with (
+        mock.patch.object(
+            name_index, "get_model_embedding", wraps=name_index.get_model_embedding
+        ) as name_embedding,
+        mock.patch.object(
+            description_index,
+            "get_model_embedding",
+            wraps=description_index.get_model_embedding,
+        ) as description_embedding,
+    ):
+        ChangeTrackingDocument(dummy).save()
+        assert name_embedding.call_count == 1
+        assert description_embedding.call_count == 1
+
+        dummy.ignored_field = "modified"
+        ChangeTrackingDocument(dummy).save()
+        assert name_embedding.call_count == 1
+        assert description_embedding.call_count == 1
+
+        dummy.description = "modified description"
+        ChangeTrackingDocument(dummy).save()
+        assert name_embedding.call_count == 1
+        assert description_embedding.call_count == 2
+
+        with mock.patch.object(
+            ChangeTrackingDocument._backend, "get_content_hashes"
+        ) as get_hashes:
+            ChangeTrackingDocument(dummy).save(update_fields=["ignored_field"])
+            assert get_hashes.call_count == 0
+            ChangeTrackingDocument(dummy).save(update_fields=["description"])
+            assert get_hashes.call_count == 1
+            # New instances are not stored yet, so the hashes are not looked up
+            embeddings = name_embedding.call_count
+            ChangeTrackingDocument(dummy).save(created=True)
+            assert get_hashes.call_count == 1
+            assert name_embedding.call_count == embeddings + 1
+
+    stored = ChangeTrackingDocument._backend.client.scroll(
+        "change_tracking", with_payload=True
+    )[0]
+    assert len(stored) == 1
+    assert "ignored_field" not in stored[0].payload
+    assert stored[0].payload["description"] == "modified description"
+
+    with mock.patch.object(models.signals.post_delete, "send"):
+        dummy.delete()
+
+
+def test_search_with_scores_returns_ordered_instances(django_test_database):
+    """
+    Test that the search with scores returns the model instances ordered by the score.
+    """
+    DummyDocument.backend._documents.clear()
+    for i in range(3):
+        DummyModel(name=f"test {i}", description=f"description {i}").save()
+
+    results = DummyDocument.objects.search_with_scores(name="test", limit=2)
+    assert len(results) == 2
+    assert all(isinstance(instance, DummyModel) for instance, _ in results)
+    assert results[0][1] >= results[1][1]
+
+    metadata_results = DummyDocument.objects.search_with_scores(
+        name="test", limit=2, from_metadata=True
+    )
+    assert [(i.pk, i.name, score) for i, score in metadata_results] == [
+        (i.pk, i.name, score) for i, score in results
+    ]
+
+    DummyModel.objects.all().delete()
+
+
+def test_search_with_scores_does_not_query_database_for_metadata(
+    django_test_database,
+):
+    """
+    Test that the results might be served from the stored metadata, without querying the database.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    DummyDocument.backend._documents.clear()
+    DummyModel(name="test", description="description").save()
+
+    with CaptureQueriesContext(connection) as queries:
+        results = DummyDocument.objects.search_with_scores(
+            name="test", from_metadata=True
+        )
+    assert len(queries) == 0
+    assert results[0][0].description == "description"
+
+    with CaptureQueriesContext(connection) as queries:
+        DummyDocument.objects.search_with_scores(name="test")
+    assert len(queries) == 1
+    assert "CASE" not in queries[0]["sql"]
+
+    DummyModel.objects.all().delete()
+
+
+def test_search_applies_filters(django_test_database):
+    """
+    Test that the filters are passed to the backend and restrict the results.
+    """
+    DummyDocument.backend._documents.clear()
+    for name in ("first", "second", "third"):
+        DummyModel(name=name, description="description").save()
+
+    queryset = DummyDocument.objects.search(
+        name="test", filters={"name__in": ["first", "third"]}
+    )
+    assert sorted(queryset.values_list("name", flat=True)) == ["first", "third"]
+
+    results = DummyDocument.objects.search_with_scores(
+        name="test", filters={"name": "second", "description": "description"}
+    )
+    assert [instance.name for instance, _ in results] == ["second"]
+
+    DummyModel.objects.all().delete()
+
+
+def test_search_rejects_invalid_filters():
+    """
+    Test that the filters on the fields not included in the metadata, or with unknown lookups, are rejected.
+    """
+
+    class RestrictedDocument(dss.Document):
+        class Meta:
+            model = DummyModel
+            namespace = "restricted"
+            indexes = [dss.VectorIndex("name")]
+            include_fields = ["name"]
+
+    with pytest.raises(ValueError, match="is not included in the metadata"):
+        RestrictedDocument.objects.search(name="test", filters={"description": "a"})
+    with pytest.raises(ValueError, match="is not supported"):
+        RestrictedDocument.objects.search(name="test", filters={"name__icontains": "a"})
+
+    assert RestrictedDocument.index_configuration.payload_fields == {"name": "keyword"}
+
+
+def test_include_fields_might_be_model_properties():
+    """
+    Test that the properties of the model are stored in the metadata, but not indexed as the payload fields.
+    """
+
+    class PropertyDocument(dss.Document):
+        class Meta:
+            model = DummyModel
+            namespace = "property"
+            indexes = [dss.VectorIndex("name")]
+            include_fields = ["name", "name_length"]
+
+    assert PropertyDocument.index_configuration.payload_fields == {"name": "keyword"}
+    document = PropertyDocument(DummyModel(pk=1, name="test"))
+    assert document.metadata() == {"name": "test", "name_length": 4}
+
+
+def test_search_in_multiple_indexes(django_test_database):
+    """
+    Test that the search in multiple fields returns a single fused ranking, and embeds the query once.
+    """
+    from unittest import mock
+
+    DummyDocument.backend._documents.clear()
+    for i in range(3):
+        DummyModel(name=f"name {i}", description=f"description {i}").save()
+
+    name_index = DummyDocument.meta.indexes[0]
+    with mock.patch.object(
+        name_index.embedding_model,
+        "embed_query",
+        wraps=name_index.embedding_model.embed_query,
+    ) as embed_query:
+        results = DummyDocument.objects.search_with_scores(
+            name="multi index query", description="multi index query", limit=3
+        )
+    assert embed_query.call_count == 1
+    assert len(results) == 3
+    assert results[0][1] >= results[1][1] >= results[2][1]
+
+    queryset = DummyDocument.objects.search(
+        name="query", description="query", fusion="dbsf", weights={"name": 2.0}
+    )
+    assert queryset.count() == 3
+
+    with pytest.raises(ValueError):
+        DummyDocument.objects.search(name="query", fusion="unknown")
+    with pytest.raises(ValueError, match="No index found"):
+        DummyDocument.objects.search(name="query", ignored_field="query")
+
+    DummyModel.objects.all().delete()
+
+
+def test_async_api_mirrors_sync_api(django_test_database):
+    """
+    Test that the asynchronous counterparts of the search and indexing methods work as the synchronous ones.
+    """
+    from unittest import mock
+
+    from asgiref.sync import async_to_sync
+
+    DummyDocument.backend._documents.clear()
+    with mock.patch.object(models.signals.post_save, "send"):
+        for i in range(3):
+            DummyModel(name=f"test {i}", description=f"description {i}").save()
+
+    async def run():
+        indexed = await DummyDocument.objects.aindex(
+            DummyModel.objects.all(), batch_size=2
+        )
+        queryset = await DummyDocument.objects.asearch(name="test")
+        instances = [instance async for instance in queryset]
+        scored = await DummyDocument.objects.asearch_with_scores(
+            name="test", description="test", limit=2
+        )
+
+        instance = await DummyModel.objects.aget(name="test 0")
+        await DummyDocument(instance).adelete()
+        remaining = await DummyDocument.objects.asearch_with_scores(name="test")
+        await DummyDocument(instance).asave()
+        restored = await DummyDocument.objects.asearch_with_scores(name="test")
+        return indexed, instances, scored, remaining, restored
+
+    indexed, instances, scored, remaining, restored = async_to_sync(run)()
+    assert indexed == 3
+    assert len(instances) == 3
+    assert len(scored) == 2
+    assert scored == DummyDocument.objects.search_with_scores(
+        name="test", description="test", limit=2
+    )
+    assert len(remaining) == 2
+    assert len(restored) == 3
+
+    DummyModel.objects.all().delete()
+
+
+def test_index_truncates_embeddings_to_dimensions():
+    """
+    Test that the index keeps the leading dimensions of the embeddings only, normalized again.
+    """
+    import math
+
+    class TruncatedModel(models.Model):
+        name = models.CharField(max_length=255)
+
+        class Meta:
+            app_label = "test_documents"
+
+    class TruncatedDocument(dss.Document):
+        class Meta:
+            model = TruncatedModel
+            namespace = "truncated"
+            indexes = [dss.VectorIndex("name", dimensions=4)]
+
+    index = TruncatedDocument.meta.indexes[0]
+    full_vector = index.embedding_model.embed_document("test")
+    vector = index.get_model_embedding(TruncatedModel(name="test"))
+    norm = math.sqrt(sum(value * value for value in full_vector[:4]))
+
+    assert index.vector_size == 4
+    assert TruncatedDocument.index_configuration.vectors["name"].size == 4
+    assert vector == pytest.approx([value / norm for value in full_vector[:4]])
+    assert index.get_query_embedding("test") == pytest.approx(vector)
+
+    with pytest.raises(ValueError):
+        dss.VectorIndex("name", dimensions=11).embedding_model
+
+
+def test_foreign_keys_are_stored_without_loading_related_objects(
+    django_foreign_key_database,
+):
+    """
+    Test that the foreign keys are stored in the metadata under their attribute names, so indexing does not query
+    the database for each related object.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    DummyProductDocument.backend._documents.clear()
+    categories = [DummyCategory.objects.create(name=name) for name in ("a", "b")]
+    for i in range(20):
+        DummyProduct.objects.create(name=f"product {i}", category=categories[i % 2])
+
+    assert DummyProductDocument.index_configuration.payload_fields == {
+        "name": "keyword",
+        "category_id": "integer",
+    }
+    product = DummyProduct.objects.first()
+    assert DummyProductDocument(product).metadata() == {
+        "name": product.name,
+        "category_id": product.category_id,
+    }
+
+    with CaptureQueriesContext(connection) as queries:
+        DummyProductDocument.objects.index(DummyProduct.objects.all())
+    assert all("dummycategory" not in query["sql"] for query in queries)
+
+    for lookup in ("category", "category_id"):
+        queryset = DummyProductDocument.objects.search(
+            name="test", filters={lookup: categories[0].pk}
+        )
+        assert queryset.count() == 10
+        assert {product.category_id for product in queryset} == {categories[0].pk}
+
+    DummyProduct.objects.all().delete()
+    DummyCategory.objects.all().delete()
+
+
+def test_search_from_metadata_restores_foreign_keys(django_foreign_key_database):
+    """
+    Test that the instances created from the metadata have their foreign keys set, without querying the database.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    DummyProductDocument.backend._documents.clear()
+    category = DummyCategory.objects.create(name="a")
+    product = DummyProduct.objects.create(name="product", category=category)
+    DummyProductDocument.objects.index(DummyProduct.objects.all())
+
+    with CaptureQueriesContext(connection) as queries:
+        results = DummyProductDocument.objects.search_with_scores(
+            name="product", from_metadata=True
+        )
+    assert len(queries) == 0
+    assert results[0][0].pk == product.pk
+    assert results[0][0].name == "product"
+    assert results[0][0].category_id == category.pk
+
+    DummyProduct.objects.all().delete()
+    DummyCategory.objects.all().delete()
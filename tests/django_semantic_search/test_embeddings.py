@@ -0,0 +1,168 @@
+import pickle
+
+import pytest
+from mocks import MockTextEmbeddingModel
+
+
+def test_embed_documents_falls_back_to_single_embeddings():
+    """
+    Test that the default bulk embedding produces the same vectors as embedding the documents one by one.
+    """
+    model = MockTextEmbeddingModel()
+    documents = ["first document", "second document", "third document"]
+    vectors = model.embed_documents(documents)
+    assert vectors == [model.embed_document(document) for document in documents]
+
+
+def test_embed_queries_falls_back_to_single_embeddings():
+    """
+    Test that the default bulk query embedding produces the same vectors as embedding the queries one by one.
+    """
+    model = MockTextEmbeddingModel()
+    queries = ["first query", "second query"]
+    vectors = model.embed_queries(queries)
+    assert vectors == [model.embed_query(query) for query in queries]
+    assert model.embed_queries([]) == []
+
+
+def test_micro_batching_model_groups_concurrent_queries():
+    """
+    Test that the queries submitted concurrently are embedded in batches, and each caller gets its own vector.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from unittest import mock
+
+    from django_semantic_search.embeddings import MicroBatchingModel
+
+    model = MicroBatchingModel(
+        MockTextEmbeddingModel, {"size": 4}, max_batch_size=8, max_wait=0.05
+    )
+    reference = MockTextEmbeddingModel(size=4)
+    queries = [f"query {i % 12}" for i in range(16)]
+
+    with mock.patch.object(
+        model._model, "embed_queries", wraps=model._model.embed_queries
+    ) as embed_queries:
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            vectors = list(executor.map(model.embed_query, queries))
+
+    assert vectors == [reference.embed_query(query) for query in queries]
+    assert embed_queries.call_count < len(queries)
+    assert all(len(call.args[0]) <= 8 for call in embed_queries.call_args_list)
+    assert model.vector_size() == 4
+
+
+def test_micro_batching_model_propagates_errors():
+    """
+    Test that the errors of the wrapped model are raised in the calling threads.
+    """
+    from unittest import mock
+
+    from django_semantic_search.embeddings import MicroBatchingModel
+
+    model = MicroBatchingModel(MockTextEmbeddingModel, max_wait=0)
+    with mock.patch.object(
+        model._model, "embed_queries", side_effect=RuntimeError("model failure")
+    ):
+        with pytest.raises(RuntimeError, match="model failure"):
+            model.embed_query("query")
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_micro_batching_model_restarts_the_stopped_worker():
+    """
+    Test that the worker stopped by an unexpected exception fails its batch and is started again by the next query,
+    and that the callers do not wait longer than the timeout.
+    """
+    import concurrent.futures
+    import threading
+    from unittest import mock
+
+    from django_semantic_search.embeddings import MicroBatchingModel
+
+    model = MicroBatchingModel(MockTextEmbeddingModel, max_wait=0, timeout=0.1)
+    with mock.patch.object(model._model, "embed_queries", side_effect=SystemExit):
+        with pytest.raises(SystemExit):
+            model.embed_query("query")
+    model._worker.join(timeout=1)
+    assert not model._worker.is_alive()
+    assert model.embed_query("query") == MockTextEmbeddingModel().embed_query("query")
+
+    released = threading.Event()
+    with mock.patch.object(
+        model._model, "embed_queries", side_effect=lambda queries: released.wait()
+    ):
+        with pytest.raises(concurrent.futures.TimeoutError):
+            model.embed_query("slow query")
+    released.set()
+
+
+def test_embedding_models_are_loaded_lazily_by_alias():
+    """
+    Test that the indexes load the models registered under their aliases on the first use, and the models with
+    the same configuration are loaded once.
+    """
+    from django.conf import settings
+    from django.core.exceptions import ImproperlyConfigured
+    from django.test import override_settings
+
+    from django_semantic_search import VectorIndex
+
+    semantic_search_settings = {
+        **settings.SEMANTIC_SEARCH,
+        "embedding_models": {
+            "small": {"model": MockTextEmbeddingModel, "configuration": {"size": 4}},
+            "tiny": {"model": MockTextEmbeddingModel, "configuration": {"size": 4}},
+            "large": {"model": MockTextEmbeddingModel, "configuration": {"size": 16}},
+        },
+    }
+    with override_settings(SEMANTIC_SEARCH=semantic_search_settings):
+        small_index = VectorIndex("name", embedding_model="small")
+        assert small_index._embedding_model is None
+
+        assert small_index.vector_size == 4
+        assert (
+            small_index.embedding_model
+            is VectorIndex("name", embedding_model="tiny").embedding_model
+        )
+        assert VectorIndex("name", embedding_model="large").vector_size == 16
+        assert VectorIndex("name").vector_size == 10
+
+        with pytest.raises(ImproperlyConfigured):
+            VectorIndex("name", embedding_model="unknown").embedding_model
+
+
+def test_models_with_different_configurations_do_not_share_cached_embeddings():
+    """
+    Test that the models of the same class, created with different configurations, have different identifiers, so
+    they never get the embeddings of each other from the caches.
+    """
+    from django.conf import settings
+    from django.test import override_settings
+
+    from django_semantic_search import VectorIndex
+
+    assert (
+        MockTextEmbeddingModel(size=4).identifier()
+        == MockTextEmbeddingModel(size=4).identifier()
+    )
+    assert (
+        MockTextEmbeddingModel(size=4).identifier()
+        != MockTextEmbeddingModel(size=16).identifier()
+    )
+    # The identifier depends on the state of the model only, so it survives copying
+    model = MockTextEmbeddingModel(size=4)
+    assert pickle.loads(pickle.dumps(model)).identifier() == model.identifier()
+
+    semantic_search_settings = {
+        **settings.SEMANTIC_SEARCH,
+        "embedding_models": {
+            "small": {"model": MockTextEmbeddingModel, "configuration": {"size": 4}},
+            "large": {"model": MockTextEmbeddingModel, "configuration": {"size": 16}},
+        },
+    }
+    with override_settings(SEMANTIC_SEARCH=semantic_search_settings):
+        small_index = VectorIndex("name", embedding_model="small")
+        large_index = VectorIndex("name", embedding_model="large")
+        assert len(small_index.get_query_embedding("hello")) == 4
+        assert len(large_index.get_query_embedding("hello")) == 16
@@ -0,0 +1,31 @@
+import pytest
+
+from django_semantic_search.backends.fusion import fuse
+from django_semantic_search.backends.types import Fusion, SearchResult
+
+
+def test_reciprocal_rank_fusion_combines_positions():
+    """
+    Test that the documents ranked high in multiple lists are ranked first.
+    """
+    results = {
+        "name": [SearchResult(1, 0.9), SearchResult(2, 0.8), SearchResult(3, 0.7)],
+        "description": [SearchResult(2, 0.5), SearchResult(3, 0.4)],
+    }
+    fused = fuse(results, fusion=Fusion.RRF, limit=2)
+    assert [result.id for result in fused] == [2, 3]
+    assert fused[0].score == pytest.approx(1 / 62 + 1 / 61)
+
+
+def test_distribution_based_score_fusion_uses_weights():
+    """
+    Test that the weights decide which list dominates the fused ranking.
+    """
+    results = {
+        "name": [SearchResult(1, 0.9), SearchResult(2, 0.1)],
+        "description": [SearchResult(2, 0.9), SearchResult(1, 0.1)],
+    }
+    fused = fuse(results, fusion=Fusion.DBSF, weights={"name": 2.0})
+    assert [result.id for result in fused] == [1, 2]
+    fused = fuse(results, fusion=Fusion.DBSF, weights={"description": 2.0})
+    assert [result.id for result in fused] == [2, 1]
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+from mocks import StubDocument as BaseStubDocument
+
+from django_semantic_search.backends.brute_force import BruteForceBackend
+from django_semantic_search.backends.hnsw import HNSWBackend
+from django_semantic_search.backends.types import (
+    Distance,
+    FilterCondition,
+    IndexConfiguration,
+    VectorConfiguration,
+)
+
+
+class StubDocument(BaseStubDocument):
+    vector_names = ("cosine", "euclidean")
+
+
+INDEX_CONFIGURATION = IndexConfiguration(
+    namespace="stub",
+    vectors={
+        "cosine": VectorConfiguration(size=8, distance=Distance.COSINE),
+        "euclidean": VectorConfiguration(size=8, distance=Distance.EUCLIDEAN),
+    },
+)
+
+
+@pytest.fixture(scope="module")
+def documents():
+    rng = random.Random(42)
+    return [
+        StubDocument(i, [rng.gauss(0, 1) for _ in range(8)], parity=i % 2)
+        for i in range(400)
+    ]
+
+
+def create_backend(**kwargs):
+    return HNSWBackend(
+        INDEX_CONFIGURATION,
+        m=8,
+        ef_construction=64,
+        ef_search=32,
+        full_scan_threshold=0,
+        seed=7,
+        **kwargs,
+    )
+
+
+def recall(backend, exact, vector_name, queries, **kwargs):
+    hits = 0
+    for query in queries:
+        expected = set(exact.search(vector_name, query, limit=10, **kwargs))
+        hits += len(
+            expected & set(backend.search(vector_name, query, limit=10, **kwargs))
+        )
+    return hits / (10 * len(queries))
+
+
+@pytest.mark.parametrize("vector_name", ["cosine", "euclidean"])
+def test_search_approximates_exact_search(documents, vector_name):
+    """
+    Test that the graph search finds almost all the exact nearest neighbours, in each of the named vectors.
+    """
+    backend, exact = create_backend(), BruteForceBackend(INDEX_CONFIGURATION)
+    backend.bulk_save(documents)
+    exact.bulk_save(documents)
+    queries = [document.vectors()[vector_name] for document in documents[:20]]
+
+    assert recall(backend, exact, vector_name, queries) >= 0.9
+    assert (
+        recall(
+            backend,
+            exact,
+            vector_name,
+            queries,
+            filters=[FilterCondition.from_lookup("parity", 1)],
+        )
+        >= 0.9
+    )
+    assert backend.search(vector_name, queries[0], limit=1) == [0]
+
+
+def test_deleted_documents_are_skipped_and_compacted(documents):
+    """
+    Test that the deleted documents are never returned, and the graph is rebuilt on compaction.
+    """
+    backend = create_backend()
+    backend.bulk_save(documents[:100])
+    query = documents[0].vectors()["cosine"]
+
+    backend.delete(0)
+    assert 0 not in backend.search("cosine", query, limit=10)
+    assert len(backend._graphs["cosine"]) == 100
+
+    for document in documents[1:30]:
+        backend.delete(document.id)
+    assert len(backend) == 70
+    assert len(backend._graphs["cosine"]) < 100
+    assert len(backend.search("cosine", query, limit=100)) == 70
+
+
+def test_snapshot_restores_the_graph(documents, tmp_path):
+    """
+    Test that the persisted graph is loaded by the new backends, instead of being rebuilt.
+    """
+    backend = create_backend(path=str(tmp_path))
+    backend.bulk_save(documents[:100])
+    backend.persist()
+
+    loaded = create_backend(path=str(tmp_path))
+    query = documents[5].vectors()["euclidean"]
+    assert loaded._graphs["euclidean"].to_arrays().keys() == (
+        backend._graphs["euclidean"].to_arrays().keys()
+    )
+    assert loaded.search("euclidean", query, limit=5) == backend.search(
+        "euclidean", query, limit=5
+    )
+
+    loaded.save(StubDocument(1000, documents[5].vectors()["cosine"]))
+    assert loaded.search("cosine", documents[5].vectors()["cosine"], limit=2) == [
+        5,
+        1000,
+    ] or [1000, 5]
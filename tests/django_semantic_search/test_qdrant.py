@@ -0,0 +1,727 @@
+import uuid
+
+import pytest
+from mocks import StubDocument
+
+from django_semantic_search.backends.qdrant import QdrantBackend
+from django_semantic_search.backends.types import (
+    Distance,
+    FilterCondition,
+    Fusion,
+    IndexConfiguration,
+    PayloadFieldType,
+    VectorConfiguration,
+)
+
+
+@pytest.fixture
+def backend():
+    index_configuration = IndexConfiguration(
+        namespace="stub",
+        vectors={
+            "name": VectorConfiguration(size=2, distance=Distance.COSINE),
+            "description": VectorConfiguration(size=2, distance=Distance.COSINE),
+        },
+    )
+    return QdrantBackend(index_configuration, location=":memory:")
+
+
+def test_save_overwrites_the_same_document(backend):
+    """
+    Test that saving the same document multiple times does not create duplicates.
+    """
+    backend.save(StubDocument(1, [1.0, 0.0], name="first"))
+    backend.save(StubDocument(1, [0.0, 1.0], name="updated"))
+    backend.save(StubDocument(2, [1.0, 1.0], name="second"))
+
+    assert backend.client.count("stub").count == 2
+    assert backend.search("name", [0.0, 1.0], limit=10)[:1] == [1]
+
+
+def test_delete_removes_the_point(backend):
+    """
+    Test that deleting the document removes its point.
+    """
+    backend.save(StubDocument(1, [1.0, 0.0]))
+    backend.save(StubDocument(2, [0.0, 1.0]))
+    backend.delete(1)
+
+    assert backend.client.count("stub").count == 1
+    assert backend.search("name", [1.0, 0.0], limit=10) == [2]
+
+
+def test_deduplicate_migrates_legacy_points(backend):
+    """
+    Test that the points with random IDs are migrated to the deterministic IDs, and duplicates are removed.
+    """
+    from qdrant_client import models
+
+    backend.save(StubDocument(1, [1.0, 0.0], name="current"))
+    backend.client.upsert(
+        "stub",
+        points=[
+            models.PointStruct(
+                id=uuid.uuid4().hex,
+                vector={"name": [1.0, 0.0], "description": [0.0, 1.0]},
+                payload={"id": document_id, "name": "legacy"},
+            )
+            for document_id in (1, 2, 2, 3, 3, 3)
+        ],
+    )
+
+    assert backend.deduplicate(batch_size=2) == 6
+
+    points, _ = backend.client.scroll("stub", limit=10, with_payload=True)
+    assert sorted(point.payload["id"] for point in points) == [1, 2, 3]
+    assert all(
+        str(point.id) == backend.point_id(point.payload["id"]) for point in points
+    )
+    assert next(p for p in points if p.payload["id"] == 1).payload["name"] == "current"
+
+
+def test_partial_update_keeps_the_other_vectors(backend):
+    """
+    Test that the partial update replaces the selected vectors and the payload only.
+    """
+    backend.save(StubDocument(1, [1.0, 0.0], name="first"))
+    assert backend.get_content_hashes(1) == {"name": "[1.0, 0.0]"}
+    assert backend.get_content_hashes(2) is None
+
+    backend.partial_update(StubDocument(1, [0.0, 1.0], name="renamed"), {})
+    point = backend.client.retrieve("stub", [backend.point_id(1)], with_vectors=True)[0]
+    assert point.payload["name"] == "renamed"
+    assert point.vector["name"] == pytest.approx([1.0, 0.0])
+
+    backend.partial_update(
+        StubDocument(1, [0.0, 1.0], name="renamed"), {"name": [0.0, 1.0]}
+    )
+    point = backend.client.retrieve("stub", [backend.point_id(1)], with_vectors=True)[0]
+    assert point.vector["name"] == pytest.approx([0.0, 1.0])
+
+
+def test_search_with_scores_returns_metadata(backend):
+    """
+    Test that the search results contain the scores and, optionally, the metadata without internal fields.
+    """
+    backend.save(StubDocument(1, [1.0, 0.0], name="first"))
+    backend.save(StubDocument(2, [0.0, 1.0], name="second"))
+
+    results = backend.search_with_scores("name", [1.0, 0.1], limit=2)
+    assert [result.id for result in results] == [1, 2]
+    assert results[0].score > results[1].score
+    assert results[0].metadata == {}
+
+    results = backend.search_with_scores(
+        "name", [1.0, 0.1], limit=1, with_metadata=True
+    )
+    assert results[0].metadata == {"name": "first"}
+
+
+def test_search_applies_filters():
+    """
+    Test that the Django-style filter conditions are translated into the Qdrant filters.
+    """
+    index_configuration = IndexConfiguration(
+        namespace="filtered",
+        vectors={
+            "name": VectorConfiguration(size=2, distance=Distance.COSINE),
+            "description": VectorConfiguration(size=2, distance=Distance.COSINE),
+        },
+        payload_fields={
+            "category": PayloadFieldType.KEYWORD,
+            "price": PayloadFieldType.FLOAT,
+            "in_stock": PayloadFieldType.BOOLEAN,
+            "created_at": PayloadFieldType.DATETIME,
+        },
+    )
+    backend = QdrantBackend(index_configuration, location=":memory:")
+    backend.save(
+        StubDocument(
+            1,
+            [1.0, 0.0],
+            category="a",
+            price=5.0,
+            in_stock=True,
+            created_at="2024-01-01T00:00:00",
+        )
+    )
+    backend.save(
+        StubDocument(
+            2,
+            [1.0, 0.1],
+            category="a",
+            price=15.0,
+            in_stock=True,
+            created_at="2024-02-01T00:00:00",
+        )
+    )
+    backend.save(
+        StubDocument(
+            3,
+            [1.0, 0.2],
+            category="b",
+            price=5.0,
+            in_stock=False,
+            created_at="2024-03-01T00:00:00",
+        )
+    )
+
+    def search(**lookups):
+        filters = [FilterCondition.from_lookup(k, v) for k, v in lookups.items()]
+        return backend.search("name", [1.0, 0.0], limit=10, filters=filters)
+
+    assert search(category="a") == [1, 2]
+    assert search(category="a", price__lt=10) == [1]
+    assert search(price__gte=5.0, in_stock=False) == [3]
+    assert search(category__in=["a", "b"], price=5.0) == [1, 3]
+    assert search(created_at__gt="2024-01-15T00:00:00") == [2, 3]
+    # Qdrant does not compare the strings
+    with pytest.raises(ValueError, match="is not supported"):
+        search(category__gt="a")
+
+
+@pytest.mark.parametrize("fusion", [Fusion.RRF, Fusion.DBSF])
+def test_hybrid_search_fuses_the_vectors(backend, fusion):
+    """
+    Test that the hybrid search returns a single ranking out of multiple vectors.
+    """
+    backend.save(StubDocument(1, [1.0, 0.0], name="first"))
+    backend.save(StubDocument(2, [0.0, 1.0], name="second"))
+    backend.save(StubDocument(3, [1.0, 1.0], name="third"))
+
+    results = backend.hybrid_search(
+        {"name": [1.0, 0.0], "description": [1.0, 0.0]},
+        limit=3,
+        fusion=fusion,
+        with_metadata=True,
+    )
+    assert sorted(result.id for result in results) == [1, 2, 3]
+    assert results[0].score >= results[1].score >= results[2].score
+    assert {result.metadata["name"] for result in results} == {
+        "first",
+        "second",
+        "third",
+    }
+
+
+def test_hybrid_search_applies_weights(backend):
+    """
+    Test that the weights of the vectors change the ranking.
+    """
+    backend.save(StubDocument(1, [1.0, 0.0]))
+    backend.save(StubDocument(2, [0.0, 1.0]))
+    queries = {"name": [1.0, 0.0], "description": [1.0, 0.0]}
+
+    results = backend.hybrid_search(
+        queries, limit=2, weights={"name": 2.0, "description": 1.0}
+    )
+    assert [result.id for result in results] == [1, 2]
+
+    results = backend.hybrid_search(
+        queries, limit=2, weights={"name": 1.0, "description": 2.0}
+    )
+    assert [result.id for result in results] == [2, 1]
+
+
+def test_async_client_mirrors_sync_client():
+    """
+    Test that the asynchronous methods of the backend use the asynchronous Qdrant client.
+    """
+    import asyncio
+
+    index_configuration = IndexConfiguration(
+        namespace="async",
+        vectors={
+            "name": VectorConfiguration(size=2, distance=Distance.COSINE),
+            "description": VectorConfiguration(size=2, distance=Distance.COSINE),
+        },
+    )
+    backend = QdrantBackend(index_configuration, location=":memory:")
+
+    async def run():
+        from qdrant_client import models
+
+        # Local in-memory clients do not share the storage, so the collection is created with the async client
+        await backend.async_client.create_collection(
+            "async",
+            vectors_config={
+                "name": models.VectorParams(size=2, distance=models.Distance.COSINE),
+                "description": models.VectorParams(
+                    size=2, distance=models.Distance.COSINE
+                ),
+            },
+        )
+        await backend.abulk_save(
+            [
+                StubDocument(1, [1.0, 0.0], name="first"),
+                StubDocument(2, [0.0, 1.0], name="second"),
+            ]
+        )
+        ids = await backend.asearch("name", [1.0, 0.0], limit=2)
+        hashes = await backend.aget_content_hashes(1)
+        await backend.apartial_update(StubDocument(1, [1.0, 0.0], name="renamed"), {})
+        results = await backend.asearch_with_scores(
+            "name", [1.0, 0.0], limit=1, with_metadata=True
+        )
+        await backend.adelete(2)
+        remaining = await backend.asearch("name", [1.0, 0.0], limit=2)
+        return ids, hashes, results, remaining
+
+    ids, hashes, results, remaining = asyncio.run(run())
+    assert ids == [1, 2]
+    assert hashes == {"name": "[1.0, 0.0]"}
+    assert results[0].metadata == {"name": "renamed"}
+    assert remaining == [1]
+
+
+def test_quantization_is_configured_per_vector():
+    """
+    Test that the collection is created with the quantization of each vector, and searched with its parameters.
+    """
+    from unittest import mock
+
+    from qdrant_client import models
+
+    from django_semantic_search.backends.types import Quantization
+
+    index_configuration = IndexConfiguration(
+        namespace="quantized",
+        vectors={
+            "name": VectorConfiguration(
+                size=2,
+                distance=Distance.COSINE,
+                quantization=Quantization(
+                    type="scalar", quantile=0.99, oversampling=2.0
+                ),
+            ),
+            "description": VectorConfiguration(
+                size=2,
+                distance=Distance.COSINE,
+                quantization=Quantization.create("binary"),
+            ),
+        },
+    )
+    backend = QdrantBackend(index_configuration, location=":memory:")
+    vectors = backend.client.get_collection("quantized").config.params.vectors
+
+    assert vectors["name"].quantization_config.scalar.quantile == 0.99
+    assert vectors["description"].quantization_config.binary.always_ram
+    assert backend._search_params("name").quantization.oversampling == 2.0
+    assert (
+        backend._quantization_config(Quantization.create("product")).product.compression
+        == models.CompressionRatio.X16
+    )
+
+    backend.save(StubDocument(1, [1.0, 0.0]))
+    assert backend.search("name", [1.0, 0.0]) == [1]
+    assert backend.hybrid_search({"name": [1.0, 0.0], "description": [0.0, 1.0]})
+
+    # The quantization options might be overridden for a single query
+    with mock.patch.object(
+        backend.client, "query_points", wraps=backend.client.query_points
+    ) as query_points:
+        assert backend.search("name", [1.0, 0.0], oversampling=4.0, rescore=False) == [
+            1
+        ]
+    params = query_points.call_args.kwargs["search_params"].quantization
+    assert (params.oversampling, params.rescore) == (4.0, False)
+    assert (
+        backend._search_params("name", rescore=False).quantization.oversampling == 2.0
+    )
+    assert backend._search_params("missing", oversampling=2.0) is None
+    with pytest.raises(ValueError, match="Oversampling"):
+        backend.search("name", [1.0, 0.0], oversampling=0.5)
+
+    with pytest.raises(ValueError):
+        Quantization(type="product", compression=3)
+
+
+def test_bulk_operations_are_sent_in_chunks():
+    """
+    Test that the bulk save and delete are split into chunks, uploaded in parallel if configured.
+    """
+    import asyncio
+    from unittest import mock
+
+    index_configuration = IndexConfiguration(
+        namespace="bulk",
+        vectors={
+            "name": VectorConfiguration(size=2, distance=Distance.COSINE),
+            "description": VectorConfiguration(size=2, distance=Distance.COSINE),
+        },
+    )
+    backend = QdrantBackend(
+        index_configuration,
+        location=":memory:",
+        upload_batch_size=2,
+        upload_parallel=2,
+    )
+    documents = [StubDocument(i, [1.0, float(i)]) for i in range(1, 6)]
+
+    with mock.patch.object(
+        backend.client, "upsert", wraps=backend.client.upsert
+    ) as upsert:
+        backend.bulk_save(documents)
+    assert upsert.call_count == 3
+    assert backend.client.count("bulk").count == 5
+
+    with mock.patch.object(
+        backend.client, "delete", wraps=backend.client.delete
+    ) as delete:
+        backend.bulk_delete([1, 2, 3])
+    assert delete.call_count == 2
+    assert sorted(backend.search("name", [1.0, 0.0], limit=10)) == [4, 5]
+
+    async def run():
+        from qdrant_client import models
+
+        await backend.async_client.create_collection(
+            "bulk",
+            vectors_config={
+                "name": models.VectorParams(size=2, distance=models.Distance.COSINE),
+                "description": models.VectorParams(
+                    size=2, distance=models.Distance.COSINE
+                ),
+            },
+        )
+        await backend.abulk_save(documents)
+        await backend.abulk_delete([1, 2, 3, 4])
+        return await backend.asearch("name", [1.0, 0.0], limit=10)
+
+    assert asyncio.run(run()) == [5]
+
+
+def test_rebuild_swaps_the_collection_behind_the_alias():
+    """
+    Test that the rebuild populates a new version of the collection, while the current one keeps serving the search
+    and the changes made in the meantime are written to both of them.
+    """
+    index_configuration = IndexConfiguration(
+        namespace="rebuilt",
+        vectors={
+            "name": VectorConfiguration(size=2, distance=Distance.COSINE),
+            "description": VectorConfiguration(size=2, distance=Distance.COSINE),
+        },
+    )
+    backend = QdrantBackend(
+        index_configuration, location=":memory:", shadow_check_interval=0.0
+    )
+    backend.bulk_save([StubDocument(1, [1.0, 0.0]), StubDocument(2, [0.0, 1.0])])
+    assert backend.client.get_aliases().aliases[0].collection_name == "rebuilt_v1"
+
+    def populate(target):
+        assert target.collection_name == "rebuilt_v2"
+        assert backend.pending_rebuild() == "rebuilt_v2"
+        target.bulk_save([StubDocument(1, [1.0, 0.0]), StubDocument(2, [0.0, 1.0])])
+        # Changes made during the rebuild are visible in both collections
+        backend.save(StubDocument(3, [1.0, 1.0]))
+        backend.delete(1)
+        assert sorted(backend.search("name", [1.0, 0.0])) == [2, 3]
+        assert sorted(target.search("name", [1.0, 0.0])) == [2, 3]
+
+    assert backend.rebuild(populate, grace_period=0.0) == "rebuilt_v2"
+    assert backend.pending_rebuild() is None
+    assert sorted(
+        collection.name for collection in backend.client.get_collections().collections
+    ) == ["rebuilt_v2", "rebuilt_v2_changes"]
+    assert sorted(backend.search("name", [1.0, 0.0])) == [2, 3]
+
+
+def test_rebuild_stores_the_documents_modified_during_the_populating_again():
+    """
+    Test that the documents modified while the collection is populated are passed to resync, so the stale state
+    stored by the populating does not survive the swap.
+    """
+    index_configuration = IndexConfiguration(
+        namespace="resynced",
+        vectors={
+            "name": VectorConfiguration(size=2, distance=Distance.COSINE),
+            "description": VectorConfiguration(size=2, distance=Distance.COSINE),
+        },
+    )
+    backend = QdrantBackend(
+        index_configuration, location=":memory:", shadow_check_interval=0.0
+    )
+    # State of the database
+    rows = {1: [1.0, 0.0], 2: [0.0, 1.0]}
+    backend.bulk_save([StubDocument(id, vector) for id, vector in rows.items()])
+
+    def populate(target):
+        snapshot = dict(rows)
+        # Another process updates and deletes the rows after they were read
+        rows[1] = [1.0, 1.0]
+        backend.save(StubDocument(1, rows[1]))
+        del rows[2]
+        backend.delete(2)
+        target.bulk_save([StubDocument(id, vector) for id, vector in snapshot.items()])
+
+    resynced = []
+
+    def resync(target, document_ids):
+        resynced.extend(document_ids)
+        target.bulk_save(
+            [StubDocument(id, rows[id]) for id in document_ids if id in rows]
+        )
+        target.bulk_delete([id for id in document_ids if id not in rows])
+
+    backend.rebuild(populate, grace_period=0.0, resync=resync)
+
+    assert sorted(resynced) == [1, 2]
+    assert backend.search("name", [1.0, 0.0], limit=10) == [1]
+    assert backend.get_content_hashes(1) == {"name": "[1.0, 1.0]"}
+
+
+def test_unversioned_collection_is_migrated_behind_the_alias():
+    """
+    Test that the collection created by the older versions of the library is only replaced with an alias explicitly,
+    keeping its points.
+    """
+    from qdrant_client import models
+
+    index_configuration = IndexConfiguration(
+        namespace="legacy",
+        vectors={"name": VectorConfiguration(size=2, distance=Distance.COSINE)},
+    )
+    backend = QdrantBackend(index_configuration, location=":memory:")
+    # Older versions created the collection named after the namespace
+    backend._update_aliases(delete=["legacy"])
+    backend.client.delete_collection("legacy_v1")
+    backend.client.create_collection(
+        "legacy",
+        vectors_config={
+            "name": models.VectorParams(size=2, distance=models.Distance.COSINE)
+        },
+    )
+    backend.client.upsert(
+        "legacy",
+        points=[
+            models.PointStruct(
+                id=backend.point_id(1),
+                vector={"name": [1.0, 0.0]},
+                payload={"id": 1},
+            )
+        ],
+    )
+
+    with pytest.raises(ValueError, match="not versioned"):
+        backend.rebuild(lambda target: None, grace_period=0.0)
+    assert backend.client.collection_exists("legacy")
+
+    assert backend.migrate_to_alias(grace_period=0.0) == "legacy_v1"
+    assert backend.client.get_aliases().aliases[0].collection_name == "legacy_v1"
+    assert backend.search("name", [1.0, 0.0]) == [1]
+    assert backend.migrate_to_alias(grace_period=0.0) is None
+
+
+def test_configure_reports_and_fixes_the_schema_drift(tmp_path):
+    """
+    Test that the differences between the index configuration and the existing collection are detected, and only
+    the non-destructive ones are fixed.
+    """
+    from unittest import mock
+
+    from qdrant_client import QdrantClient, models
+
+    from django_semantic_search.backends.types import (
+        Quantization,
+        SchemaChangeType,
+    )
+
+    client = QdrantClient(path=str(tmp_path))
+    client.create_collection(
+        "drifted",
+        vectors_config={
+            "name": models.VectorParams(size=2, distance=models.Distance.COSINE),
+            "description": models.VectorParams(size=3, distance=models.Distance.COSINE),
+        },
+    )
+    client.close()
+
+    index_configuration = IndexConfiguration(
+        namespace="drifted",
+        vectors={
+            "name": VectorConfiguration(
+                size=2,
+                distance=Distance.COSINE,
+                quantization=Quantization.create("scalar"),
+            ),
+            "description": VectorConfiguration(size=2, distance=Distance.COSINE),
+            "title": VectorConfiguration(size=2, distance=Distance.COSINE),
+        },
+    )
+    # Local mode of Qdrant ignores the quantization updates
+    with mock.patch.object(QdrantClient, "update_collection") as update_collection:
+        backend = QdrantBackend(index_configuration, path=str(tmp_path))
+
+    assert {(change.type, change.name) for change in backend.schema_changes} == {
+        (SchemaChangeType.QUANTIZATION_MISMATCH, "name"),
+        (SchemaChangeType.VECTOR_MISMATCH, "description"),
+        (SchemaChangeType.MISSING_VECTOR, "title"),
+        (SchemaChangeType.MISSING_PAYLOAD_INDEX, "id"),
+    }
+    vectors_config = update_collection.call_args.kwargs["vectors_config"]
+    assert vectors_config["name"].quantization_config.scalar is not None
+    assert "description" not in vectors_config
+
+    # The collection still differs, so the validation is not cached
+    with mock.patch.object(
+        QdrantBackend, "diff_schema", return_value=[]
+    ) as diff_schema:
+        # Backends with the same configuration share the client, so the local storage is not locked
+        QdrantBackend(index_configuration, path=str(tmp_path))
+        QdrantBackend(index_configuration, path=str(tmp_path))
+    diff_schema.assert_called_once()
+
+
+def test_configure_does_not_recreate_the_collection_on_errors():
+    """
+    Test that the errors other than the missing collection are not treated as if the collection did not exist.
+    """
+    from unittest import mock
+
+    index_configuration = IndexConfiguration(
+        namespace="unavailable",
+        vectors={"name": VectorConfiguration(size=2, distance=Distance.COSINE)},
+    )
+    with (
+        mock.patch(
+            "qdrant_client.QdrantClient.collection_exists",
+            side_effect=ConnectionError("Connection refused"),
+        ) as collection_exists,
+        mock.patch("qdrant_client.QdrantClient.create_collection") as create_collection,
+    ):
+        with pytest.raises(ConnectionError):
+            QdrantBackend(
+                index_configuration, location=":memory:", retries=2, retry_backoff=0.0
+            )
+    # Connection errors are retried, but never treated as a missing collection
+    assert collection_exists.call_count == 3
+    create_collection.assert_not_called()
+
+
+def test_only_idempotent_requests_are_retried():
+    """
+    Test that the administrative requests, which might be applied twice, are not retried.
+    """
+    from unittest import mock
+
+    from django_semantic_search.backends.qdrant import RetryingClient
+
+    wrapped = mock.Mock()
+    wrapped.upsert.side_effect = ConnectionError("Connection reset")
+    wrapped.create_collection.side_effect = ConnectionError("Connection reset")
+    client = RetryingClient(wrapped, retries=2, backoff=0.0)
+
+    with pytest.raises(ConnectionError):
+        client.upsert("collection", points=[])
+    with pytest.raises(ConnectionError):
+        client.create_collection("collection")
+    assert wrapped.upsert.call_count == 3
+    assert wrapped.create_collection.call_count == 1
+
+
+def test_backends_share_the_client_until_fork():
+    """
+    Test that the backends with the same configuration share a single client, which is not reused after a fork.
+    """
+    from unittest import mock
+
+    from django_semantic_search.backends.qdrant import client_pool
+
+    def create_backend(namespace, **kwargs):
+        index_configuration = IndexConfiguration(
+            namespace=namespace,
+            vectors={"name": VectorConfiguration(size=2, distance=Distance.COSINE)},
+        )
+        return QdrantBackend(index_configuration, check_compatibility=False, **kwargs)
+
+    with mock.patch.object(QdrantBackend, "configure"):
+        first = create_backend("first", url="http://localhost:6333")
+        second = create_backend("second", url="http://localhost:6333")
+        third = create_backend(
+            "third", url="http://localhost:6333", prefer_grpc=True, keep_alive=30.0
+        )
+        in_memory = create_backend("first", location=":memory:")
+
+    assert first.client is second.client
+    assert third.client is not first.client
+    assert third._client_kwargs["grpc_options"] == {"grpc.keepalive_time_ms": 30000}
+    # In-memory clients have separate storages, so they are never shared
+    assert in_memory.client is not create_backend("first", location=":memory:").client
+
+    # Child processes create their own clients
+    client = first.client
+    client_pool.reset()
+    assert first.client is not client
+
+
+def test_async_save_stores_the_foreign_keys_by_their_attribute_names():
+    """
+    Test that the documents of a model with a foreign key are stored asynchronously, with the primary key of the
+    related object stored under the attribute name of the field.
+    """
+    from asgiref.sync import async_to_sync
+    from django.db import connection, models
+
+    import django_semantic_search as dss
+
+    class Author(models.Model):
+        name = models.CharField(max_length=100)
+
+        class Meta:
+            app_label = "test_qdrant_async"
+
+    class Book(models.Model):
+        title = models.CharField(max_length=100)
+        author = models.ForeignKey(Author, on_delete=models.CASCADE)
+
+        class Meta:
+            app_label = "test_qdrant_async"
+
+    class BookDocument(dss.Document):
+        class Meta:
+            model = Book
+            namespace = "books"
+            indexes = [dss.VectorIndex("title")]
+            include_fields = ["title", "author"]
+            disable_signals = True
+
+    backend = QdrantBackend(BookDocument.index_configuration, location=":memory:")
+    BookDocument._backend = backend
+
+    async def run():
+        from qdrant_client import models as qdrant_models
+
+        await backend.async_client.create_collection(
+            "books",
+            vectors_config={
+                "title": qdrant_models.VectorParams(
+                    size=10, distance=qdrant_models.Distance.COSINE
+                ),
+            },
+        )
+        book = await Book.objects.aget(title="Dune")
+        await BookDocument(book).asave()
+        book = await Book.objects.aget(title="Dune")
+        await backend.abulk_save([BookDocument(book)])
+        book = await Book.objects.aget(title="Dune")
+        book.title = "Dune Messiah"
+        await BookDocument(book).asave()
+        return await backend.async_client.scroll("books", with_payload=True)
+
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(Author)
+        schema_editor.create_model(Book)
+    try:
+        author = Author.objects.create(name="Frank Herbert")
+        Book.objects.create(title="Dune", author=author)
+        # Thread sensitive code runs in the main thread, sharing its in-memory database
+        points, _ = async_to_sync(run)()
+    finally:
+        with connection.schema_editor() as schema_editor:
+            schema_editor.delete_model(Book)
+            schema_editor.delete_model(Author)
+
+    assert len(points) == 1
+    assert points[0].payload["author_id"] == author.pk
+    assert points[0].payload["title"] == "Dune Messiah"
@@ -0,0 +1,225 @@
+import json
+import os
+import sys
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.apps import AppConfig, apps
+from django.db import connection, connections, models
+
+import django_semantic_search as dss
+from django_semantic_search.reindex import create_shards, reindex, resync
+
+
+class ReindexedModel(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = "test_reindex"
+
+
+@dss.register_document
+class ReindexedDocument(dss.Document):
+    class Meta:
+        model = ReindexedModel
+        namespace = "reindexed"
+        indexes = [dss.VectorIndex("name")]
+        disable_signals = True
+
+
+@pytest.fixture
+def reindexed_rows():
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(ReindexedModel)
+        ReindexedModel.objects.bulk_create(
+            [ReindexedModel(name=f"row {i}") for i in range(10)]
+        )
+        yield list(ReindexedModel.objects.values_list("pk", flat=True))
+        schema_editor.delete_model(ReindexedModel)
+
+
+@pytest.fixture
+def file_database_rows(tmp_path):
+    """
+    Replace the in-memory database with a file, so the rows are visible to the worker processes.
+    """
+    from django.db.utils import load_backend
+
+    in_memory = connections["default"]
+    settings_dict = {**in_memory.settings_dict, "NAME": str(tmp_path / "db.sqlite3")}
+    file_database = load_backend(settings_dict["ENGINE"]).DatabaseWrapper(
+        settings_dict, "default"
+    )
+    connections["default"] = file_database
+    # Model instances sent back by the workers are unpickled through the app registry, which misses the test models
+    app_config = AppConfig("test_reindex", sys.modules[__name__])
+    app_config.apps = apps
+    app_config.models = apps.all_models["test_reindex"]
+    try:
+        with file_database.schema_editor() as schema_editor:
+            schema_editor.create_model(ReindexedModel)
+        ReindexedModel.objects.bulk_create(
+            [ReindexedModel(name=f"row {i}") for i in range(10)]
+        )
+        with mock.patch.dict(apps.app_configs, {"test_reindex": app_config}):
+            yield list(ReindexedModel.objects.values_list("pk", flat=True))
+    finally:
+        file_database.close()
+        connections["default"] = in_memory
+
+
+def _crash_worker(*args):
+    os._exit(1)
+
+
+def stored_ids():
+    backend = ReindexedDocument.backend
+    return sorted(backend._documents[backend.index_configuration.namespace])
+
+
+def test_create_shards_splits_the_primary_key_range(reindexed_rows):
+    """
+    Test that the shards cover all the rows, without overlapping.
+    """
+    shards = create_shards(ReindexedModel.objects.all(), 3)
+
+    assert [(shard.after, shard.upper) for shard in shards] == [
+        (None, reindexed_rows[3]),
+        (reindexed_rows[3], reindexed_rows[7]),
+        (reindexed_rows[7], None),
+    ]
+    assert len(create_shards(ReindexedModel.objects.none(), 3)) == 1
+
+
+def test_reindex_resumes_from_the_checkpoint(reindexed_rows, tmp_path):
+    """
+    Test that the reindexing stores all the rows, and resumes from the checkpoint after a failure.
+    """
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    backend = ReindexedDocument.backend
+    original_bulk_save = backend.bulk_save
+    calls = []
+
+    def failing_bulk_save(documents):
+        calls.append(len(documents))
+        if len(calls) == 3:
+            raise ConnectionError("Vector store is not available")
+        original_bulk_save(documents)
+
+    with mock.patch.object(backend, "bulk_save", side_effect=failing_bulk_save):
+        with pytest.raises(ConnectionError):
+            reindex(
+                ReindexedDocument,
+                workers=0,
+                num_shards=2,
+                batch_size=2,
+                checkpoint_path=checkpoint_path,
+            )
+
+    with open(checkpoint_path) as fp:
+        checkpoint = json.load(fp)
+    assert checkpoint["indexed"] == 4
+
+    progress = []
+    with mock.patch.object(backend, "bulk_save", wraps=original_bulk_save) as bulk_save:
+        indexed = reindex(
+            ReindexedDocument,
+            workers=0,
+            batch_size=2,
+            checkpoint_path=checkpoint_path,
+            progress_callback=lambda indexed, total: progress.append(indexed),
+        )
+
+    assert indexed == 10
+    assert sum(len(call.args[0]) for call in bulk_save.call_args_list) == 6
+    assert progress[-1] == 10
+    assert stored_ids() == reindexed_rows
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+def test_reindex_command_reports_the_progress(reindexed_rows):
+    """
+    Test that the management command reindexes the document found by its name.
+    """
+    from django.core.management import call_command
+
+    from django_semantic_search.management.commands import semantic_reindex
+
+    stdout = StringIO()
+    # The progress is reported even if no time has passed since the start
+    with mock.patch.object(semantic_reindex.time, "monotonic", return_value=100.0):
+        call_command(
+            semantic_reindex.Command(),
+            "ReindexedDocument",
+            workers=0,
+            batch_size=4,
+            stdout=stdout,
+        )
+
+    assert "Indexed 10/10 rows (0.0 rows/s, remaining unknown)" in stdout.getvalue()
+    assert "Reindexed 10 rows of ReindexedDocument" in stdout.getvalue()
+    assert stored_ids() == reindexed_rows
+
+
+def test_resync_stores_the_existing_documents_and_deletes_the_removed_ones(
+    reindexed_rows,
+):
+    """
+    Test that the documents modified during a rebuild are stored in their current state, or deleted.
+    """
+    backend = ReindexedDocument.backend
+    ReindexedModel.objects.filter(pk=reindexed_rows[1]).delete()
+
+    with (
+        mock.patch.object(backend, "bulk_save") as bulk_save,
+        mock.patch.object(backend, "bulk_delete") as bulk_delete,
+    ):
+        resync(ReindexedDocument, [reindexed_rows[0], reindexed_rows[1]])
+
+    assert [document.id for document in bulk_save.call_args.args[0]] == [
+        reindexed_rows[0]
+    ]
+    bulk_delete.assert_called_once_with([reindexed_rows[1]])
+
+
+def test_reindex_embeds_the_rows_in_the_worker_processes(file_database_rows):
+    """
+    Test that the worker processes load the document, fetch the rows from the database and send back the embedded
+    batches, and that a crashed worker stops the reindexing.
+    """
+    import multiprocessing
+    from concurrent.futures.process import BrokenProcessPool
+
+    from django_semantic_search.reindex import _Uploader
+
+    backend = ReindexedDocument.backend
+    workers_at_upload_start = []
+    uploader_start = _Uploader.start
+
+    def start(uploader):
+        workers_at_upload_start.extend(multiprocessing.active_children())
+        uploader_start(uploader)
+
+    with (
+        mock.patch.object(backend, "bulk_save") as bulk_save,
+        mock.patch.object(
+            connections, "close_all", wraps=connections.close_all
+        ) as close_all,
+        mock.patch.object(_Uploader, "start", start),
+    ):
+        indexed = reindex(ReindexedDocument, workers=2, num_shards=3, batch_size=2)
+
+    assert indexed == 10
+    # Connections are closed, and the workers are started before the uploader thread
+    assert close_all.called
+    assert workers_at_upload_start
+    stored = [
+        document for call in bulk_save.call_args_list for document in call.args[0]
+    ]
+    assert sorted(document.id for document in stored) == file_database_rows
+    assert all(len(document.vectors()["name"]) == 10 for document in stored)
+
+    with mock.patch("django_semantic_search.reindex._embed_shard_batch", _crash_worker):
+        with pytest.raises(BrokenProcessPool):
+            reindex(ReindexedDocument, workers=2, batch_size=2)
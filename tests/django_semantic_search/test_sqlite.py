@@ -0,0 +1,144 @@
+import uuid
+
+import pytest
+from django.db import transaction
+from mocks import StubDocument
+
+from django_semantic_search.backends.sqlite import SQLiteBackend
+from django_semantic_search.backends.types import (
+    Distance,
+    FilterCondition,
+    IndexConfiguration,
+    VectorConfiguration,
+)
+
+
+@pytest.fixture
+def backend():
+    index_configuration = IndexConfiguration(
+        namespace=f"stub_{uuid.uuid4().hex}",
+        vectors={
+            "name": VectorConfiguration(size=2, distance=Distance.COSINE),
+            "description": VectorConfiguration(size=2, distance=Distance.EUCLIDEAN),
+        },
+    )
+    backend = SQLiteBackend(index_configuration)
+    backend.bulk_save(
+        [
+            StubDocument(1, [1.0, 0.0], category="a"),
+            StubDocument(2, [0.0, 1.0], category="b"),
+            StubDocument("three", [1.0, 1.0], category="a"),
+        ]
+    )
+    return backend
+
+
+def test_search_ranks_the_stored_vectors(backend):
+    """
+    Test that the vectors are stored in the database and searched exactly, keeping the types of the IDs.
+    """
+    assert backend.search("name", [1.0, 0.1], limit=3) == [1, "three", 2]
+    assert backend.search("description", [0.0, 1.0], limit=1) == [1]
+
+    results = backend.search_with_scores(
+        "name",
+        [0.0, 1.0],
+        filters=[FilterCondition.from_lookup("category", "a")],
+        with_metadata=True,
+    )
+    assert [result.id for result in results] == ["three", 1]
+    assert results[0].score == pytest.approx(2**-0.5)
+    assert results[0].metadata == {"category": "a"}
+
+
+def test_cached_index_is_updated_in_place_by_writes(backend):
+    """
+    Test that the vectors are loaded once, and the writes of the backend are applied to the cached index in place.
+    """
+    index = backend._index()
+    assert backend._index() is index
+
+    backend.partial_update(
+        StubDocument(2, [1.0, 0.0], category="b"), {"name": [1.0, 0.0]}
+    )
+    assert backend._index() is index
+    assert backend.get_content_hashes(2) == {"name": "[1.0, 0.0]"}
+    assert backend.get_content_hashes(42) is None
+
+    backend.delete(1)
+    backend.save(StubDocument(4, [0.0, 1.0], category="c"))
+    assert backend._index() is index
+    assert backend.search("name", [1.0, 0.0], limit=10)[:1] == [2]
+    assert backend.search_with_scores("name", [0.0, 1.0], limit=1)[0].id == 4
+    assert len(backend._index()) == 3
+
+
+def test_cached_index_is_reloaded_after_writes_of_other_processes(backend):
+    """
+    Test that the cached index is reloaded, and not updated in place, if the namespace was modified by another
+    process since it was loaded.
+    """
+    index = backend._index()
+    with backend.connection.cursor() as cursor:
+        # Another process deletes one of the documents
+        cursor.execute(f'DELETE FROM "{backend.table}" WHERE id = %s', ["1"])
+        backend._increment_version(cursor)
+
+    backend.save(StubDocument(4, [0.0, 1.0]))
+    reloaded_index = backend._index()
+    assert reloaded_index is not index
+    assert sorted(backend.search("name", [1.0, 0.0]), key=str) == [2, 4, "three"]
+    assert backend._index() is reloaded_index
+
+
+def test_writes_are_part_of_the_transaction(backend):
+    """
+    Test that the vectors written in a rolled back transaction are discarded, along with the model changes.
+    """
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            backend.save(StubDocument(4, [1.0, 0.0]))
+            backend.delete(1)
+            assert sorted(backend.search("name", [1.0, 0.0]), key=str) == [
+                2,
+                4,
+                "three",
+            ]
+            raise RuntimeError("rollback")
+
+    assert sorted(backend.search("name", [1.0, 0.0]), key=str) == [1, 2, "three"]
+
+
+def test_index_is_cached_in_the_transactions_without_writes(backend):
+    """
+    Test that the index is cached inside a transaction until the transaction modifies the table.
+    """
+    with transaction.atomic():
+        index = backend._index()
+        assert backend._index() is index
+
+        backend.delete(1)
+        modified_index = backend._index()
+        assert modified_index is not index
+        assert backend._index() is not modified_index
+        assert backend._cache[1] is index
+
+    assert len(backend._index()) == 2
+    assert backend._index() is backend._index()
+
+
+def test_async_writes_are_part_of_the_transaction_of_the_caller(backend):
+    """
+    Test that the asynchronous methods use the database connection of the caller, so their writes are rolled back
+    along with its transaction.
+    """
+    from asgiref.sync import async_to_sync
+
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            async_to_sync(backend.asave)(StubDocument(4, [1.0, 0.0]))
+            async_to_sync(backend.adelete)(1)
+            assert async_to_sync(backend.aget_content_hashes)(4) is not None
+            raise RuntimeError("rollback")
+
+    assert sorted(backend.search("name", [1.0, 0.0]), key=str) == [1, 2, "three"]
@@ -1,11 +1,15 @@
 import random
 from collections import defaultdict
 from hashlib import md5
-from typing import List
+from typing import List, Optional
 
 from django_semantic_search import Document
 from django_semantic_search.backends.base import BaseVectorSearchBackend
-from django_semantic_search.backends.types import IndexConfiguration
+from django_semantic_search.backends.types import (
+    FilterCondition,
+    IndexConfiguration,
+    SearchResult,
+)
 from django_semantic_search.embeddings.base import (
     BaseEmbeddingModel,
     TextEmbeddingMixin,
@@ -22,6 +26,9 @@ class MockTextEmbeddingModel(BaseEmbeddingModel, TextEmbeddingMixin):
     def __init__(self, size: int = 10):
         self._size = size
 
+    def identifier(self) -> str:
+        return f"{super().identifier()}:{self._size}"
+
     def vector_size(self) -> int:
         return self._size
 
@@ -50,20 +57,74 @@ class MockVectorSearchBackend(BaseVectorSearchBackend):
         pass
 
     def search(
-        self, vector_name: str, query: Vector, limit: int = 10
+        self,
+        vector_name: str,
+        query: Vector,
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
     ) -> List[DocumentID]:
         random.seed(sum(query))
-        max_results = min(
-            limit, len(self._documents[self.index_configuration.namespace])
-        )
-        selected_documents = random.sample(
-            list(self._documents[self.index_configuration.namespace].values()),
-            k=max_results,
-        )
+        documents = self._filter_documents(filters)
+        max_results = min(limit, len(documents))
+        selected_documents = random.sample(documents, k=max_results)
         return [doc.id for doc in selected_documents]
 
+    def search_with_scores(
+        self,
+        vector_name: str,
+        query: Vector,
+        limit: int = 10,
+        filters: Optional[List[FilterCondition]] = None,
+        with_metadata: bool = False,
+    ) -> List[SearchResult]:
+        """Rank all the documents by the dot product with the query."""
+        results = [
+            SearchResult(
+                id=doc.id,
+                score=sum(a * b for a, b in zip(query, doc.vectors()[vector_name])),
+                metadata=doc.metadata() if with_metadata else {},
+            )
+            for doc in self._filter_documents(filters)
+        ]
+        results.sort(key=lambda result: result.score, reverse=True)
+        return results[:limit]
+
+    def _filter_documents(
+        self, filters: Optional[List[FilterCondition]]
+    ) -> List[Document]:
+        documents = self._documents[self.index_configuration.namespace].values()
+        return [
+            doc
+            for doc in documents
+            if all(condition.matches(doc.metadata()) for condition in filters or [])
+        ]
+
     def save(self, document: Document) -> None:
         self._documents[self.index_configuration.namespace][document.id] = document
 
     def delete(self, document_id: DocumentID) -> None:
         del self._documents[self.index_configuration.namespace][document_id]
+
+
+class StubDocument:
+    """
+    Minimal document, exposing the interface used by the backends, for testing the backends without the models. The
+    vector is stored under the first of the vector names, and reversed under the other ones.
+    """
+
+    vector_names = ("name", "description")
+
+    def __init__(self, id, vector, **metadata):
+        self.id = id
+        self._vector = vector
+        self._metadata = metadata
+
+    def vectors(self):
+        first, *others = self.vector_names
+        return {first: self._vector, **{name: self._vector[::-1] for name in others}}
+
+    def metadata(self):
+        return self._metadata
+
+    def content_hashes(self):
+        return {self.vector_names[0]: str(self._vector)}